@@ -1,13 +1,187 @@
 from __future__ import annotations
 
-from flask import Flask, redirect, request
+from html import escape
+from typing import Any, Dict, List
+
+from flask import Flask, current_app, redirect, request
 
 from beheer.main_layout import load_theme_config, render_page
 from beheer.editors.tools_editor import handle_tools_editor
 from beheer.editors.hub_editor import handle_hub_editor
 from beheer.editors.theme_editor import handle_theme_editor
 
-from beheer.system_actions import clear_cache, request_restart, watchdog_status
+from beheer.live_panel import live_panel_html, register_live_routes
+from beheer.memory_page import register_memory_routes
+from beheer.profiles_page import register_profile_routes
+from beheer.system_actions import boot_timeline, clear_cache, request_restart, watchdog_status
+from beheer.theme_assets import register_theme_assets
+from runtime.hub_logging import log_writer_stats
+from runtime.metrics import get_metrics, top_endpoints
+from runtime.state_store import state_stats
+
+
+# -------------------------
+# Request metrics
+# -------------------------
+def _metrics_table(rows: List[Any], label: str) -> str:
+    if not rows:
+        return ""
+    body = []
+    for key, m in rows:
+        st = m.get("status") or {}
+        errs = int(st.get("4xx", 0)) + int(st.get("5xx", 0))
+        size = m.get("size") or {}
+        avg_kb = (float(size.get("sum", 0)) / size["count"] / 1024) if size.get("count") else 0.0
+        body.append(
+            f"<tr><td><code>{escape(str(key))}</code></td>"
+            f"<td style='text-align:right'>{int(m.get('count', 0))}</td>"
+            f"<td style='text-align:right'>{float(m.get('p50_ms', 0)):.1f}</td>"
+            f"<td style='text-align:right'>{float(m.get('p95_ms', 0)):.1f}</td>"
+            f"<td style='text-align:right'>{float(m.get('p99_ms', 0)):.1f}</td>"
+            f"<td style='text-align:right'>{errs}</td>"
+            f"<td style='text-align:right'>{avg_kb:.1f}</td></tr>"
+        )
+    return f"""
+      <table style="width:100%; margin-top:8px;">
+        <tr><th style="text-align:left">{label}</th><th>requests</th><th>p50 ms</th><th>p95 ms</th>
+            <th>p99 ms</th><th>4xx/5xx</th><th>avg KB</th></tr>
+        {''.join(body)}
+      </table>
+    """
+
+
+def _metrics_html() -> str:
+    metrics = get_metrics(current_app)
+    if metrics is None:
+        return "<div class='hint'>Metrics niet actief.</div>"
+    snap = metrics.snapshot()
+    logq = ""
+    lw = log_writer_stats()
+    if lw:
+        dropped = sum(int(v) for v in (lw.get("dropped") or {}).values())
+        logq = f" • log queue {lw['queue_depth']}/{lw['queue_size']} (max {lw['max_depth']}, dropped {dropped})"
+    comp = snap.get("compression")
+    if comp:
+        n = sum(int(v) for v in (comp.get("compressed") or {}).values())
+        ratio = comp.get("ratio")
+        logq += (
+            f" • compressie {n}/{comp['responses']} responses"
+            f"{'' if ratio is None else f', ratio {float(ratio):.2f}'}"
+            f" ({int(comp.get('saved_bytes', 0)) // 1024} KB bespaard)"
+        )
+    return f"""
+      <div class="hint">in-flight {snap['in_flight']} • uptime {snap['uptime_sec']}s{logq} •
+        <a href="/_metrics">/_metrics</a> (Prometheus) • <a href="/_metrics?format=json">JSON</a> •
+        <a href="/beheer/system/profiles">profielen</a> • <a href="/beheer/system/memory">geheugen</a></div>
+      {_metrics_table(list(top_endpoints(snap, "tools")), "tool")}
+      {_metrics_table(list(top_endpoints(snap, "endpoints")), "endpoint (top 12 op totale tijd)")}
+    """
+
+
+# -------------------------
+# Tool state (tokens/sessies/decodes)
+# -------------------------
+def _state_html() -> str:
+    try:
+        st = state_stats()
+    except Exception as e:
+        return f"<div class='hint'>State store niet beschikbaar: {escape(str(e))}</div>"
+    rows = []
+    for name, s in (st.get("namespaces") or {}).items():
+        ttl = s.get("default_ttl")
+        max_b = s.get("max_bytes")
+        rows.append(
+            f"<tr><td><code>{escape(name)}</code></td>"
+            f"<td style='text-align:right'>{int(s.get('size', 0))}/{int(s.get('max_entries', 0))}</td>"
+            f"<td style='text-align:right'>{float(s.get('bytes', 0)) / 1024:.1f}"
+            f"{'' if not max_b else f' / {int(max_b) // 1024}'}</td>"
+            f"<td style='text-align:right'>{'-' if ttl is None else int(ttl)}</td>"
+            f"<td style='text-align:right'>{int(s.get('hits', 0))}</td>"
+            f"<td style='text-align:right'>{int(s.get('misses', 0))}</td>"
+            f"<td style='text-align:right'>{int(s.get('evictions', 0))}</td>"
+            f"<td style='text-align:right'>{int(s.get('expirations', 0))}</td></tr>"
+        )
+    where = f" • <code>{escape(str(st['path']))}</code>" if st.get("path") else ""
+    table = ""
+    if rows:
+        table = f"""
+      <table style="width:100%; margin-top:8px;">
+        <tr><th style="text-align:left">namespace</th><th>entries</th><th>KB</th><th>ttl s</th>
+            <th>hits</th><th>misses</th><th>evictions</th><th>expired</th></tr>
+        {''.join(rows)}
+      </table>"""
+    return f"<div class='hint'>backend {escape(str(st.get('backend')))}{where}</div>{table}"
+
+
+# -------------------------
+# Boot waterfall
+# -------------------------
+_PROC_COLORS = {"tray": "rgba(255,200,80,.55)", "master": "rgba(53,230,223,.55)"}
+
+
+def _import_rows(nodes: List[Dict[str, Any]], depth: int = 0) -> List[str]:
+    rows: List[str] = []
+    for n in sorted(nodes, key=lambda x: -float(x.get("ms", 0))):
+        pad = depth * 16
+        rows.append(
+            f"<tr><td style='padding-left:{pad}px'><code>{escape(str(n.get('name', '')))}</code></td>"
+            f"<td style='text-align:right'>{float(n.get('ms', 0)):.1f}</td>"
+            f"<td style='text-align:right'>{float(n.get('self_ms', 0)):.1f}</td></tr>"
+        )
+        rows.extend(_import_rows(n.get("children") or [], depth + 1))
+    return rows
+
+
+def _boot_waterfall_html(tl: Dict[str, Any]) -> str:
+    spans = [s for s in (tl.get("spans") or []) if isinstance(s, dict)]
+    if not spans:
+        return "<div class='hint'>Geen boot timeline beschikbaar.</div>"
+
+    total = max(float(s.get("start_ms", 0)) + float(s.get("ms", 0)) for s in spans) or 1.0
+    rows: List[str] = []
+    for s in spans:
+        start = float(s.get("start_ms", 0))
+        ms = float(s.get("ms", 0))
+        left = start / total * 100
+        color = _PROC_COLORS.get(str(s.get("proc")), "rgba(200,200,200,.5)")
+        if s.get("mark"):
+            bar = f"<div style='position:absolute; left:{left:.2f}%; top:0; bottom:0; width:2px; background:{color};'></div>"
+            dur = f"@ {start:.0f}"
+        else:
+            width = max(ms / total * 100, 0.3)
+            bar = (
+                f"<div style='position:absolute; left:{left:.2f}%; width:{width:.2f}%; top:3px; bottom:3px; "
+                f"border-radius:3px; background:{color};'></div>"
+            )
+            dur = f"{ms:.1f}"
+        pad = int(s.get("depth", 0) or 0) * 14
+        rows.append(
+            f"<tr><td style='padding-left:{pad}px; white-space:nowrap;'>{escape(str(s.get('name', '')))}</td>"
+            f"<td style='width:60%'><div style='position:relative; height:18px;'>{bar}</div></td>"
+            f"<td style='text-align:right; white-space:nowrap;'>{dur} ms</td></tr>"
+        )
+
+    imports = tl.get("imports") or []
+    imports_html = ""
+    if imports:
+        imports_html = f"""
+          <details style="margin-top:10px;">
+            <summary>Import-tijd boom ({float(tl.get('imports_ms', 0)):.0f} ms totaal, nodes &ge; 1 ms)</summary>
+            <table style="width:100%; margin-top:6px;">
+              <tr><th style="text-align:left">module</th><th>cum ms</th><th>self ms</th></tr>
+              {''.join(_import_rows(imports))}
+            </table>
+          </details>
+        """
+
+    state = "afgerond" if tl.get("finished") else "bezig (nog geen /_health)"
+    return f"""
+      <div class="hint">boot_id <code>{escape(str(tl.get('boot_id', '')))}</code> • {total:.0f} ms • {state}
+        • <span style="color:{_PROC_COLORS['tray']}">■</span> tray
+        <span style="color:{_PROC_COLORS['master']}">■</span> master</div>
+      <table style="width:100%; margin-top:8px; border-collapse:collapse;">{''.join(rows)}</table>
+      {imports_html}
+    """
 
 
 def register_beheer_routes(app: Flask) -> None:
@@ -103,7 +277,7 @@ def register_beheer_routes(app: Flask) -> None:
           <div style="margin-top:16px; display:grid; gap:14px;">
             <form method="post" action="/beheer/system/clear-cache">
               <button class="btn" type="submit">🧹 Clear cache</button>
-              <div class="hint" style="margin-top:6px;">Verwijdert tmp/static cache + __pycache__/*.pyc.</div>
+              <div class="hint" style="margin-top:6px;">Verwijdert tmp/ + runtime/jinja_cache + __pycache__/*.pyc.</div>
             </form>
 
             <form method="post" action="/beheer/system/restart"
@@ -115,6 +289,28 @@ def register_beheer_routes(app: Flask) -> None:
         </div>
         """
 
+        content += f"""
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Live</h3>
+          {live_panel_html()}
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Request metrics</h3>
+          {_metrics_html()}
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Tool state</h3>
+          {_state_html()}
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Boot timeline</h3>
+          {_boot_waterfall_html(boot_timeline())}
+        </div>
+        """
+
         return render_page(title="System", content_html=content)
 
     @app.post("/beheer/system/clear-cache")
@@ -132,9 +328,19 @@ def register_beheer_routes(app: Flask) -> None:
         request_restart()
         return "Restarting...", 200
 
+    # opt-in request profielen + flamegraph
+    register_profile_routes(app)
+    # RSS / GC / tracemalloc snapshot diffs
+    register_memory_routes(app)
+    # live paneel (SSE, 1x per seconde)
+    register_live_routes(app)
+
     # -------------------------
     # Theme quick endpoints
     # -------------------------
+    # gecompileerde theme CSS: /static/theme/<naam>.<hash>.css (immutable)
+    register_theme_assets(app)
+
     @app.get("/theme/toggle")
     def theme_toggle():
         cfg = load_theme_config()
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List
 
 from flask import request
 
 from beheer.main_layout import render_page
+from runtime.config_store import read_json_copy, write_json
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 CONFIG_DIR = BASE_DIR / "config"
@@ -74,28 +74,18 @@ def _load_hub_settings() -> Dict[str, Any]:
         "sections_order": ["app", "branding", "layout"],  # default feel: app -> branding -> layout
     }
 
-    if not HUB_SETTINGS_JSON.exists():
+    data = read_json_copy(HUB_SETTINGS_JSON)
+    if data is None:
         defaults["sections_order"] = _normalize_sections_order(defaults.get("sections_order"))
         return dict(defaults)
 
-    raw = HUB_SETTINGS_JSON.read_text(encoding="utf-8").strip()
-    if not raw:
-        defaults["sections_order"] = _normalize_sections_order(defaults.get("sections_order"))
-        return dict(defaults)
-
-    try:
-        data = json.loads(raw)
+    # legacy: [ { ... } ]
+    if isinstance(data, list):
+        if data and isinstance(data[0], dict):
+            defaults.update(data[0])
 
-        # legacy: [ { ... } ]
-        if isinstance(data, list):
-            if data and isinstance(data[0], dict):
-                defaults.update(data[0])
-
-        elif isinstance(data, dict):
-            defaults.update(data)
-
-    except Exception:
-        pass
+    elif isinstance(data, dict):
+        defaults.update(data)
 
     # normalize types
     defaults["home_columns"] = int(defaults.get("home_columns", 2) or 2)
@@ -110,8 +100,7 @@ def _load_hub_settings() -> Dict[str, Any]:
 
 
 def _save_hub_settings(data: Dict[str, Any]) -> None:
-    HUB_SETTINGS_JSON.parent.mkdir(parents=True, exist_ok=True)
-    HUB_SETTINGS_JSON.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    write_json(HUB_SETTINGS_JSON, data)
 
 
 def _section_title(key: str) -> str:
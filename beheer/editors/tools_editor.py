@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Tuple
 
 from flask import request
 from beheer.main_layout import render_page
+from runtime.config_store import CONFIG_STORE, thaw, write_json
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 CONFIG_DIR = BASE_DIR / "config"
@@ -66,14 +67,14 @@ def _load_tools_file() -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
       - dict: {"tools":[...], ...}
     We keep ONLY tools here; hub/theme settings are split out.
     """
-    if not TOOLS_JSON.exists():
+    snap = CONFIG_STORE.snapshot(TOOLS_JSON)
+    if snap.error:
+        # kapotte tools.json nooit stil overschrijven met een lege lijst
+        raise ValueError(f"tools.json ongeldig: {snap.error}")
+    if snap.data is None:
         return ({"tools": []}, [])
 
-    raw = TOOLS_JSON.read_text(encoding="utf-8").strip()
-    if not raw:
-        return ({"tools": []}, [])
-
-    data = json.loads(raw)
+    data = thaw(snap.data)
 
     if isinstance(data, list):
         tools = [t for t in data if isinstance(t, dict)]
@@ -103,8 +104,7 @@ def _save_tools_file(root: Dict[str, Any], tools: List[Dict[str, Any]]) -> None:
     root["tools"] = tools
     root.pop("ui", None)
 
-    TOOLS_JSON.parent.mkdir(parents=True, exist_ok=True)
-    TOOLS_JSON.write_text(json.dumps(root, indent=2, ensure_ascii=False), encoding="utf-8")
+    write_json(TOOLS_JSON, root)
 
 
 # -------------------------
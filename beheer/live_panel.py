@@ -0,0 +1,128 @@
+"""
+beheer/live_panel.py — live paneel op /beheer/system (SSE via /beheer/system/live)
+
+- tegels: CPU %, RSS, threads, open fds, req/s, in-flight, p95 (laatste minuut), log queue
+- cache hit ratio per cache (config store + state namespaces): laatste minuut en sinds start
+- EventSource sluit als de tab verborgen is en herverbindt als hij terug zichtbaar wordt:
+  een tab op de achtergrond houdt de sampler thread niet wakker
+- 503 + Retry-After als max_clients streams open staan
+- niet op een single-threaded server: de stream zou de enige thread minutenlang bezetten
+"""
+
+from __future__ import annotations
+
+from flask import Flask, Response, current_app, request
+
+from runtime.live_stats import get_live_feed
+
+_TILES = (
+    ("cpu_pct", "CPU"),
+    ("rss_mb", "RSS"),
+    ("threads", "threads"),
+    ("fds", "open fds"),
+    ("rps", "req/s"),
+    ("in_flight", "in-flight"),
+    ("p95_ms", "p95"),
+    ("log_queue", "log queue"),
+)
+
+_LIVE_CSS = """
+<style>
+  .live-grid { display:grid; grid-template-columns:repeat(auto-fill, minmax(120px, 1fr)); gap:10px; margin-top:10px; }
+  .live-tile { border:1px solid rgba(255,255,255,.12); border-radius:10px; padding:8px 10px; }
+  .live-tile .v { font-size:1.35em; font-weight:600; font-variant-numeric:tabular-nums; }
+  .live-tile .k { opacity:.7; font-size:.85em; }
+</style>
+"""
+
+_LIVE_JS = """
+<script>
+(function(){
+  const root = document.getElementById("live_stats");
+  if(!root || !window.EventSource) return;
+  const state = document.getElementById("live_state");
+  const caches = document.getElementById("live_caches");
+  const fmt = {
+    cpu_pct: v => v.toFixed(1) + " %",
+    rss_mb: v => v.toFixed(1) + " MB",
+    rps: v => v.toFixed(1),
+    p95_ms: v => v.toFixed(1) + " ms",
+  };
+  function pct(v){ return v === null || v === undefined ? "-" : (v * 100).toFixed(1) + " %"; }
+  function esc(s){ return String(s).replace(/[&<>"]/g, c => ({"&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;"}[c])); }
+
+  function render(d){
+    root.querySelectorAll("[data-k]").forEach(el => {
+      const k = el.getAttribute("data-k");
+      const v = d[k];
+      el.textContent = (v === null || v === undefined) ? "-" : (fmt[k] ? fmt[k](v) : String(v));
+    });
+    const lq = root.querySelector('[data-k="log_queue"]');
+    if(lq && d.log_queue_size) lq.title = d.log_queue + "/" + d.log_queue_size + " (dropped " + d.log_dropped + ")";
+    const p95 = root.querySelector('[data-k="p95_ms"]');
+    if(p95) p95.title = d.requests_window + " requests in " + d.window_sec + " s";
+    const rows = Object.entries(d.caches || {}).map(([name, c]) =>
+      "<tr><td><code>" + esc(name) + "</code></td><td style='text-align:right'>" + pct(c.ratio) +
+      "</td><td style='text-align:right'>" + pct(c.ratio_total) + "</td><td style='text-align:right'>" + c.lookups + "</td></tr>");
+    caches.innerHTML = rows.join("");
+    state.textContent = "live • " + new Date(d.ts * 1000).toLocaleTimeString() + " • " + d.clients + " kijker(s)";
+  }
+
+  let es = null;
+  function open(){
+    if(es) return;
+    es = new EventSource("/beheer/system/live");
+    es.onmessage = ev => { try { render(JSON.parse(ev.data)); } catch(e) {} };
+    es.onerror = () => { state.textContent = "verbinding weg — opnieuw proberen…"; };
+  }
+  function close(){
+    if(es){ es.close(); es = null; }
+    state.textContent = "gepauzeerd (tab verborgen)";
+  }
+  document.addEventListener("visibilitychange", () => document.hidden ? close() : open());
+  window.addEventListener("pagehide", close);
+  if(!document.hidden) open();
+})();
+</script>
+"""
+
+
+def live_panel_html() -> str:
+    feed = get_live_feed(current_app)
+    if feed is None:
+        return "<div class='hint'>Live stats uitgeschakeld (hub_settings.json → live_stats.enabled).</div>"
+    tiles = "".join(
+        f"<div class='live-tile'><div class='v' data-k='{key}'>-</div><div class='k'>{label}</div></div>"
+        for key, label in _TILES
+    )
+    return f"""
+      {_LIVE_CSS}
+      <div class="hint"><span id="live_state">verbinden…</span> • elke {feed.interval:g} s via Server-Sent Events,
+        enkel zolang deze pagina open staat</div>
+      <div id="live_stats" class="live-grid">{tiles}</div>
+      <table style="width:100%; margin-top:10px;">
+        <tr><th style="text-align:left">cache</th><th>hit ratio 1 min</th><th>sinds start</th><th>lookups</th></tr>
+        <tbody id="live_caches"></tbody>
+      </table>
+      {_LIVE_JS}
+    """
+
+
+def register_live_routes(app: Flask) -> None:
+    @app.get("/beheer/system/live")
+    def beheer_system_live():
+        feed = get_live_feed(current_app)
+        if feed is None:
+            return "Live stats disabled", 404
+        if not request.environ.get("wsgi.multithread", False):
+            return Response("Live stats need a multithreaded server", status=503, mimetype="text/plain")
+        # plaats atomair reserveren in de view (niet pas bij de eerste chunk); de stream geeft ze vrij
+        if not feed.try_subscribe():
+            resp = Response("Too many live viewers", status=503, mimetype="text/plain")
+            resp.headers["Retry-After"] = "10"
+            return resp
+        resp = Response(feed.stream(), mimetype="text/event-stream")
+        # geen compressie/proxy-buffering: elke sample moet meteen door
+        resp.headers["Cache-Control"] = "no-cache, no-transform"
+        resp.headers["X-Accel-Buffering"] = "no"
+        return resp
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 from urllib.parse import quote
 
 from flask import request, url_for
 
+from beheer.theme_assets import theme_css_href
+from runtime.config_store import config_version, read_json, thaw, write_json
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 CONFIG_DIR = BASE_DIR / "config"
 TOOLS_JSON = CONFIG_DIR / "tools.json"
@@ -18,14 +20,10 @@ THEME_JSON = CONFIG_DIR / "theme.json"
 # Loaders
 # =========================
 def load_tools_config() -> Dict[str, Any]:
-    if not TOOLS_JSON.exists():
-        return {"tools": []}
-    try:
-        data = json.loads(TOOLS_JSON.read_text(encoding="utf-8"))
-        if isinstance(data, dict):
-            return data
-    except Exception:
-        pass
+    # read-only snapshot (gedeeld); gebruik thaw() om te muteren
+    data = read_json(TOOLS_JSON)
+    if isinstance(data, dict):
+        return data
     return {"tools": []}
 
 
@@ -49,26 +47,17 @@ def load_hub_settings() -> Dict[str, Any]:
         "button_rounded": True,
     }
 
-    if not HUB_SETTINGS_JSON.exists():
-        return dict(defaults)
-
-    raw = HUB_SETTINGS_JSON.read_text(encoding="utf-8").strip()
-    if not raw:
+    data = read_json(HUB_SETTINGS_JSON)
+    if data is None:
         return dict(defaults)
 
-    try:
-        data = json.loads(raw)
-
-        # legacy: [ { ... } ]
-        if isinstance(data, list):
-            if data and isinstance(data[0], dict):
-                defaults.update(data[0])
-
-        elif isinstance(data, dict):
-            defaults.update(data)
+    # legacy: [ { ... } ]
+    if isinstance(data, list):
+        if data and isinstance(data[0], dict):
+            defaults.update(data[0])
 
-    except Exception:
-        pass
+    elif isinstance(data, dict):
+        defaults.update(data)
 
     # normalize types
     try:
@@ -84,27 +73,27 @@ def load_hub_settings() -> Dict[str, Any]:
     return dict(defaults)
 
 
-def load_theme_config() -> Dict[str, Any]:
-    if not THEME_JSON.exists():
-        return {"active": "Dark", "themes": {}}
-    try:
-        data = json.loads(THEME_JSON.read_text(encoding="utf-8"))
-        if isinstance(data, dict):
-            return data
-    except Exception:
-        pass
+def _theme_snapshot() -> Dict[str, Any]:
+    data = read_json(THEME_JSON)
+    if isinstance(data, dict):
+        return data
     return {"active": "Dark", "themes": {}}
 
 
-def _css_escape_val(v: Any) -> str:
-    s = str(v)
-    return s.replace("\n", " ").replace("\r", " ").strip()
+def load_theme_config() -> Dict[str, Any]:
+    # muteerbare kopie: theme editor / toggle passen cfg aan en saven
+    return thaw(_theme_snapshot())
+
+
+def _save_theme_config(cfg: Dict[str, Any]) -> None:
+    write_json(THEME_JSON, cfg)
 
 
-def _build_theme_injected_css(cfg: Dict[str, Any]) -> Tuple[str, str, str]:
+def _active_theme(cfg: Dict[str, Any]) -> Tuple[str, str]:
+    """(theme key, icon); de CSS zelf komt uit beheer.theme_assets (gehashte stylesheet)."""
     themes = cfg.get("themes", {})
     if not isinstance(themes, dict) or not themes:
-        return "Dark", "🌙", ""
+        return "Dark", "🌙"
 
     active = str(cfg.get("active") or "")
     if active not in themes:
@@ -114,51 +103,7 @@ def _build_theme_injected_css(cfg: Dict[str, Any]) -> Tuple[str, str, str]:
     if not isinstance(theme, dict):
         theme = {}
 
-    icon = str(theme.get("icon") or "🎨")
-    vars_map = theme.get("vars", {})
-    if not isinstance(vars_map, dict):
-        vars_map = {}
-
-    # defaults so things never break
-    defv = {
-        "--bg": "#000",
-        "--text": "#e8f2f2",
-        "--muted": "#9fb3b3",
-        "--border": "rgba(255,255,255,.10)",
-        "--shadow": "0 12px 40px rgba(0,0,0,.55)",
-        "--accent": "#35e6df",
-        "--grad_top": "#08121a",
-        "--grad_bottom": "#000",
-        "--panel_bg": "rgba(10,15,18,.55)",
-        "--card_bg": "rgba(10,15,18,.68)",
-        "--footer_bg": "rgba(0,0,0,.35)",
-    }
-
-    merged = dict(defv)
-    merged.update(vars_map)
-
-    decls = "\n".join(
-        [f"  {k}: {_css_escape_val(v)};" for k, v in merged.items() if str(k).startswith("--")]
-    )
-
-    css = f"""
-/* ===== THEME INJECT (config/theme.json) ===== */
-:root {{
-{decls}
-}}
-body, body.page {{
-  background: radial-gradient(1200px 700px at 50% 0%, var(--grad_top) 0%, var(--grad_bottom) 60%) !important;
-  background-color: var(--bg) !important;
-  color: var(--text) !important;
-}}
-.panel {{
-  background: var(--panel_bg) !important;
-}}
-.toolcard {{
-  background: var(--card_bg) !important;
-}}
-"""
-    return active, icon, css
+    return active, str(theme.get("icon") or "🎨")
 
 
 # =========================
@@ -199,15 +144,67 @@ def _beheer_items() -> List[dict]:
     ]
 
 
+# =========================
+# Layout shell cache
+# =========================
+# Per-request velden; de rest van de shell hangt enkel af van tools/hub/theme config.
+_REQUEST_FIELDS = ("page_title", "back_q", "content_html")
+_FIELD_MARK = "\x00"
+
+# is_beheer -> (config versie, brand, parts)
+# parts: afwisselend vaste tekst (even index) en veldnaam (oneven index)
+_SHELL_CACHE: Dict[bool, Tuple[int, str, Tuple[str, ...]]] = {}
+
+
+def _layout_version() -> int:
+    return config_version(TOOLS_JSON, HUB_SETTINGS_JSON, THEME_JSON)
+
+
+def _shell_parts(is_beheer: bool) -> Tuple[str, Tuple[str, ...]]:
+    ver = _layout_version()
+    hit = _SHELL_CACHE.get(is_beheer)
+    if hit is not None and hit[0] == ver:
+        return hit[1], hit[2]
+
+    brand, html = _build_shell(is_beheer)
+    parts = tuple(html.split(_FIELD_MARK))
+    _SHELL_CACHE[is_beheer] = (ver, brand, parts)
+    return brand, parts
+
+
+def clear_layout_cache() -> None:
+    _SHELL_CACHE.clear()
+
+
 # =========================
 # Layout renderer
 # =========================
 def render_page(*, title: str, content_html: str) -> str:
-    path = request.path or ""
+    brand, parts = _shell_parts((request.path or "").startswith("/beheer"))
+
+    back_url = request.full_path or "/"
+    if back_url.endswith("?"):
+        back_url = back_url[:-1]
+
+    values = {
+        "page_title": f"{brand} | {title}" if title else brand,
+        "back_q": quote(back_url, safe=""),
+        "content_html": content_html,
+    }
+    out = list(parts)
+    for i in range(1, len(out), 2):
+        out[i] = values[out[i]]
+    return "".join(out)
+
+
+def _build_shell(is_beheer: bool) -> Tuple[str, str]:
+    """
+    Bouwt de volledige document-shell (head, topbar, menus, footer) met
+    markers voor de per-request velden. Enkel opnieuw bij config-wijziging.
+    """
     hub = load_hub_settings()
 
-    brand = str(hub.get("brand_beheer") or "CyNiT Beheer") if path.startswith("/beheer") else str(hub.get("brand_tools") or "CyNiT Tools")
-    page_title = f"{brand} | {title}" if title else brand
+    brand = str(hub.get("brand_beheer") or "CyNiT Beheer") if is_beheer else str(hub.get("brand_tools") or "CyNiT Tools")
 
     css_href = url_for("static", filename="css/main.css")
     js_src = url_for("static", filename="js/main.js")
@@ -240,18 +237,14 @@ def render_page(*, title: str, content_html: str) -> str:
     tools_html = "\n".join(dd_item(it) for it in tools) or '<div class="dropdown-empty">Geen tools</div>'
     beheer_html = "\n".join(dd_item(it) for it in beheer) or '<div class="dropdown-empty">Geen beheer items</div>'
 
-    theme_cfg = load_theme_config()
-    active_key, active_icon, theme_css = _build_theme_injected_css(theme_cfg)
+    theme_cfg = _theme_snapshot()
+    active_key, active_icon = _active_theme(theme_cfg)
+    theme_href = theme_css_href(active_key)
 
     themes = theme_cfg.get("themes", {})
     if not isinstance(themes, dict):
         themes = {}
 
-    back_url = request.full_path or "/"
-    if back_url.endswith("?"):
-        back_url = back_url[:-1]
-    back_q = quote(back_url, safe="")
-
     theme_options = []
     for k, v in themes.items():
         if not isinstance(v, dict):
@@ -287,22 +280,10 @@ def render_page(*, title: str, content_html: str) -> str:
   <title>%(page_title)s</title>
   <link rel="icon" href="%(favicon_ico)s">
   <link rel="stylesheet" href="%(css_href)s">
-  <style>
-  %(theme_css)s
-  :root{ --home-cols: %(home_cols)s; }
-
-  .brand-title {
-    white-space: nowrap;
-    overflow: hidden;
-    text-overflow: ellipsis;
-    max-width: min(72vw, 860px);
-    display: inline-block;
-    font-size: clamp(14px, 2.2vw, 24px);
-  }
-  </style>
+  <link rel="stylesheet" href="%(theme_href)s">
 </head>
 
-<body class="%(body_classes)s">
+<body class="%(body_classes)s" style="--home-cols: %(home_cols)s;">
 
 <header class="topbar">
   <div class="topbar-left">
@@ -356,7 +337,7 @@ def render_page(*, title: str, content_html: str) -> str:
 <!-- 1) Load main.js: dropdowns + UX -->
 <script src="%(js_src)s"></script>
 
-<!-- ✅ 2) Click logger: logt alle clicks naar /_log/click -->
+<!-- ✅ 2) Click logger: bundelt clicks en stuurt ze als beacon naar /_log/clicks -->
 <script src="%(clicks_js_src)s"></script>
 
 <!-- 3) Theme select redirect -->
@@ -375,12 +356,12 @@ def render_page(*, title: str, content_html: str) -> str:
 </body>
 </html>
 """ % {
-        "page_title": page_title,
+        **{k: f"{_FIELD_MARK}{k}{_FIELD_MARK}" for k in _REQUEST_FIELDS},
         "favicon_ico": favicon_ico,
         "css_href": css_href,
         "js_src": js_src,
         "clicks_js_src": clicks_js_src,
-        "theme_css": theme_css,
+        "theme_href": theme_href,
         "logo_src": logo_src,
         "body_classes": body_classes_str,
         "tools_html": tools_html,
@@ -389,9 +370,7 @@ def render_page(*, title: str, content_html: str) -> str:
         "active_key": active_key,
         "theme_options_html": theme_options_html,
         "toggle_icon": toggle_icon,
-        "back_q": back_q,
         "home_cols": home_cols,
-        "content_html": content_html,
     }
 
-    return html
+    return brand, html
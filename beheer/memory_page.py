@@ -0,0 +1,236 @@
+"""
+beheer/memory_page.py — /beheer/system/memory: RSS, GC, grootste types/stores, tracemalloc diffs
+
+- overzicht: RSS (+ piek), GC generaties, grootste objecttypes, grootste module-level stores
+- tracemalloc: start (frames instelbaar) / stop, benoemde snapshot nemen, twee snapshots vergelijken
+  (?a=<oud>&b=<nieuw>): top groei per file:line + groei per hub-module, tools vertaald naar tool id
+- gc.collect() knop (met RSS voor/na)
+"""
+
+from __future__ import annotations
+
+import time
+from html import escape
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from flask import Flask, redirect, request
+
+from beheer.main_layout import load_tools, render_page
+from runtime import memory_diag
+
+
+def _mb(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.1f} MB"
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:+,.1f}" if n else "0"
+
+
+def _tool_names() -> Dict[str, str]:
+    """'tools/voica1.py' -> 'voica1' (tool id uit tools.json)."""
+    out: Dict[str, str] = {}
+    for t in load_tools():
+        script = str(t.get("script") or "").replace("\\", "/")
+        if script and t.get("id"):
+            out[script if script.startswith("tools/") else f"tools/{script}"] = str(t["id"])
+    return out
+
+
+def _owner_label(owner: str, tools: Dict[str, str]) -> str:
+    if owner in tools:
+        return f"<b>{escape(tools[owner])}</b> <span class='hint'>({escape(owner)})</span>"
+    return f"<code>{escape(owner)}</code>"
+
+
+def _table(head: List[str], rows: List[str]) -> str:
+    left = " style='text-align:left'"
+    ths = "".join(f"<th{left if i == 0 else ''}>{h}</th>" for i, h in enumerate(head))
+    return f"<table style='width:100%; margin-top:8px;'><tr>{ths}</tr>{''.join(rows)}</table>"
+
+
+def _overview_html() -> str:
+    r = memory_diag.rss()
+    g = memory_diag.gc_info()
+    gens = " • ".join(
+        f"gen{i}: {g['counts'][i]}/{g['thresholds'][i]} ({s.get('collections', 0)} collecties, {s.get('collected', 0)} vrijgegeven)"
+        for i, s in enumerate(g["stats"])
+    )
+    return f"""
+      <div class="hint">RSS <b>{_mb(r['rss_mb'])}</b> • piek {_mb(r['peak_mb'])} ({escape(str(r['source']))})
+        • {g['tracked']:,} getrackte objecten • gc.garbage {g['garbage']}{'' if g['enabled'] else ' • <b>gc uit</b>'}</div>
+      <div class="hint" style="margin-top:4px;">{gens}</div>
+      <form method="post" action="/beheer/system/memory/gc" style="margin-top:8px;">
+        <button class="btn" type="submit">♻️ gc.collect()</button>
+      </form>
+    """
+
+
+def _types_html() -> str:
+    rows, ms = memory_diag.type_sizes(25)
+    body = [
+        f"<tr><td><code>{escape(name)}</code></td><td style='text-align:right'>{count:,}</td>"
+        f"<td style='text-align:right'>{size / 1024:,.0f}</td></tr>"
+        for name, count, size in rows
+    ]
+    return f"<div class='hint'>shallow sys.getsizeof, enkel gc-getrackte objecten ({ms:.0f} ms)</div>" + _table(
+        ["type", "aantal", "KB"], body
+    )
+
+
+def _stores_html() -> str:
+    body = [
+        f"<tr><td><code>{escape(s['module'])}.{escape(s['name'])}</code></td><td>{escape(s['type'])}</td>"
+        f"<td style='text-align:right'>{s['len']:,}</td><td style='text-align:right'>{s['bytes'] / 1024:,.1f}</td></tr>"
+        for s in memory_diag.module_stores(20)
+    ]
+    if not body:
+        return "<div class='hint'>Geen gevulde module-level containers.</div>"
+    return "<div class='hint'>container + shallow grootte van de items (1 niveau)</div>" + _table(
+        ["global", "type", "items", "KB"], body
+    )
+
+
+def _tracemalloc_html(a: str, b: str) -> str:
+    st = memory_diag.tracemalloc_status()
+    snaps = st["snapshots"]
+    if st["tracing"]:
+        state = (
+            f"<b>aan</b> ({st['frames']} frames) • getraceerd {_mb(st['traced_mb'])} • piek {_mb(st['peak_mb'])}"
+            f" • overhead {_mb(st['overhead_mb'])}"
+        )
+        toggle = """
+          <form method="post" action="/beheer/system/memory/tracemalloc" style="display:inline;">
+            <input type="hidden" name="action" value="stop"><button class="btn" type="submit">⏹ Stop</button>
+          </form>
+          <form method="post" action="/beheer/system/memory/snapshot" style="display:inline;">
+            <input name="name" placeholder="naam (bv. voor-import)" style="min-width:200px;">
+            <button class="btn" type="submit">📸 Snapshot</button>
+          </form>"""
+    else:
+        state = "uit"
+        toggle = """
+          <form method="post" action="/beheer/system/memory/tracemalloc" style="display:inline;">
+            <input type="hidden" name="action" value="start">
+            <input name="frames" type="number" min="1" max="50" value="10" style="width:70px;" title="traceback frames">
+            <button class="btn" type="submit">▶ Start tracemalloc</button>
+          </form>"""
+
+    snap_rows = [
+        f"<tr><td><code>{escape(s['name'])}</code></td>"
+        f"<td>{escape(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s['ts'])))}</td>"
+        f"<td style='text-align:right'>{s['traces']:,}</td></tr>"
+        for s in snaps
+    ]
+    compare = ""
+    if len(snaps) >= 2:
+        names = [s["name"] for s in snaps]
+        a = a if a in names else names[-2]
+        b = b if b in names else names[-1]
+
+        def _opts(sel: str) -> str:
+            return "".join(f"<option{' selected' if n == sel else ''}>{escape(n)}</option>" for n in names)
+
+        compare = f"""
+          <form method="get" action="/beheer/system/memory" style="margin-top:8px; display:flex; gap:8px; align-items:center;">
+            <select name="a">{_opts(a)}</select> → <select name="b">{_opts(b)}</select>
+            <button class="btn" type="submit">Vergelijk</button>
+          </form>"""
+    return f"""
+      <div class="hint">tracemalloc {state}</div>
+      <div style="margin-top:8px; display:flex; gap:8px; flex-wrap:wrap;">{toggle}</div>
+      {_table(["snapshot", "tijd", "traces"], snap_rows) if snap_rows else ""}
+      {compare}
+    """
+
+
+def _diff_html(a: str, b: str) -> str:
+    try:
+        d = memory_diag.diff(a, b, 30)
+    except KeyError:
+        return "<div class='hint'>Snapshot niet gevonden.</div>"
+    tools = _tool_names()
+    owner_rows = [
+        f"<tr><td>{_owner_label(o['owner'], tools)}</td><td style='text-align:right'>{_kb(o['size_diff'])}</td>"
+        f"<td style='text-align:right'>{o['count_diff']:+,}</td></tr>"
+        for o in d["owners"]
+    ]
+    top_rows = [
+        f"<tr><td><code>{escape(r.where)}</code></td><td>{_owner_label(r.owner, tools)}</td>"
+        f"<td style='text-align:right'>{_kb(r.size_diff)}</td><td style='text-align:right'>{r.size / 1024:,.1f}</td>"
+        f"<td style='text-align:right'>{r.count_diff:+,}</td></tr>"
+        for r in d["top"]
+    ]
+    return f"""
+      <div class="hint"><code>{escape(d['old'])}</code> → <code>{escape(d['new'])}</code> ({d['seconds']} s)
+        • netto {_kb(d['total_diff'])} KB • {d['ms']:.0f} ms</div>
+      <h4 style="margin:12px 0 0 0;">Groei per hub-module (eerste hub-frame in de traceback)</h4>
+      {_table(["module / tool", "Δ KB", "Δ blokken"], owner_rows)}
+      <h4 style="margin:12px 0 0 0;">Top allocatie-plaatsen</h4>
+      {_table(["file:line", "module / tool", "Δ KB", "KB nu", "Δ blokken"], top_rows)}
+    """
+
+
+def register_memory_routes(app: Flask) -> None:
+    @app.get("/beheer/system/memory")
+    def beheer_memory():
+        a = (request.args.get("a") or "").strip()
+        b = (request.args.get("b") or "").strip()
+        msg = (request.args.get("msg") or "").strip()
+        content = f"""
+        <div class="panel">
+          <h2 style="margin:0 0 8px 0;">Geheugen</h2>
+          <div class="hint"><a href="/beheer/system">← System</a></div>
+          {f"<div class='pill' style='margin-top:8px;'>{escape(msg)}</div>" if msg else ""}
+          <div style="margin-top:12px;">{_overview_html()}</div>
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">tracemalloc</h3>
+          {_tracemalloc_html(a, b)}
+          {_diff_html(a, b) if a and b else ""}
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Module-level stores</h3>
+          {_stores_html()}
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Grootste objecttypes</h3>
+          {_types_html()}
+        </div>
+        """
+        return render_page(title="Geheugen", content_html=content)
+
+    @app.post("/beheer/system/memory/gc")
+    def beheer_memory_gc():
+        r = memory_diag.collect()
+        msg = (f"gc.collect(): {r['collected']} objecten in {r['ms']} ms • "
+               f"RSS {_mb(r['rss_before_mb'])} → {_mb(r['rss_after_mb'])}")
+        return redirect(f"/beheer/system/memory?{urlencode(dict(msg=msg))}")
+
+    @app.post("/beheer/system/memory/tracemalloc")
+    def beheer_memory_tracemalloc():
+        if request.form.get("action") == "start":
+            try:
+                frames = int(request.form.get("frames") or memory_diag.DEFAULT_FRAMES)
+            except ValueError:
+                frames = memory_diag.DEFAULT_FRAMES
+            memory_diag.start_tracing(frames)
+        else:
+            memory_diag.stop_tracing()
+        return redirect("/beheer/system/memory")
+
+    @app.post("/beheer/system/memory/snapshot")
+    def beheer_memory_snapshot():
+        try:
+            name = memory_diag.take_snapshot(request.form.get("name") or "")
+        except RuntimeError as e:
+            return redirect(f"/beheer/system/memory?{urlencode(dict(msg=str(e)))}")
+        names = [s["name"] for s in memory_diag.snapshot_names()]
+        if len(names) >= 2:
+            # meteen de diff met de vorige tonen
+            return redirect(f"/beheer/system/memory?{urlencode(dict(a=names[-2], b=name))}")
+        return redirect(f"/beheer/system/memory?{urlencode(dict(msg=f'snapshot {name} genomen'))}")
@@ -0,0 +1,302 @@
+"""
+beheer/profiles_page.py — /beheer/system/profiles: opgeslagen request-profielen + flamegraph
+
+- lijst van de recentste profielen (route, tool, status, totale tijd, modus)
+- detail: flamegraph (icicle, root bovenaan; klik = inzoomen via ?focus=<kind-indexen>) + top functies op self-tijd
+- /beheer/system/profiles/<id>/collapsed: ruwe collapsed stacks (flamegraph.pl, speedscope)
+- "Profileer pad": intern GET-request met X-CyNiT-Profile (loopback) -> redirect naar het profiel
+- trage requests (runtime/slow_requests.py): nu lopend + de recentste, zelfde flamegraph
+"""
+
+from __future__ import annotations
+
+import time
+import zlib
+from html import escape
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, Response, abort, current_app, redirect, request, send_file
+
+from beheer.main_layout import render_page
+from runtime.profiler import MODES, Profile, get_profiler, top_functions
+from runtime.slow_requests import get_slow_watchdog
+
+ROW_PX = 18
+MIN_WIDTH_PCT = 0.15     # smallere blokken worden niet getekend (wel meegeteld)
+
+
+# -------------------------
+# Flamegraph
+# -------------------------
+def _tree(stacks: Dict[str, float]) -> Dict[str, Any]:
+    root: Dict[str, Any] = {"name": "all", "value": 0.0, "children": {}}
+    for key, us in stacks.items():
+        root["value"] += us
+        node = root
+        for name in key.split(";"):
+            node = node["children"].setdefault(name, {"name": name, "value": 0.0, "children": {}})
+            node["value"] += us
+    return root
+
+
+def _kids(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return sorted(node["children"].values(), key=lambda c: c["name"])
+
+
+def _color(name: str) -> str:
+    if "[" in name and name.endswith("]"):
+        hue = 30                                  # C functies / builtins
+    elif "(tools/" in name or "(beheer/" in name or "(runtime/" in name or "(master.py" in name:
+        hue = 175                                 # eigen code
+    else:
+        hue = 210                                 # libraries (flask, jinja2, werkzeug, stdlib)
+    light = 32 + zlib.crc32(name.encode("utf-8")) % 14
+    return f"hsla({hue},70%,{light}%,.9)"
+
+
+def _flame_rows(node: Dict[str, Any], total: float, depth: int, left: float, prefix: str, out: List[str]) -> int:
+    max_depth = depth
+    x = left
+    for i, child in enumerate(_kids(node)):
+        width = child["value"] / total * 100 if total else 0.0
+        if width >= MIN_WIDTH_PCT:
+            # focus = pad van kind-indexen ("3.0.12"): korte links, ook bij diepe stacks
+            path = f"{prefix}.{i}" if prefix else str(i)
+            ms = child["value"] / 1000
+            label = escape(child["name"])
+            out.append(
+                f"<a href='?focus={path}' title='{label} — {ms:.2f} ms ({width:.1f}%)' "
+                f"style='top:{depth * ROW_PX}px; left:{x:.3f}%; width:{width:.3f}%; background:{_color(child['name'])};'>"
+                f"{label}</a>"
+            )
+            max_depth = max(max_depth, _flame_rows(child, total, depth + 1, x, path, out))
+        x += width
+    return max_depth
+
+
+def flamegraph_html(stacks: Dict[str, float], focus: str = "") -> str:
+    root = _tree(stacks)
+    node, crumbs, prefix = root, ["<a href='?'>all</a>"], ""
+    for part in [p for p in (focus or "").split(".") if p]:
+        kids = _kids(node)
+        if not part.isdigit() or int(part) >= len(kids):
+            break
+        node = kids[int(part)]
+        prefix = f"{prefix}.{part}" if prefix else part
+        crumbs.append(f"<a href='?focus={prefix}'>{escape(node['name'].split(' (')[0])}</a>")
+    if not node["value"]:
+        return "<div class='hint'>Geen stacks (te kort request).</div>"
+    blocks: List[str] = []
+    depth = _flame_rows(node, node["value"], 1, 0.0, prefix, blocks)
+    crumbs_html = f"<div class='hint' style='margin-bottom:6px;'>{' › '.join(crumbs)}</div>" if prefix else ""
+    return f"""
+      <style>
+        .flame {{ position:relative; width:100%; overflow:hidden; }}
+        .flame a, .flame .flame-root {{ position:absolute; height:{ROW_PX - 1}px; overflow:hidden; white-space:nowrap;
+          font-size:11px; line-height:{ROW_PX - 1}px; padding-left:3px; box-sizing:border-box; color:#fff;
+          text-decoration:none; border-right:1px solid rgba(0,0,0,.35); }}
+        .flame .flame-root {{ top:0; left:0; right:0; background:rgba(255,255,255,.12); }}
+      </style>
+      {crumbs_html}
+      <div class="flame" style="height:{(depth + 1) * ROW_PX}px;">
+        <div class="flame-root">{escape(node['name'])} — {node['value'] / 1000:.2f} ms</div>
+        {''.join(blocks)}
+      </div>
+    """
+
+
+def _top_html(stacks: Dict[str, float], total_us: float) -> str:
+    rows = []
+    for name, self_us, cum_us in top_functions(stacks, 30):
+        pct = self_us / total_us * 100 if total_us else 0.0
+        rows.append(
+            f"<tr><td><code>{escape(name)}</code></td>"
+            f"<td style='text-align:right'>{self_us / 1000:.2f}</td>"
+            f"<td style='text-align:right'>{pct:.1f}</td>"
+            f"<td style='text-align:right'>{cum_us / 1000:.2f}</td></tr>"
+        )
+    return f"""
+      <table style="width:100%; margin-top:8px;">
+        <tr><th style="text-align:left">functie</th><th>self ms</th><th>self %</th><th>cum ms</th></tr>
+        {''.join(rows)}
+      </table>
+    """
+
+
+# -------------------------
+# Pagina's
+# -------------------------
+def _list_html(items: List[Dict[str, Any]]) -> str:
+    if not items:
+        return "<div class='hint'>Nog geen profielen. Voeg <code>?_profile=1</code> toe aan een URL (vanaf localhost) of gebruik het formulier.</div>"
+    rows = []
+    for p in items:
+        rows.append(
+            f"<tr><td><a href='/beheer/system/profiles/{escape(p['id'])}'>{escape(p['id'])}</a></td>"
+            f"<td><code>{escape(p['method'])} {escape(p['path'])}</code></td>"
+            f"<td><code>{escape(p['route'])}</code></td>"
+            f"<td>{escape(p['tool'])}</td>"
+            f"<td style='text-align:right'>{int(p['status'])}</td>"
+            f"<td style='text-align:right'>{float(p['total_ms']):.1f}</td>"
+            f"<td>{escape(p['mode'])}</td></tr>"
+        )
+    return f"""
+      <table style="width:100%; margin-top:8px;">
+        <tr><th style="text-align:left">profiel</th><th style="text-align:left">request</th>
+            <th style="text-align:left">route</th><th style="text-align:left">tool</th>
+            <th>status</th><th>ms</th><th style="text-align:left">modus</th></tr>
+        {''.join(rows)}
+      </table>
+    """
+
+
+def _slow_html() -> str:
+    wd = get_slow_watchdog(current_app)
+    if wd is None:
+        return "<div class='hint'>Slow-request watchdog staat uit (hub_settings.json → <code>slow_requests.enabled</code>).</div>"
+    st = wd.stats()
+    running = "".join(
+        f"<tr><td><code>{escape(r['method'])} {escape(r['path'])}</code></td><td>{escape(r['tool'])}</td>"
+        f"<td style='text-align:right'>{int(r['elapsed_ms'])}</td><td style='text-align:right'>{int(r['samples'])}</td></tr>"
+        for r in wd.in_flight()
+    )
+    rows = []
+    for s in wd.recent():
+        rows.append(
+            f"<tr><td><a href='/beheer/system/slow/{s.id}'>#{s.id}</a></td>"
+            f"<td>{escape(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s.ts)))}</td>"
+            f"<td><code>{escape(s.method)} {escape(s.path)}</code></td>"
+            f"<td><code>{escape(s.route)}</code></td><td>{escape(s.tool)}</td>"
+            f"<td style='text-align:right'>{s.status}</td>"
+            f"<td style='text-align:right'>{s.total_ms:.0f}</td>"
+            f"<td style='text-align:right'>{s.samples}</td></tr>"
+        )
+    running_html = ""
+    if running:
+        running_html = f"""
+      <table style="width:100%; margin-top:8px;">
+        <tr><th style="text-align:left">nu bezig</th><th style="text-align:left">tool</th><th>ms</th><th>samples</th></tr>
+        {running}
+      </table>"""
+    recent_html = "<div class='hint' style='margin-top:8px;'>Nog geen trage requests sinds de start.</div>"
+    if rows:
+        recent_html = f"""
+      <table style="width:100%; margin-top:8px;">
+        <tr><th style="text-align:left">#</th><th style="text-align:left">tijd</th><th style="text-align:left">request</th>
+            <th style="text-align:left">route</th><th style="text-align:left">tool</th>
+            <th>status</th><th>ms</th><th>samples</th></tr>
+        {''.join(rows)}
+      </table>"""
+    return f"""
+      <div class="hint">drempel {st['threshold_ms']} ms • sample elke {st['sample_interval_ms']} ms •
+        {st['slow']} trage requests sinds de start • volledige historiek in <code>logs/slow.log</code></div>
+      {running_html}
+      {recent_html}
+    """
+
+
+def register_profile_routes(app: Flask) -> None:
+    @app.get("/beheer/system/profiles")
+    def beheer_profiles():
+        prof = get_profiler(current_app)
+        if prof is None:
+            body = "<div class='hint'>Profiling staat uit (hub_settings.json → <code>profiling.enabled</code>).</div>"
+        else:
+            options = "".join(f"<option value='{m}'>{m}</option>" for m in MODES)
+            body = f"""
+              <form method="post" action="/beheer/system/profiles/run"
+                    style="display:flex; gap:8px; flex-wrap:wrap; align-items:center;">
+                <input name="path" value="/" placeholder="/links" style="min-width:260px;">
+                <select name="mode">{options}</select>
+                <button class="btn" type="submit">⏱ Profileer pad</button>
+              </form>
+              <div class="hint" style="margin-top:6px;">Of: <code>?_profile=1</code> / <code>?_profile=sample</code>
+                of header <code>X-CyNiT-Profile</code> op eender welk request vanaf localhost.
+                Bewaard in <code>{escape(str(prof.store.dir))}</code> (laatste {prof.store.keep}).</div>
+              {_list_html(prof.store.list())}
+            """
+        content = f"""
+        <div class="panel">
+          <h2 style="margin:0 0 8px 0;">Request profielen</h2>
+          <div class="hint"><a href="/beheer/system">← System</a></div>
+          <div style="margin-top:12px;">{body}</div>
+        </div>
+        """
+        content += f"""
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Trage requests (automatisch gesampled)</h3>
+          {_slow_html()}
+        </div>
+        """
+        return render_page(title="Profielen", content_html=content)
+
+    @app.get("/beheer/system/slow/<int:slow_id>")
+    def beheer_slow(slow_id: int):
+        wd = get_slow_watchdog(current_app)
+        s = wd.get(slow_id) if wd is not None else None
+        if s is None:
+            abort(404)
+        sampled = sum(s.stacks.values())
+        content = f"""
+        <div class="panel">
+          <h2 style="margin:0 0 8px 0;">Traag request #{s.id}</h2>
+          <div class="hint"><a href="/beheer/system/profiles">← Profielen</a> •
+            <code>{escape(s.method)} {escape(s.path)}</code> → {s.status} • route <code>{escape(s.route)}</code>
+            • tool {escape(s.tool)} • {s.total_ms:.0f} ms ({sampled / 1000:.0f} ms gesampled na de drempel,
+            {s.samples} samples)</div>
+          <div style="margin-top:12px;">{flamegraph_html(s.stacks, request.args.get('focus') or '')}</div>
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Top functies (self-tijd)</h3>
+          {_top_html(s.stacks, sampled)}
+        </div>
+        """
+        return render_page(title="Traag request", content_html=content)
+
+    @app.post("/beheer/system/profiles/run")
+    def beheer_profiles_run():
+        prof = get_profiler(current_app)
+        path = (request.form.get("path") or "/").strip()
+        mode = (request.form.get("mode") or "trace").strip()
+        if prof is None or not path.startswith("/") or path.startswith("/beheer/system/profiles"):
+            return redirect("/beheer/system/profiles")
+        # intern request (loopback) -> zelfde middleware als een echte browser-request
+        resp = current_app.test_client().get(path, headers={"X-CyNiT-Profile": mode if mode in MODES else "trace"})
+        resp.close()
+        return redirect(resp.headers.get("X-CyNiT-Profile") or "/beheer/system/profiles")
+
+    @app.get("/beheer/system/profiles/<pid>")
+    def beheer_profile(pid: str):
+        prof = get_profiler(current_app)
+        p: Optional[Profile] = prof.store.load(pid) if prof is not None else None
+        if p is None:
+            abort(404)
+        total_us = sum(p.stacks.values())
+        unit = "calls" if p.mode == "trace" else "samples"
+        content = f"""
+        <div class="panel">
+          <h2 style="margin:0 0 8px 0;">Profiel {escape(p.id)}</h2>
+          <div class="hint"><a href="/beheer/system/profiles">← Profielen</a> •
+            <code>{escape(p.method)} {escape(p.path)}</code> → {p.status} • route <code>{escape(p.route)}</code>
+            • tool {escape(p.tool)} • {p.total_ms:.1f} ms • {escape(p.mode)} ({p.calls} {unit})
+            • <a href="/beheer/system/profiles/{escape(p.id)}/collapsed">collapsed stacks</a></div>
+          <div style="margin-top:12px;">{flamegraph_html(p.stacks, request.args.get('focus') or '')}</div>
+        </div>
+
+        <div class="panel" style="margin-top:14px;">
+          <h3 style="margin:0 0 8px 0;">Top functies (self-tijd)</h3>
+          {_top_html(p.stacks, total_us)}
+        </div>
+        """
+        return render_page(title="Profiel", content_html=content)
+
+    @app.get("/beheer/system/profiles/<pid>/collapsed")
+    def beheer_profile_collapsed(pid: str):
+        prof = get_profiler(current_app)
+        path = prof.store.collapsed_path(pid) if prof is not None else None
+        if path is None:
+            abort(404)
+        resp: Response = send_file(path, mimetype="text/plain", download_name=f"{pid}.collapsed")
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
@@ -5,17 +5,19 @@ import os
 import shutil
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List
 
-BASE_DIR = Path(__file__).resolve().parents[2]
+# beheer/system_actions.py -> project root is parents[1] (tray schrijft daar runtime/)
+BASE_DIR = Path(__file__).resolve().parents[1]
 RUNTIME_DIR = BASE_DIR / "runtime"
 HEARTBEAT_FILE = RUNTIME_DIR / "watchdog_heartbeat.json"
+BOOT_TIMELINE_FILE = RUNTIME_DIR / "boot_timeline.json"
 
 # Welke folders wil je als "cache" beschouwen?
+# (niet static/css + static/js: dat zijn de bronbestanden; runtime/static_build wordt live geserveerd)
 CACHE_DIRS = [
     BASE_DIR / "tmp",
-    BASE_DIR / "static" / "css",
-    BASE_DIR / "static" / "js",
+    RUNTIME_DIR / "jinja_cache",
 ]
 
 
@@ -110,6 +112,27 @@ def watchdog_status(max_age_seconds: int = 15) -> Dict[str, str | bool | int]:
         }
 
 
+# -------------------------
+# Boot timeline
+# -------------------------
+def boot_timeline() -> Dict[str, Any]:
+    """
+    Timeline van de huidige boot:
+    - heartbeat "boot" (tray + master spans) als die bij dit proces hoort
+    - anders de in-process trace (bv. gestart zonder tray / via wsgi)
+    """
+    from runtime.boot_trace import BOOT
+
+    try:
+        hb = json.loads(HEARTBEAT_FILE.read_text(encoding="utf-8"))
+        boot = hb.get("boot") if isinstance(hb, dict) else None
+        if isinstance(boot, dict) and boot.get("boot_id") == BOOT.boot_id and boot.get("spans"):
+            return boot
+    except Exception:
+        pass
+    return BOOT.to_dict()
+
+
 # -------------------------
 # Cache clearing
 # -------------------------
@@ -129,8 +152,7 @@ def _clear_pycache(root: Path) -> int:
 
 def clear_cache() -> List[str]:
     """
-    Best effort cleanup: tmp + static/css + static/js + __pycache__/pyc
-    (Pas aan als je main.css/js niet wil verwijderen.)
+    Best effort cleanup: tmp + runtime/jinja_cache + __pycache__/pyc
     """
     removed: List[str] = []
 
@@ -162,4 +184,7 @@ def request_restart() -> None:
     """
     In watchdog mode: master stoppen -> tray_runner herstart.
     """
+    # os._exit slaat atexit over -> log queue eerst leegschrijven
+    import logging
+    logging.shutdown()
     os._exit(0)
@@ -0,0 +1,182 @@
+"""
+beheer/theme_assets.py — theme.json -> gecompileerde, content-hashed stylesheets
+
+- elke theme wordt 1x per theme.json-versie gecompileerd naar /static/theme/<naam>.<hash>.css
+- alle themes tegelijk: /theme/set en /theme/toggle wisselen enkel de URL in de layout
+- in geheugen enkel de huidige en de vorige theme.json-versie (open tabs blijven werken);
+  alles wordt best effort naar runtime/static_build/theme/ geschreven, oudere hashes komen
+  van daar (zonder ze opnieuw in geheugen te houden)
+- serveren met Cache-Control: immutable (hash in de naam = nieuwe URL bij elke wijziging)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, Response, abort, request
+
+from runtime.config_store import config_version, read_json
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+THEME_JSON = BASE_DIR / "config" / "theme.json"
+BUILD_DIR = BASE_DIR / "runtime" / "static_build" / "theme"
+URL_PREFIX = "/static/theme/"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# defaults so things never break
+DEFAULT_VARS = {
+    "--bg": "#000",
+    "--text": "#e8f2f2",
+    "--muted": "#9fb3b3",
+    "--border": "rgba(255,255,255,.10)",
+    "--shadow": "0 12px 40px rgba(0,0,0,.55)",
+    "--accent": "#35e6df",
+    "--grad_top": "#08121a",
+    "--grad_bottom": "#000",
+    "--panel_bg": "rgba(10,15,18,.55)",
+    "--card_bg": "rgba(10,15,18,.68)",
+    "--footer_bg": "rgba(0,0,0,.35)",
+}
+
+# vaste layout-regels die vroeger inline in elke pagina stonden
+_STATIC_RULES = """
+.brand-title {
+  white-space: nowrap;
+  overflow: hidden;
+  text-overflow: ellipsis;
+  max-width: min(72vw, 860px);
+  display: inline-block;
+  font-size: clamp(14px, 2.2vw, 24px);
+}
+"""
+
+_lock = threading.Lock()
+# theme.json versie -> {theme key: bestandsnaam}
+_build: Tuple[int, Dict[str, str]] = (-1, {})
+# bestandsnaam -> css bytes: huidige versie en de versie daarvoor (begrensd)
+_files: Dict[str, bytes] = {}
+_prev_files: Dict[str, bytes] = {}
+
+
+def _css_escape_val(v: Any) -> str:
+    s = str(v)
+    return s.replace("\n", " ").replace("\r", " ").strip()
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", name).strip("-") or "theme"
+
+
+def compile_theme_css(theme: Dict[str, Any]) -> str:
+    vars_map = theme.get("vars", {})
+    if not isinstance(vars_map, dict):
+        vars_map = {}
+
+    merged = dict(DEFAULT_VARS)
+    merged.update(vars_map)
+
+    decls = "\n".join(
+        [f"  {k}: {_css_escape_val(v)};" for k, v in merged.items() if str(k).startswith("--")]
+    )
+
+    return f"""/* ===== THEME (config/theme.json) ===== */
+:root {{
+{decls}
+}}
+body, body.page {{
+  background: radial-gradient(1200px 700px at 50% 0%, var(--grad_top) 0%, var(--grad_bottom) 60%) !important;
+  background-color: var(--bg) !important;
+  color: var(--text) !important;
+}}
+.panel {{
+  background: var(--panel_bg) !important;
+}}
+.toolcard {{
+  background: var(--card_bg) !important;
+}}
+{_STATIC_RULES}"""
+
+
+def _write_build_file(fname: str, data: bytes) -> None:
+    try:
+        BUILD_DIR.mkdir(parents=True, exist_ok=True)
+        target = BUILD_DIR / fname
+        if not target.exists():
+            tmp = target.with_name(fname + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+    except OSError:
+        pass
+
+
+def theme_files() -> Dict[str, str]:
+    """{theme key: bestandsnaam} voor de huidige theme.json (compileert enkel bij een nieuwe versie)."""
+    global _build, _files, _prev_files
+    ver = config_version(THEME_JSON)
+    if _build[0] == ver:
+        return _build[1]
+    with _lock:
+        if _build[0] == ver:
+            return _build[1]
+        cfg = read_json(THEME_JSON)
+        themes = cfg.get("themes", {}) if isinstance(cfg, dict) else {}
+        if not isinstance(themes, dict) or not themes:
+            themes = {"Dark": {}}
+
+        names: Dict[str, str] = {}
+        files: Dict[str, bytes] = {}
+        for key, theme in themes.items():
+            data = compile_theme_css(theme if isinstance(theme, dict) else {}).encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            fname = f"{_slug(str(key))}.{digest}.css"
+            if fname not in _files:
+                _write_build_file(fname, data)
+            files[fname] = data
+            names[str(key)] = fname
+        # per versie opnieuw opgebouwd: vorige versie blijft, oudere vallen weg
+        if _build[0] != -1:
+            _prev_files = _files
+        _files = files
+        _build = (ver, names)
+        return names
+
+
+def theme_css_href(theme_key: str) -> str:
+    files = theme_files()
+    fname = files.get(theme_key) or next(iter(files.values()))
+    return URL_PREFIX + fname
+
+
+def _load_file(fname: str) -> Optional[bytes]:
+    data = _files.get(fname) or _prev_files.get(fname)
+    if data is None:
+        # oudere versie, andere worker of vorige run: van disk, niet in geheugen houden
+        p = BUILD_DIR / fname
+        if p.is_file() and p.parent == BUILD_DIR:
+            data = p.read_bytes()
+    return data
+
+
+def register_theme_assets(app: Flask) -> None:
+    @app.get(URL_PREFIX + "<fname>")
+    def theme_css(fname: str):
+        if not re.fullmatch(r"[A-Za-z0-9_-]+\.[0-9a-f]{12}\.css", fname):
+            abort(404)
+        theme_files()  # zorgt dat de huidige versies bestaan
+        data = _load_file(fname)
+        if data is None:
+            abort(404)
+        etag = fname.rsplit(".", 2)[1]
+        # weak vergelijking (RFC 7232): na compressie is de ETag W/"..."
+        if request.if_none_match.contains_weak(etag):
+            resp = Response(status=304)
+        else:
+            resp = Response(data, mimetype="text/css")
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = IMMUTABLE
+        return resp
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_cold_start.py — cold start (create_app + beheer + tools) eager vs lazy
+
+Elke meting draait in een vers subprocess (geen warme sys.modules):
+- startup_ms: interpreter-start tot app klaar (ready to serve)
+- rss_mb:     peak RSS na startup
+- first_hit:  eerste GET op een tool (lazy: inclusief import + register)
+
+Run: python benchmarks/bench_cold_start.py [--runs 5] [--path /cert]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+_CHILD = r"""
+import json, logging, os, sys, time
+t_start = time.perf_counter()
+sys.path.insert(0, os.environ["CYNIT_BASE"])
+import master
+
+log = logging.getLogger("bench"); log.disabled = True
+app = master.create_app(log, log, log, log)
+master.register_beheer(app, log)
+master.register_tools(app, log, lazy=os.environ["CYNIT_LAZY_TOOLS"] == "1")
+startup_ms = (time.perf_counter() - t_start) * 1000
+
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+rss_start = rss_mb()
+c = app.test_client()
+t0 = time.perf_counter()
+status = c.get(os.environ["CYNIT_BENCH_PATH"]).status_code
+first_hit_ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({"startup_ms": startup_ms, "rss_mb": rss_start, "first_hit_ms": first_hit_ms,
+                  "status": status, "rss_after_hit_mb": rss_mb()}))
+"""
+
+
+def _run(lazy: bool, path: str) -> dict:
+    env = dict(os.environ)
+    env.update({"CYNIT_BASE": str(BASE_DIR), "CYNIT_LAZY_TOOLS": "1" if lazy else "0", "CYNIT_BENCH_PATH": path})
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=str(BASE_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--path", default="/cert")
+    args = ap.parse_args()
+
+    print(f"cold start, {args.runs} runs per mode (median), first hit = GET {args.path}")
+    for lazy in (False, True):
+        runs = [_run(lazy, args.path) for _ in range(args.runs)]
+        med = {k: statistics.median(r[k] for r in runs) for k in ("startup_ms", "rss_mb", "first_hit_ms", "rss_after_hit_mb")}
+        print(
+            f"  {'lazy ' if lazy else 'eager'}: startup {med['startup_ms']:7.1f} ms | "
+            f"RSS {med['rss_mb']:6.1f} MB | first hit {med['first_hit_ms']:7.1f} ms | "
+            f"RSS after hit {med['rss_after_hit_mb']:6.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_e2e.py — end-to-end: kernroutes via test client én via echte waitress server
+
+- app-opbouw zoals master (create_app + register_beheer + register_tools) met synthetische
+  fixtures uit e2e_fixtures.py: 100 tools, 5k links, diepe map-boom (niets in config/ gewijzigd)
+- routes: GET /, GET /links, POST /cert (PEM decode), POST /tree (preview),
+  POST /voica1/generate (python engine), POST /i18n/publish
+- "client": Flask test client, sequentieel, per route een vaste duur (in een apart proces)
+- "waitress": server in een apart proces, N gelijktijdige keep-alive clients per route
+- rapport: req/s, p50/p95/p99 (ms), fouten per route + RSS van het proces dat de app draait
+- baseline: --save-baseline schrijft benchmarks/baseline_e2e.json; anders wordt ertegen
+  vergeleken (diff-tabel, regressie = rps -tol% of p95/p99 +tol%); --fail-on-regression -> exit 1
+  Wijken fixture (tools/links/tree entries) of --seconds/--clients/--threads af van de baseline:
+  waarschuwing en geen regressie-oordeel; met --fail-on-regression weigert de vergelijking (exit 2).
+  De baseline is machine-afhankelijk: na een hardware-wissel opnieuw opslaan.
+
+Run: python benchmarks/bench_e2e.py [--seconds 3] [--clients 8] [--modes client,waitress]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "benchmarks"))
+
+import e2e_fixtures  # noqa: E402
+
+BASELINE = BASE_DIR / "benchmarks" / "baseline_e2e.json"
+
+# (naam, methode, pad, body, content-type)
+Request = Tuple[str, str, str, bytes, str]
+
+
+def routes(fx: e2e_fixtures.Fixture) -> List[Request]:
+    form = "application/x-www-form-urlencoded"
+    pem = Path(fx.cert_pem).read_text(encoding="utf-8") if fx.cert_pem else ""
+    publish = {
+        "template": "page.html",
+        "filename": "bench.html",
+        "body": "# Bench\n\nEen **korte** pagina.\n\n## Tabel\n\n| a | b |\n|---|---|\n| 1 | 2 |\n",
+        "meta_yaml": "title: Bench\nlang: nl\n",
+    }
+    out: List[Request] = [
+        ("home", "GET", "/", b"", ""),
+        ("links", "GET", "/links", b"", ""),
+    ]
+    if pem:
+        out.append(("cert_decode", "POST", "/cert", urlencode({"pasted": pem}).encode(), form))
+    out += [
+        ("tree_preview", "POST", "/tree", urlencode({
+            "server_path": str(fx.dir / "tree"), "style": "unicode", "show_files": "1", "action": "preview",
+        }).encode(), form),
+        ("voica1_generate", "POST", "/voica1/generate", urlencode({
+            "base_dir": fx.voica_dir, "devices": "BENCH0001", "engine": "python",
+            "key_size": "2048", "device_type": "pc",
+        }).encode(), form),
+        ("i18n_publish", "POST", "/i18n/publish", json.dumps(publish).encode(), "application/json"),
+    ]
+    return out
+
+
+def rss_mb() -> float:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1e6
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize(lat: List[float], elapsed: float, errors: int) -> Dict[str, float]:
+    xs = sorted(lat)
+    if not xs:
+        return {"n": 0, "rps": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "errors": errors}
+
+    def pct(p: float) -> float:
+        return round(xs[min(len(xs) - 1, int(len(xs) * p))], 2)
+
+    return {
+        "n": len(xs),
+        "rps": round(len(xs) / elapsed, 1) if elapsed else 0.0,
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "errors": errors,
+    }
+
+
+# =========================
+# Kindprocessen (app draait altijd in een vers proces -> eerlijke RSS)
+# =========================
+_CLIENT_CHILD = r"""
+import json, os, sys, time
+sys.path.insert(0, os.path.join(os.environ["CYNIT_BASE"], "benchmarks"))
+import bench_e2e as b, e2e_fixtures as f
+
+fx = f.Fixture.from_json(os.environ["CYNIT_BENCH_FIXTURE"])
+opts = json.loads(os.environ["CYNIT_BENCH_OPTS"])
+app = f.build_app(fx)
+c = app.test_client()
+out = {}
+for name, method, path, body, ctype in b.routes(fx):
+    def once():
+        r = c.open(path, method=method, data=body or None, content_type=ctype or None,
+                   headers={"Accept-Encoding": "gzip"})
+        r.get_data()
+        return r.status_code == 200
+    for _ in range(opts["warmup"]):
+        once()
+    lat, errors = [], 0
+    t_start = time.perf_counter()
+    stop = t_start + opts["seconds"]
+    while time.perf_counter() < stop:
+        t0 = time.perf_counter()
+        ok = once()
+        lat.append((time.perf_counter() - t0) * 1000)
+        errors += 0 if ok else 1
+    out[name] = b.summarize(lat, time.perf_counter() - t_start, errors)
+print(json.dumps({"routes": out, "rss_mb": round(b.rss_mb(), 1)}))
+"""
+
+_SERVER_CHILD = r"""
+import json, logging, os, sys
+sys.path.insert(0, os.path.join(os.environ["CYNIT_BASE"], "benchmarks"))
+import bench_e2e as b, e2e_fixtures as f
+from runtime.serving import ServerConfig, serve
+
+fx = f.Fixture.from_json(os.environ["CYNIT_BENCH_FIXTURE"])
+app = f.build_app(fx)
+
+@app.get("/_bench/rss")
+def _bench_rss():
+    return {"rss_mb": round(b.rss_mb(), 1)}
+
+log = logging.getLogger("bench"); log.disabled = True
+serve(app, ServerConfig(**json.loads(os.environ["CYNIT_BENCH_SERVER"])), log)
+"""
+
+
+def _env(fx: e2e_fixtures.Fixture, **extra: str) -> Dict[str, str]:
+    return dict(os.environ, CYNIT_BASE=str(BASE_DIR), CYNIT_BENCH_FIXTURE=fx.to_json(), **extra)
+
+
+def run_client(fx: e2e_fixtures.Fixture, seconds: float, warmup: int) -> Dict[str, Any]:
+    opts = json.dumps({"seconds": seconds, "warmup": warmup})
+    proc = subprocess.run(
+        [sys.executable, "-c", _CLIENT_CHILD], cwd=str(BASE_DIR), env=_env(fx, CYNIT_BENCH_OPTS=opts),
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"client-run faalde:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_up(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            c = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            c.request("GET", "/_health")
+            if c.getresponse().status == 200:
+                c.close()
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server kwam niet op")
+
+
+def _load(port: int, req: Request, clients: int, seconds: float) -> Dict[str, float]:
+    _, method, path, body, ctype = req
+    headers = {"Accept-Encoding": "gzip"}
+    if ctype:
+        headers["Content-Type"] = ctype
+    lat: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def worker(i: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=body or None, headers=headers)
+                r = conn.getresponse()
+                r.read()
+                if r.status != 200:
+                    errors[i] += 1
+                if r.getheader("Connection", "").lower() == "close":
+                    conn.close()
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            except (OSError, http.client.HTTPException):
+                errors[i] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            lat[i].append((time.perf_counter() - t0) * 1000)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    t_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize([x for per in lat for x in per], time.perf_counter() - t_start, sum(errors))
+
+
+def run_waitress(fx: e2e_fixtures.Fixture, seconds: float, clients: int, threads: int) -> Dict[str, Any]:
+    port = _free_port()
+    server = {"mode": "waitress", "host": "127.0.0.1", "port": port, "threads": threads, "warmup_paths": []}
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _SERVER_CHILD], cwd=str(BASE_DIR),
+        env=_env(fx, CYNIT_BENCH_SERVER=json.dumps(server)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_up(port)
+        out = {}
+        for req in routes(fx):
+            _load(port, req, clients, min(0.5, seconds))  # warmup
+            out[req[0]] = _load(port, req, clients, seconds)
+        c = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        c.request("GET", "/_bench/rss")
+        rss = json.loads(c.getresponse().read()).get("rss_mb")
+        c.close()
+        return {"routes": out, "rss_mb": rss}
+    finally:
+        proc.terminate()
+        proc.wait(10)
+
+
+# =========================
+# Rapport + baseline
+# =========================
+def print_report(results: Dict[str, Any]) -> None:
+    for mode, res in results["modes"].items():
+        print(f"[{mode}]  RSS {res['rss_mb']} MB")
+        print(f"  {'route':16s} {'req/s':>9s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'n':>7s} {'err':>5s}")
+        for name, r in res["routes"].items():
+            print(
+                f"  {name:16s} {r['rps']:9.1f} {r['p50']:8.2f} {r['p95']:8.2f} {r['p99']:8.2f} "
+                f"{r['n']:7d} {r['errors']:5d}"
+            )
+
+
+def _pct(new: float, old: float) -> Optional[float]:
+    return (new - old) / old * 100 if old else None
+
+
+_COMPARABLE_META = ("fixture", "seconds", "clients", "threads")
+
+
+def meta_mismatch(meta: Dict[str, Any], base_meta: Dict[str, Any]) -> List[str]:
+    """Run-parameters die verschillen van de baseline (dan zeggen de percentages niets)."""
+    return [
+        f"{key} {base_meta.get(key)!r} -> {meta.get(key)!r}"
+        for key in _COMPARABLE_META
+        if meta.get(key) != base_meta.get(key)
+    ]
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, judge: bool = True) -> List[str]:
+    """Diff-tabel naar stdout; geeft de lijst regressies terug (leeg als judge=False)."""
+    regressions: List[str] = []
+    print(f"\nvs baseline ({baseline.get('meta', {}).get('created', '?')}, tolerantie {tolerance:.0f}%)")
+    print(f"  {'mode/route':28s} {'req/s':>16s} {'p95 ms':>16s} {'p99 ms':>16s}")
+    for mode, res in results["modes"].items():
+        base_mode = (baseline.get("modes") or {}).get(mode)
+        if not base_mode:
+            print(f"  {mode}: geen baseline")
+            continue
+        for name, r in res["routes"].items():
+            b = (base_mode.get("routes") or {}).get(name)
+            if not b:
+                print(f"  {mode + '/' + name:28s} (nieuw)")
+                continue
+            cells, bad = [], []
+            for key, worse_if_up in (("rps", False), ("p95", True), ("p99", True)):
+                d = _pct(r[key], b[key])
+                if d is None:
+                    cells.append(f"{'-':>16s}")
+                    continue
+                regress = judge and ((d > tolerance) if worse_if_up else (d < -tolerance))
+                cells.append(f"{d:+7.1f}%{' !!' if regress else '   '}".rjust(16))
+                if regress:
+                    bad.append(f"{key} {d:+.1f}%")
+            print(f"  {mode + '/' + name:28s} " + " ".join(cells))
+            if bad:
+                regressions.append(f"{mode}/{name}: " + ", ".join(bad))
+        d = _pct(res["rss_mb"] or 0, base_mode.get("rss_mb") or 0)
+        if d is not None:
+            flag = judge and d > tolerance
+            print(f"  {mode + '/RSS':28s} {res['rss_mb']} MB ({d:+.1f}%){' !!' if flag else ''}")
+            if flag:
+                regressions.append(f"{mode}/rss: {d:+.1f}%")
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modes", default="client,waitress")
+    ap.add_argument("--seconds", type=float, default=3.0, help="meetduur per route")
+    ap.add_argument("--clients", type=int, default=8, help="gelijktijdige clients (waitress)")
+    ap.add_argument("--threads", type=int, default=8, help="waitress worker threads")
+    ap.add_argument("--warmup", type=int, default=3, help="warmup requests per route (client)")
+    ap.add_argument("--tools", type=int, default=100)
+    ap.add_argument("--links", type=int, default=5000)
+    ap.add_argument("--tree-depth", type=int, default=6)
+    ap.add_argument("--baseline", default=str(BASELINE))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=15.0, help="toegelaten afwijking in %%")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--json", help="resultaten ook naar dit bestand schrijven")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cynit-e2e-") as tmp:
+        t0 = time.perf_counter()
+        fx = e2e_fixtures.build_fixture(Path(tmp) / "fx", tools=args.tools, links=args.links, tree_depth=args.tree_depth)
+        print(
+            f"fixtures: {fx.tools} tools, {fx.links} links, {fx.tree_entries} tree entries "
+            f"({(time.perf_counter() - t0) * 1000:.0f} ms)"
+        )
+        results: Dict[str, Any] = {
+            "meta": {
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "seconds": args.seconds,
+                "clients": args.clients,
+                "threads": args.threads,
+                "fixture": {"tools": fx.tools, "links": fx.links, "tree_entries": fx.tree_entries},
+            },
+            "modes": {},
+        }
+        for mode in [m for m in args.modes.split(",") if m]:
+            if mode == "client":
+                results["modes"][mode] = run_client(fx, args.seconds, args.warmup)
+            elif mode == "waitress":
+                results["modes"][mode] = run_waitress(fx, args.seconds, args.clients, args.threads)
+            else:
+                raise SystemExit(f"onbekende mode: {mode}")
+
+    print_report(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=1), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=1) + "\n", encoding="utf-8")
+        print(f"\nbaseline opgeslagen: {baseline_path}")
+        return
+    if not baseline_path.is_file():
+        print("\n(geen baseline; --save-baseline om er een te maken)")
+        return
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    mismatch = meta_mismatch(results["meta"], baseline.get("meta") or {})
+    if mismatch:
+        print("\nLET OP: andere parameters dan de baseline:\n  " + "\n  ".join(mismatch))
+        if args.fail_on_regression:
+            print("vergelijking geweigerd (--fail-on-regression): zelfde parameters gebruiken of --save-baseline")
+            sys.exit(2)
+    regressions = compare(results, baseline, args.tolerance, judge=not mismatch)
+    if mismatch:
+        print("\n(geen regressie-oordeel: run is niet vergelijkbaar met de baseline)")
+    elif regressions:
+        print("\nregressies:\n  " + "\n  ".join(regressions))
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("\ngeen regressies")
+
+
+if __name__ == "__main__":
+    main()
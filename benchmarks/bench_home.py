@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_home.py — home-pagina throughput via de Flask test client
+
+- "before": home snapshot + layout cache leeg per request (= cards + shell opnieuw bouwen)
+- "after":  snapshot uit cache (identity en gzip)
+- config = echte config/ (tools.json, hub_settings.json, theme.json)
+
+Run: python benchmarks/bench_home.py [--n 3000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import master  # noqa: E402
+from beheer import main_layout  # noqa: E402
+
+
+def _rps(client, n: int, headers: dict, before_each=None) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        if before_each is not None:
+            before_each()
+        r = client.get("/", headers=headers)
+        assert r.status_code == 200
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=3000)
+    args = ap.parse_args()
+
+    log = logging.getLogger("bench")
+    log.disabled = True
+    app = master.create_app(log, log, log, log)
+    client = app.test_client()
+
+    def cold() -> None:
+        master.clear_home_cache()
+        main_layout.clear_layout_cache()
+
+    plain = {}
+    gz = {"Accept-Encoding": "gzip, deflate"}
+
+    _rps(client, 100, plain)  # warmup
+
+    before = _rps(client, args.n, plain, before_each=cold)
+    after = _rps(client, args.n, plain)
+    after_gz = _rps(client, args.n, gz)
+
+    size = len(client.get("/").data)
+    size_gz = len(client.get("/", headers=gz).data)
+
+    print(f"GET / via test client (n={args.n})")
+    print(f"  before (rebuild per request): {before:8.0f} req/s")
+    print(f"  after  (snapshot, identity):  {after:8.0f} req/s  {size:6d} bytes")
+    print(f"  after  (snapshot, gzip):      {after_gz:8.0f} req/s  {size_gz:6d} bytes")
+
+
+if __name__ == "__main__":
+    main()
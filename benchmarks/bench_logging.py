@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_logging.py — kost van één log-call op de request thread
+
+- "floor": logger met NullHandler (= enkel LogRecord aanmaken)
+- hub pipeline: setup_logging() in een tmp map (enqueue; schrijven gebeurt op de writer thread)
+- per logger: hub DEBUG, tool DEBUG (tools.<id>), requests INFO
+
+Run: python benchmarks/bench_logging.py [--n 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from runtime.hub_logging import setup_logging  # noqa: E402
+
+
+def _percentiles(logger: logging.Logger, level: int, n: int) -> tuple:
+    xs = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        logger.log(level, "bench %d %s", i, "x")
+        xs.append((time.perf_counter() - t0) * 1e6)
+    xs.sort()
+    return xs[len(xs) // 2], xs[int(len(xs) * 0.99)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=5000)
+    args = ap.parse_args()
+
+    floor = logging.getLogger("bench.floor")
+    floor.setLevel(logging.DEBUG)
+    floor.addHandler(logging.NullHandler())
+    floor.propagate = False
+
+    tmp = Path(tempfile.mkdtemp(prefix="cynit_bench_"))
+    try:
+        logs = setup_logging(tmp, ["voica1", "cert_viewer"])
+        cases = [
+            ("floor (NullHandler)", floor, logging.DEBUG),
+            ("hub DEBUG", logs.hub, logging.DEBUG),
+            ("tools.voica1 DEBUG", logging.getLogger("tools.voica1"), logging.DEBUG),
+            ("hub.requests INFO", logs.requests, logging.INFO),
+        ]
+        print(f"log call latency on caller thread (n={args.n})")
+        for name, lg, lvl in cases:
+            p50, p99 = _percentiles(lg, lvl, args.n)
+            print(f"  {name:22s} p50 {p50:6.1f} us   p99 {p99:6.1f} us")
+            time.sleep(0.2)  # writer laten inhalen
+
+        logging.shutdown()
+        if logs.writer is not None:
+            print(f"  writer: {logs.writer.stats()}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
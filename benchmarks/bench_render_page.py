@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_render_page.py — render_page kost: volledige shell-opbouw vs gecachte shell
+
+- synthetische tools.json met 50 tools (tmp map), hub_settings/theme uit config/
+- "before": shell-cache leeg per call (= oude gedrag: alles opnieuw formatteren)
+- "after":  shell uit cache, enkel title/back/content invullen
+
+Run: python benchmarks/bench_render_page.py [--tools 50] [--n 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from flask import Flask  # noqa: E402
+
+from beheer import main_layout  # noqa: E402
+
+
+def _synthetic_tools(n: int) -> dict:
+    return {
+        "tools": [
+            {
+                "id": f"tool{i:03d}",
+                "name": f"Tool {i:03d}",
+                "script": f"tool{i:03d}.py",
+                "web_path": f"/tool{i:03d}",
+                "icon_web": "🧩",
+                "description": f"Synthetische tool nummer {i} voor de render_page benchmark.",
+                "accent": "#35e6df",
+                "enabled": True,
+                "hidden": False,
+            }
+            for i in range(n)
+        ]
+    }
+
+
+def _time_per_call(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tools", type=int, default=50)
+    ap.add_argument("--n", type=int, default=2000)
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="cynit_bench_"))
+    try:
+        (tmp / "tools.json").write_text(json.dumps(_synthetic_tools(args.tools)), encoding="utf-8")
+        for name in ("hub_settings.json", "theme.json"):
+            src = BASE_DIR / "config" / name
+            if src.exists():
+                shutil.copy(src, tmp / name)
+
+        main_layout.TOOLS_JSON = tmp / "tools.json"
+        main_layout.HUB_SETTINGS_JSON = tmp / "hub_settings.json"
+        main_layout.THEME_JSON = tmp / "theme.json"
+
+        app = Flask("bench", static_folder=str(BASE_DIR / "static"), static_url_path="/static")
+        content = "<div class='panel'>" + ("x" * 4000) + "</div>"
+
+        with app.test_request_context("/links?cat=__ALL__"):
+            def cold() -> str:
+                main_layout.clear_layout_cache()
+                return main_layout.render_page(title="Bench", content_html=content)
+
+            def warm() -> str:
+                return main_layout.render_page(title="Bench", content_html=content)
+
+            assert cold() == warm(), "cached shell wijkt af van volledige opbouw"
+
+            # warmup
+            _time_per_call(cold, 50)
+            _time_per_call(warm, 50)
+
+            before = _time_per_call(cold, args.n)
+            after = _time_per_call(warm, args.n)
+
+        print(f"render_page ({args.tools} tools, n={args.n})")
+        print(f"  before (full shell build): {before:8.1f} us/call")
+        print(f"  after  (cached shell):     {after:8.1f} us/call")
+        print(f"  speedup:                   {before / after:8.1f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_serving.py — Werkzeug dev server vs waitress onder gelijktijdige load
+
+- server in een apart proces (zelfde app-opbouw als master: create_app + beheer + tools, HTTP)
+- load: N client threads met keep-alive connecties, per pad een vaste duur
+- paden: /, /links, /cert (aanpasbaar met --paths)
+
+Run: python benchmarks/bench_serving.py [--clients 16] [--seconds 5] [--threads 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+_CHILD = r"""
+import json, logging, os, sys
+sys.path.insert(0, os.environ["CYNIT_BASE"])
+import master
+from runtime.serving import ServerConfig, serve
+
+cfg = ServerConfig(**json.loads(os.environ["CYNIT_BENCH_SERVER"]))
+log = logging.getLogger("bench"); log.disabled = True
+logging.getLogger("werkzeug").disabled = True
+app = master.create_app(log, log, log, log)
+master.register_beheer(app, log)
+master.register_tools(app, log, lazy=False)
+serve(app, cfg, log)
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_up(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            c = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            c.request("GET", "/_health")
+            if c.getresponse().status == 200:
+                c.close()
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server kwam niet op")
+
+
+def _load(port: int, path: str, clients: int, seconds: float) -> Dict[str, float]:
+    lat: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def worker(i: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+                r = conn.getresponse()
+                r.read()
+                if r.status != 200:
+                    errors[i] += 1
+                if r.getheader("Connection", "").lower() == "close":
+                    conn.close()
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            except (OSError, http.client.HTTPException):
+                errors[i] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            lat[i].append((time.perf_counter() - t0) * 1000)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    t_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t_start
+
+    xs = sorted(x for per in lat for x in per)
+    if not xs:
+        return {"rps": 0.0, "p50": 0.0, "p99": 0.0, "errors": float(sum(errors))}
+    return {
+        "rps": len(xs) / elapsed,
+        "p50": xs[len(xs) // 2],
+        "p99": xs[min(len(xs) - 1, int(len(xs) * 0.99))],
+        "errors": float(sum(errors)),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=16)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--threads", type=int, default=8, help="waitress worker threads")
+    ap.add_argument("--paths", default="/,/links,/cert")
+    args = ap.parse_args()
+    paths = [p for p in args.paths.split(",") if p]
+
+    print(f"load: {args.clients} clients x {args.seconds:.0f}s per path (keep-alive)")
+    for mode in ("dev", "waitress"):
+        port = _free_port()
+        server = {"mode": mode, "host": "127.0.0.1", "port": port, "threads": args.threads, "warmup_paths": []}
+        env = dict(os.environ, CYNIT_BASE=str(BASE_DIR), CYNIT_BENCH_SERVER=json.dumps(server))
+        proc = subprocess.Popen(
+            [sys.executable, "-c", _CHILD], cwd=str(BASE_DIR), env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_up(port)
+            for p in paths:
+                _load(port, p, args.clients, 0.5)  # warmup
+                r = _load(port, p, args.clients, args.seconds)
+                print(
+                    f"  {mode:8s} GET {p:8s} {r['rps']:8.0f} req/s   p50 {r['p50']:6.1f} ms   "
+                    f"p99 {r['p99']:6.1f} ms   errors {int(r['errors'])}"
+                )
+        finally:
+            proc.terminate()
+            proc.wait(10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_templates.py — render-tijd per request: render_template_string vs template registry
+
+- "before": CYNIT_TEMPLATE_REGISTRY=0 (elke request compileert de inline template opnieuw)
+- "after":  registry aan (1x compileren, daarna Jinja's template-cache)
+- per modus een apart proces (zelfde app-opbouw als master), test client, geen netwerk
+- meet de volledige request (route + render + hub layout) en apart de compile van elke template
+
+Run: python benchmarks/bench_templates.py [--n 200] [--paths /links,/voica1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+_CHILD = r"""
+import json, logging, os, sys, time
+sys.path.insert(0, os.environ["CYNIT_BASE"])
+import master
+from runtime.templates import get_registry
+
+log = logging.getLogger("bench"); log.disabled = True
+app = master.create_app(log, log, log, log)
+app.jinja_env.bytecode_cache = None  # koude compile meten, niet de disk-cache
+master.register_beheer(app, log)
+master.register_tools(app, log, lazy=False)
+client = app.test_client()
+
+out = {"paths": {}, "compile_ms": {}}
+n = int(os.environ["CYNIT_BENCH_N"])
+for path in os.environ["CYNIT_BENCH_PATHS"].split(","):
+    client.get(path)  # warmup (imports, config snapshots, eerste compile)
+    xs = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = client.get(path)
+        xs.append((time.perf_counter() - t0) * 1000)
+        assert r.status_code == 200, (path, r.status_code)
+    xs.sort()
+    out["paths"][path] = {"p50": xs[len(xs) // 2], "p99": xs[min(len(xs) - 1, int(len(xs) * 0.99))]}
+
+reg = get_registry(app)
+if reg is not None:
+    for name in reg.list_templates():
+        src = reg.source(name)
+        t0 = time.perf_counter()
+        app.jinja_env.from_string(src)
+        out["compile_ms"][name] = (time.perf_counter() - t0) * 1000
+print(json.dumps(out))
+"""
+
+
+def _run(mode: str, paths: str, n: int) -> dict:
+    env = dict(
+        os.environ,
+        CYNIT_BASE=str(BASE_DIR),
+        CYNIT_BENCH_N=str(n),
+        CYNIT_BENCH_PATHS=paths,
+        CYNIT_TEMPLATE_REGISTRY="0" if mode == "before" else "1",
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=str(BASE_DIR), env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200)
+    ap.add_argument("--paths", default="/links,/voica1")
+    args = ap.parse_args()
+
+    res = {mode: _run(mode, args.paths, args.n) for mode in ("before", "after")}
+
+    print(f"per-request latency (test client, n={args.n})")
+    for path in args.paths.split(","):
+        b = res["before"]["paths"][path]
+        a = res["after"]["paths"][path]
+        print(
+            f"  GET {path:10s} before p50 {b['p50']:6.2f} ms  p99 {b['p99']:6.2f} ms   "
+            f"after p50 {a['p50']:6.2f} ms  p99 {a['p99']:6.2f} ms   ({b['p50'] / max(a['p50'], 1e-9):.1f}x)"
+        )
+    print("compile cost per template (= wat 'before' elke request betaalt)")
+    for name, ms in sorted(res["after"]["compile_ms"].items(), key=lambda kv: -kv[1]):
+        print(f"  {name:32s} {ms:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/bench_vendor_bundles.py — requests + bytes voor /i18n: losse vendor bestanden vs bundels
+
+- "before": wat de browser vroeger deed
+    tiptap/codemirror: elke unieke CDN-specifier = eigen request via de shims (zelfde bestand
+    via 3 versie-ranges = 3x ophalen en 3 module-instanties), entry modules met ?v=
+    tinymce: tinymce.min.js, theme, model, icons, elke plugin en de skin .css bestanden apart
+- "after": import map + modulepreload (elk bestand 1x, gehashte URL) en de TinyMCE bundels
+- bytes = wat over de lijn gaat (test client, Accept-Encoding: gzip) + ongecomprimeerd
+- bouwt eerst de bundels en de gz-varianten (tools/build_vendor_bundles.py) zodat "after" klopt
+
+Run: python benchmarks/bench_vendor_bundles.py [--mode markdown,html,css]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "tools"))
+
+import build_vendor_bundles as bvb  # noqa: E402
+import master  # noqa: E402
+from flask import url_for  # noqa: E402
+from runtime.import_map import scan_imports  # noqa: E402
+
+
+def _app():
+    log = logging.getLogger("bench")
+    log.disabled = True
+    app = master.create_app(log, log, log, log)
+    master.register_beheer(app, log)
+    import tools.i18n_builder as ib
+    ib.register_tool(app)
+    return app, ib
+
+
+def _fetch(client, urls: List[str]) -> Tuple[int, int, int]:
+    """(requests, bytes over de lijn, bytes ongecomprimeerd)"""
+    import gzip
+
+    wire = raw = 0
+    for u in urls:
+        r = client.get(u, headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200, (u, r.status_code)
+        body = r.get_data()
+        wire += len(body)
+        if r.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        raw += len(body)
+    return len(urls), wire, raw
+
+
+def _shim_waterfall(ib, entries: List[str], version: str) -> List[str]:
+    """Vroeger: ES modules via CDN-specifiers; elke unieke URL is een aparte fetch."""
+    urls = [f"/static/{e}?v={version}" for e in entries]
+    seen = set(urls)
+    todo = [(u, e) for u, e in zip(urls, entries)]
+    while todo:
+        _, rel = todo.pop()
+        for spec in scan_imports(Path(ib.STATIC_DIR) / rel):
+            target = ib.vendor_module_for(spec)
+            if target is None or spec in seen:
+                continue
+            seen.add(spec)
+            urls.append(spec)
+            todo.append((spec, target))
+    return urls
+
+
+def _page_assets(html: str) -> List[str]:
+    found = re.findall(r'(?:href|src)="(/static/[^"]+)"', html)
+    return [u for u in dict.fromkeys(found) if "/vendor/" not in u]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mode", default="markdown,html,css", help="i18n modes (editor per mode uit i18n_modes.json)")
+    args = ap.parse_args()
+
+    cfg = bvb.load_json(bvb.DEFAULT_CFG)
+    modes = bvb.load_json(bvb.DEFAULT_MODES)
+    bvb.build_bundles(cfg, modes)
+    bvb.precompress()
+
+    app, ib = _app()
+    client = app.test_client()
+    page = client.get("/i18n/", headers={"Accept-Encoding": "gzip"})
+    html = client.get("/i18n/").get_data(as_text=True)
+    assets = _page_assets(html)
+    version = str(cfg.get("version") or "1")
+    editors = (cfg.get("ui") or {}).get("editors") or {}
+    bundles = json.loads(re.search(r'id="i18n-vendor-bundles">(.*?)</script>', html).group(1))
+    preload = re.findall(r'<link rel="modulepreload" href="([^"]+)">', html)
+    entries_all, _ = ib._editor_entries(cfg)
+    graph = ib._module_graph()
+
+    print(f"/i18n/ pagina: {len(page.get_data())} B gz; page assets (css/js): {len(assets)}")
+    print(f"{'mode':10s} {'editor':10s} {'':6s} {'requests':>8s} {'wire KiB':>9s} {'raw KiB':>9s}")
+    for mode in args.mode.split(","):
+        mdef = (modes.get("modes") or {}).get(mode) or {}
+        editor = mdef.get("wysiwyg")
+        if editor == "tinymce":
+            base = bvb.static_rel(editors.get("tinymce", {}).get("path") or "static/vendor/tinymce")
+            plan = bvb.plan_bundles(cfg, modes)
+            ui_skin, content_css = bvb.TINYMCE_SKINS["dark"]
+            before = [f"/static/{p}" for p in plan["tinymce.bundle.js"]] + [
+                f"/static/{base}/skins/ui/{ui_skin}/skin.min.css",
+                f"/static/{base}/skins/ui/{ui_skin}/content.min.css",
+                f"/static/{base}/skins/content/{content_css}/content.min.css",
+            ]
+            after = [bundles["tinymce"], bundles["tinymce_skins"]["dark"]]
+        else:
+            prefix = bvb.static_rel((editors.get(editor) or {}).get("path") or "") + "/"
+            if editor == "tiptap":
+                entries = [e for e in entries_all if e.startswith(prefix)]
+            else:
+                entries = [f"{prefix}view/index.js", f"{prefix}state/index.js", f"{prefix}lang-{mdef.get('syntax')}/index.js"]
+            before = _shim_waterfall(ib, entries, version)
+            with app.test_request_context():
+                after = [url_for("static", filename=r) for r in graph.closure(entries)]
+            if editor == "tiptap":
+                assert sorted(after) == sorted(preload), "modulepreload != module-sluiting"
+        for label, urls in (("before", before), ("after", after)):
+            n, wire, raw = _fetch(client, urls)
+            print(f"{mode:10s} {editor:10s} {label:6s} {n:8d} {wire / 1024:9.1f} {raw / 1024:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
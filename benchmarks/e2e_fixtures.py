@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/e2e_fixtures.py — synthetische config + data voor bench_e2e.py
+
+- tools.json: de echte tools (allemaal enabled, zodat elke route bestaat) + synthetische
+  kaarten (zonder script) tot --tools stuks -> home met 100 toolcards
+- useful_links.json met N links over 25 categorieën
+- diepe map-boom voor /tree (fanout x diepte, met bestanden per map)
+- self-signed certificaat (PEM) voor /cert, werkmap voor /voica1, publish-map voor /i18n
+- apply(fx): module-constanten omzetten (master, main_layout, useful_links, i18n_builder)
+  vóór build_app(); niets in config/ of userdata/ wordt aangeraakt
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+@dataclass
+class Fixture:
+    root: str
+    tools: int
+    links: int
+    tree_entries: int
+    cert_pem: str          # pad naar PEM (leeg als cryptography ontbreekt)
+    voica_dir: str
+    publish_dir: str
+
+    @property
+    def dir(self) -> Path:
+        return Path(self.root)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, s: str) -> "Fixture":
+        return cls(**json.loads(s))
+
+
+# =========================
+# Opbouw
+# =========================
+def _tools_json(n: int) -> Dict[str, Any]:
+    real = json.loads((BASE_DIR / "config" / "tools.json").read_text(encoding="utf-8"))
+    tools = [dict(t, enabled=True) for t in (real.get("tools") if isinstance(real, dict) else real) or []]
+    for i in range(max(0, n - len(tools))):
+        tools.append({
+            "id": f"bench{i:03d}",
+            "name": f"Bench tool {i:03d}",
+            "script": "",
+            "web_path": f"/bench{i:03d}",
+            "icon_web": "🧩",
+            "description": f"Synthetische tool {i} (end-to-end benchmark).",
+            "accent": "#35e6df",
+            "enabled": True,
+            "hidden": False,
+        })
+    return {"tools": tools}
+
+
+def _links_json(n: int) -> Dict[str, Any]:
+    cats = [f"Categorie {c:02d}" for c in range(25)]
+    return {
+        "version": 2,
+        "prefs": {
+            "default_category": cats[0],
+            "hide_default_category": False,
+            "view_mode": "compact",
+            "links_layout": "cards",
+        },
+        "categories": {c: {"color": "#35e6df"} for c in cats},
+        "links": [
+            {
+                "id": f"bench-{i:05d}",
+                "name": f"Link {i:05d}",
+                "url": f"https://example.org/bench/{i}",
+                "category": cats[i % len(cats)],
+                "info": "synthetisch" if i % 3 else "",
+                "order": i // len(cats),
+                "created": "2025-01-01T00:00:00",
+                "updated": "2025-01-01T00:00:00",
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def _build_tree(root: Path, depth: int, fanout: int, files_per_dir: int) -> int:
+    count = 0
+    level = [root]
+    for d in range(depth):
+        nxt = []
+        for parent in level:
+            for f in range(files_per_dir):
+                (parent / f"file_{d}_{f}.txt").write_bytes(b"")
+                count += 1
+            for k in range(fanout):
+                child = parent / f"dir_{d}_{k}"
+                child.mkdir()
+                nxt.append(child)
+                count += 1
+        level = nxt
+    return count
+
+
+def _self_signed_pem(path: Path) -> bool:
+    try:
+        import datetime as dt
+
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.x509.oid import NameOID
+    except Exception:
+        return False
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "bench.cynit.local")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + dt.timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("bench.cynit.local")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    return True
+
+
+def build_fixture(root: Path, *, tools: int = 100, links: int = 5000, tree_depth: int = 6,
+                  tree_fanout: int = 3, tree_files: int = 4) -> Fixture:
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    cfg = root / "config"
+    cfg.mkdir(parents=True)
+
+    (cfg / "tools.json").write_text(json.dumps(_tools_json(tools)), encoding="utf-8")
+    (cfg / "useful_links.json").write_text(json.dumps(_links_json(links)), encoding="utf-8")
+    hub = json.loads((BASE_DIR / "config" / "hub_settings.json").read_text(encoding="utf-8"))
+    hub["lazy_tools"] = False
+    (cfg / "hub_settings.json").write_text(json.dumps(hub), encoding="utf-8")
+    shutil.copy(BASE_DIR / "config" / "theme.json", cfg / "theme.json")
+
+    tree = root / "tree"
+    tree.mkdir()
+    entries = _build_tree(tree, tree_depth, tree_fanout, tree_files)
+
+    pem = root / "bench_cert.pem"
+    has_cert = _self_signed_pem(pem)
+
+    for d in ("voica1", "published"):
+        (root / d).mkdir()
+
+    return Fixture(
+        root=str(root),
+        tools=len(_tools_json(tools)["tools"]),
+        links=links,
+        tree_entries=entries,
+        cert_pem=str(pem) if has_cert else "",
+        voica_dir=str(root / "voica1"),
+        publish_dir=str(root / "published"),
+    )
+
+
+# =========================
+# Toepassen (vóór build_app / create_app)
+# =========================
+def apply(fx: Fixture) -> None:
+    import master
+    from beheer import main_layout
+    from runtime.route_index import RouteIndexCache
+
+    cfg = fx.dir / "config"
+    master.TOOLS_JSON = cfg / "tools.json"
+    master.HUB_SETTINGS_JSON = cfg / "hub_settings.json"
+    master.THEME_JSON = cfg / "theme.json"
+    master.ROUTE_INDEX = RouteIndexCache(master.TOOLS_JSON, master.HUB_PAGES)
+    main_layout.TOOLS_JSON = master.TOOLS_JSON
+    main_layout.HUB_SETTINGS_JSON = master.HUB_SETTINGS_JSON
+    main_layout.THEME_JSON = master.THEME_JSON
+
+    # tools die hun data-pad als module-constante hebben: vóór register_tools importeren + omzetten
+    import tools.useful_links as useful_links
+    useful_links.DATA_PATH = cfg / "useful_links.json"
+    useful_links.CONFIG_DIR = cfg  # backups bij import/export blijven in de fixture
+
+    import tools.i18n_builder as i18n_builder
+    i18n_builder.PUBLISH_DIR = fx.publish_dir
+
+
+def build_app(fx: Fixture, log: Optional[Any] = None):
+    """Zelfde opbouw als master.build_app (create_app + beheer + tools), met fixture-config."""
+    import logging
+
+    import master
+
+    apply(fx)
+    if log is None:
+        log = logging.getLogger("bench")
+        log.disabled = True
+        logging.getLogger("werkzeug").disabled = True
+    app = master.create_app(log, log, log, log)
+    master.register_beheer(app, log)
+    master.register_tools(app, log, lazy=False)
+    return app
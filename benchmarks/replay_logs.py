@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmarks/replay_logs.py — productieverkeer herspelen uit logs/requests.log + logs/clicks.log
+
+- leest requests.log en clicks.log incl. de geroteerde backups (requests.log.YYYY-MM-DD)
+  -> request script (JSONL, één request per regel met tijd-offset, methode, pad, tool, ip)
+- ook het oudere requests.log formaat zonder "tool=" (tool via de route index van tools.json);
+  regels die niet herkend worden tellen als "unparsed requests.log" in het rapport
+- GET/HEAD: 1-op-1 (de logs bevatten geen query string en geen body)
+- POST /_log/click(s): body wordt opgebouwd uit clicks.log (clicks per ip toegewezen aan de
+  eerstvolgende beacon) -> ook de click-load komt mee
+- andere POST/PUT/DELETE: enkel met een body uit --payloads ({"POST /cert": {"form": {...}}} of
+  {"json": {...}}); anders overgeslagen (en geteld) -> replay wijzigt geen links/certs per ongeluk
+- --exclude (default /_metrics,/_health,/beheer/system/live): pad-prefixen die niet herspeeld
+  worden; de SSE stream van het live paneel loopt minuten en zou een worker bezetten. Een
+  text/event-stream antwoord dat toch binnenkomt wordt niet uitgelezen (verbinding dicht)
+- replay tegen een lokale hub (--url, default runtime/hub_endpoint.json) of een zelf gestarte
+  server (--spawn waitress|dev, zelfde opbouw als master): 1x, Nx (--speed 10) of --speed max,
+  met --concurrency keep-alive clients
+- rapport per route (url rule van de app, bv. /static/<path:filename>) en per tool id:
+  n, fouten, p50/p95/p99 replay vs de ms uit de log; plus schedule lag (te weinig concurrency?)
+
+Run:
+  python benchmarks/replay_logs.py --days 7 --speed 10 --concurrency 16
+  python benchmarks/replay_logs.py --build-script week.jsonl --days 7      (enkel script maken)
+  python benchmarks/replay_logs.py --script week.jsonl --spawn waitress --speed max
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import re
+import socket
+import ssl
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+LOGS_DIR = BASE_DIR / "logs"
+HUB_ENDPOINT_JSON = BASE_DIR / "runtime" / "hub_endpoint.json"
+
+# master: requests_log "OK %s %s -> %s (%sms) ip=%s tool=%s" met fmt "%(asctime)s %(levelname)s:%(message)s"
+# (oudere logs eindigen op ip=%s: tool wordt dan uit de route index van tools.json afgeleid)
+_REQ_RE = re.compile(
+    r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) INFO:OK (\S+) (.+) -> (\d{3}) \((-?\d+)ms\) ip=(\S*)(?: tool=(\S*))?\s*$"
+)
+# master._CLICK_FMT
+_CLICK_RE = re.compile(
+    r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) INFO:OK click tool=(\S*) path="(.*?)" href="(.*?)" '
+    r'tag=(\S*) id="(.*?)" class="(.*?)" text="(.*?)" ip=(\S*)\s*$'
+)
+_ROTATED_RE = re.compile(r"\.(\d{4}-\d\d-\d\d)$")
+_TS_FMT = "%Y-%m-%d %H:%M:%S,%f"
+
+CLICK_PATHS = ("/_log/click", "/_log/clicks")
+SAFE_METHODS = ("GET", "HEAD")
+
+
+@dataclass
+class LoggedRequest:
+    ts: float
+    method: str
+    path: str
+    status: int
+    ms: int
+    ip: str
+    tool: str
+
+
+@dataclass
+class LoggedClick:
+    ts: float
+    tool: str
+    path: str
+    href: str
+    tag: str
+    id: str
+    cls: str
+    text: str
+    ip: str
+
+
+@dataclass
+class ScriptEntry:
+    t: float                      # seconden sinds het eerste request
+    method: str
+    path: str
+    tool: str
+    status: int                   # zoals gelogd
+    ms: int                       # zoals gelogd
+    ip: str = ""
+    body: str = ""
+    content_type: str = ""
+
+
+@dataclass
+class Script:
+    entries: List[ScriptEntry]
+    skipped: Dict[str, int] = field(default_factory=dict)
+    start: str = ""
+    end: str = ""
+
+
+# =========================
+# Logs lezen
+# =========================
+def log_files(logs_dir: Path, name: str) -> List[Path]:
+    """Geroteerde backups (oudste eerst) + het actieve bestand."""
+    rotated = []
+    for p in logs_dir.glob(name + ".*"):
+        m = _ROTATED_RE.search(p.name)
+        if m:
+            rotated.append((m.group(1), p))
+    out = [p for _, p in sorted(rotated)]
+    if (logs_dir / name).is_file():
+        out.append(logs_dir / name)
+    return out
+
+
+def _lines(paths: Iterable[Path]) -> Iterator[str]:
+    for p in paths:
+        with open(p, "r", encoding="utf-8", errors="replace") as f:
+            yield from f
+
+
+def _ts(s: str) -> float:
+    return datetime.strptime(s, _TS_FMT).timestamp()
+
+
+def _route_tool(path: str) -> str:
+    from master import ROUTE_INDEX  # pas nodig bij logs zonder tool=
+
+    return ROUTE_INDEX.tool_id(path) or "hub"
+
+
+def parse_requests(
+    lines: Iterable[str],
+    *,
+    tool_of: Callable[[str], str] = _route_tool,
+    skipped: Optional[Dict[str, int]] = None,
+) -> Iterator[LoggedRequest]:
+    """Niet-lege regels die niet matchen tellen als skipped["unparsed requests.log"]."""
+    for line in lines:
+        m = _REQ_RE.match(line)
+        if m:
+            ts, method, path, status, ms, ip, tool = m.groups()
+            yield LoggedRequest(_ts(ts), method, path, int(status), int(ms), ip, tool if tool is not None else tool_of(path))
+        elif skipped is not None and line.strip():
+            skipped["unparsed requests.log"] = skipped.get("unparsed requests.log", 0) + 1
+
+
+def parse_clicks(lines: Iterable[str]) -> Iterator[LoggedClick]:
+    for line in lines:
+        m = _CLICK_RE.match(line)
+        if m:
+            ts, *rest = m.groups()
+            yield LoggedClick(_ts(ts), *rest)
+
+
+# =========================
+# Request script
+# =========================
+def _click_payload(clicks: List[LoggedClick]) -> Dict[str, Any]:
+    return {"clicks": [
+        {"path": c.path, "href": c.href, "tag": c.tag, "id": c.id, "cls": c.cls, "text": c.text}
+        for c in clicks
+    ]}
+
+
+def _assign_clicks(reqs: List[LoggedRequest], clicks: List[LoggedClick]) -> Dict[int, List[LoggedClick]]:
+    """Clicks per ip naar de eerste click-beacon op of na hun tijdstip (batch = sendBeacon)."""
+    beacons: Dict[str, List[int]] = {}
+    for i, r in enumerate(reqs):
+        if r.method == "POST" and r.path in CLICK_PATHS:
+            beacons.setdefault(r.ip, []).append(i)
+    out: Dict[int, List[LoggedClick]] = {}
+    pos: Dict[str, int] = {}
+    for c in sorted(clicks, key=lambda c: c.ts):
+        idx = beacons.get(c.ip)
+        if not idx:
+            continue
+        j = pos.get(c.ip, 0)
+        # clicks.log bewaart de client-tijd: de beacon komt altijd erna (of in dezelfde ms)
+        while j < len(idx) and reqs[idx[j]].ts + 0.001 < c.ts:
+            j += 1
+        if j == len(idx):
+            continue
+        pos[c.ip] = j
+        out.setdefault(idx[j], []).append(c)
+    return out
+
+
+def _payload_body(spec: Dict[str, Any]) -> Tuple[str, str]:
+    if "json" in spec:
+        return json.dumps(spec["json"]), "application/json"
+    if "form" in spec:
+        return urlencode(spec["form"], doseq=True), "application/x-www-form-urlencoded"
+    return str(spec.get("body") or ""), str(spec.get("content_type") or "")
+
+
+def build_script(
+    logs_dir: Path,
+    *,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    exclude: Tuple[str, ...] = (),
+    payloads: Optional[Dict[str, Any]] = None,
+) -> Script:
+    payloads = payloads or {}
+    script = Script(entries=[])
+    reqs = [
+        r for r in parse_requests(_lines(log_files(logs_dir, "requests.log")), skipped=script.skipped)
+        if (since is None or r.ts >= since) and (until is None or r.ts < until)
+    ]
+    reqs.sort(key=lambda r: r.ts)
+    clicks = list(parse_clicks(_lines(log_files(logs_dir, "clicks.log"))))
+    by_beacon = _assign_clicks(reqs, clicks)
+
+    if not reqs:
+        return script
+    t0 = reqs[0].ts
+    script.start = datetime.fromtimestamp(t0).isoformat(timespec="seconds")
+    script.end = datetime.fromtimestamp(reqs[-1].ts).isoformat(timespec="seconds")
+
+    def skip(reason: str) -> None:
+        script.skipped[reason] = script.skipped.get(reason, 0) + 1
+
+    for i, r in enumerate(reqs):
+        if any(r.path.startswith(p) for p in exclude):
+            skip("excluded")
+            continue
+        e = ScriptEntry(round(r.ts - t0, 3), r.method, r.path, r.tool, r.status, r.ms, r.ip)
+        if r.method not in SAFE_METHODS:
+            spec = payloads.get(f"{r.method} {r.path}")
+            if r.path in CLICK_PATHS and r.method == "POST":
+                batch = by_beacon.get(i) or []
+                if r.path == "/_log/click":
+                    e.body = json.dumps(_click_payload(batch[:1])["clicks"][0] if batch else {})
+                else:
+                    e.body = json.dumps(_click_payload(batch))
+                e.content_type = "application/json"
+            elif isinstance(spec, dict):
+                e.body, e.content_type = _payload_body(spec)
+            else:
+                skip(f"no_payload {r.method} {r.path}")
+                continue
+        script.entries.append(e)
+    return script
+
+
+def save_script(script: Script, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"start": script.start, "end": script.end, "skipped": script.skipped}) + "\n")
+        for e in script.entries:
+            f.write(json.dumps(asdict(e), ensure_ascii=False) + "\n")
+
+
+def load_script(path: Path) -> Script:
+    with open(path, "r", encoding="utf-8") as f:
+        head = json.loads(f.readline() or "{}")
+        entries = [ScriptEntry(**json.loads(line)) for line in f if line.strip()]
+    return Script(entries=entries, skipped=head.get("skipped") or {}, start=head.get("start", ""), end=head.get("end", ""))
+
+
+# =========================
+# Route-sleutels (url rule van de app, anders het pad zelf)
+# =========================
+def route_keyer() -> Callable[[str, str], str]:
+    """
+    Zelfde app-opbouw als master (create_app + beheer + tools, eager) enkel voor de url_map:
+    /voica1/download/<name> en /static/<path:filename> worden één route in het rapport.
+    """
+    try:
+        import logging
+
+        import master
+        from werkzeug.exceptions import HTTPException
+        from werkzeug.routing import RequestRedirect
+
+        log = logging.getLogger("replay")
+        log.disabled = True
+        app = master.create_app(log, log, log, log)
+        master.register_beheer(app, log)
+        master.register_tools(app, log, lazy=False)
+        adapter = app.url_map.bind("localhost")
+    except Exception:
+        return lambda method, path: f"{method} {path}"
+
+    cache: Dict[Tuple[str, str], str] = {}
+
+    def key(method: str, path: str) -> str:
+        k = (method, path)
+        if k not in cache:
+            try:
+                rule, _ = adapter.match(path, method=method, return_rule=True)
+                cache[k] = f"{method} {rule.rule}"
+            except RequestRedirect:
+                cache[k] = f"{method} {path}"
+            except HTTPException:
+                cache[k] = f"{method} <unmatched>"
+        return cache[k]
+
+    return key
+
+
+# =========================
+# Replay
+# =========================
+@dataclass
+class Result:
+    entry: ScriptEntry
+    status: int                   # 0 = verbindingsfout
+    ms: float
+    lag_ms: float                 # te laat gestart t.o.v. het schema
+
+
+def _connect(base: str) -> Callable[[], http.client.HTTPConnection]:
+    u = urlsplit(base)
+    host, port = u.hostname or "127.0.0.1", u.port
+    if u.scheme == "https":
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE  # lokale hub: self-signed (runtime/tls)
+        return lambda: http.client.HTTPSConnection(host, port or 443, timeout=60, context=ctx)
+    return lambda: http.client.HTTPConnection(host, port or 80, timeout=60)
+
+
+def replay(
+    script: Script,
+    base_url: str,
+    *,
+    speed: Optional[float],
+    concurrency: int,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[List[Result], float]:
+    """speed None = max (alles zo snel als de workers kunnen). Geeft (resultaten, duur in s)."""
+    new_conn = _connect(base_url)
+    prefix = urlsplit(base_url).path.rstrip("/")
+    work: "queue.Queue[Optional[Tuple[ScriptEntry, float]]]" = queue.Queue(maxsize=concurrency * 4 if speed is None else 0)
+    results: List[Result] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        conn = new_conn()
+        local: List[Result] = []
+        while True:
+            item = work.get()
+            if item is None:
+                break
+            e, due = item
+            t_start = time.perf_counter()
+            lag = max(0.0, (t_start - due) * 1000) if speed is not None else 0.0
+            headers = {"Accept-Encoding": "gzip", "User-Agent": "cynit-replay"}
+            if e.content_type:
+                headers["Content-Type"] = e.content_type
+            status = 0
+            try:
+                conn.request(e.method, prefix + quote(e.path, safe="/:@!$&'()*+,;=-._~"),
+                             body=e.body.encode("utf-8") if e.body else None, headers=headers)
+                r = conn.getresponse()
+                status = r.status
+                if r.getheader("Content-Type", "").startswith("text/event-stream"):
+                    # SSE stream loopt minuten door: niet uitlezen, verbinding dicht
+                    conn.close()
+                    conn = new_conn()
+                else:
+                    r.read()
+                    if r.getheader("Connection", "").lower() == "close":
+                        conn.close()
+                        conn = new_conn()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = new_conn()
+            local.append(Result(e, status, (time.perf_counter() - t_start) * 1000, lag))
+        conn.close()
+        with lock:
+            results.extend(local)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, concurrency))]
+    for t in threads:
+        t.start()
+    t0 = time.perf_counter()
+    n = len(script.entries)
+    for i, e in enumerate(script.entries):
+        due = t0 + (e.t / speed if speed else 0.0)
+        if speed:
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        work.put((e, due))
+        if progress and i % 500 == 0:
+            progress(i, n)
+    for _ in threads:
+        work.put(None)
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - t0
+
+
+# =========================
+# Rapport
+# =========================
+def _pct(xs: List[float], p: float) -> float:
+    return xs[min(len(xs) - 1, int(len(xs) * p))] if xs else 0.0
+
+
+def summarize(results: List[Result], group: Callable[[Result], str]) -> Dict[str, Dict[str, Any]]:
+    groups: Dict[str, List[Result]] = {}
+    for r in results:
+        groups.setdefault(group(r), []).append(r)
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, rs in groups.items():
+        lat = sorted(r.ms for r in rs if r.status)
+        logged = sorted(float(r.entry.ms) for r in rs if r.entry.ms >= 0)
+        out[name] = {
+            "n": len(rs),
+            "errors": sum(1 for r in rs if r.status == 0 or r.status >= 500),
+            "status_diff": sum(1 for r in rs if r.status and r.status != r.entry.status),
+            "p50": round(_pct(lat, 0.50), 2),
+            "p95": round(_pct(lat, 0.95), 2),
+            "p99": round(_pct(lat, 0.99), 2),
+            "max": round(lat[-1], 2) if lat else 0.0,
+            "logged_p50": _pct(logged, 0.50),
+            "logged_p95": _pct(logged, 0.95),
+        }
+    return dict(sorted(out.items(), key=lambda kv: -kv[1]["n"]))
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, Any]], limit: int) -> None:
+    print(f"\n{title}")
+    print(f"  {'':40s} {'n':>7s} {'err':>5s} {'diff':>5s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s}   {'log p50/p95':>12s}")
+    for name, s in list(rows.items())[:limit]:
+        print(
+            f"  {name[:40]:40s} {s['n']:7d} {s['errors']:5d} {s['status_diff']:5d} {s['p50']:8.1f} {s['p95']:8.1f} "
+            f"{s['p99']:8.1f} {s['max']:8.1f}   {s['logged_p50']:5.0f}/{s['logged_p95']:<6.0f}"
+        )
+    if len(rows) > limit:
+        print(f"  ... {len(rows) - limit} meer (--top)")
+
+
+# =========================
+# Doel: lopende hub of zelf starten
+# =========================
+_SERVER_CHILD = r"""
+import json, logging, os, sys
+sys.path.insert(0, os.environ["CYNIT_BASE"])
+import master
+from runtime.serving import ServerConfig, serve
+
+cfg = ServerConfig(**json.loads(os.environ["CYNIT_REPLAY_SERVER"]))
+log = logging.getLogger("replay"); log.disabled = True
+logging.getLogger("werkzeug").disabled = True
+app = master.create_app(log, log, log, log)
+master.register_beheer(app, log)
+master.register_tools(app, log, lazy=False)
+serve(app, cfg, log)
+"""
+
+
+def default_url() -> str:
+    try:
+        return str(json.loads(HUB_ENDPOINT_JSON.read_text(encoding="utf-8"))["url"])
+    except Exception:
+        return "http://127.0.0.1:5000"
+
+
+def spawn_server(mode: str, threads: int) -> Tuple[subprocess.Popen, str]:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = {"mode": mode, "host": "127.0.0.1", "port": port, "threads": threads, "warmup_paths": []}
+    env = dict(os.environ, CYNIT_BASE=str(BASE_DIR), CYNIT_REPLAY_SERVER=json.dumps(server))
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _SERVER_CHILD], cwd=str(BASE_DIR), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            c = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            c.request("GET", "/_health")
+            if c.getresponse().status == 200:
+                c.close()
+                return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("server kwam niet op")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Herspeel requests.log/clicks.log tegen een lokale hub.")
+    ap.add_argument("--logs", default=str(LOGS_DIR), help="map met requests.log/clicks.log (+ backups)")
+    ap.add_argument("--days", type=float, help="enkel de laatste N dagen")
+    ap.add_argument("--since", help="YYYY-MM-DD[ HH:MM]")
+    ap.add_argument("--until", help="YYYY-MM-DD[ HH:MM]")
+    ap.add_argument("--exclude", default="/_metrics,/_health,/beheer/system/live", help="pad-prefixen, komma-gescheiden")
+    ap.add_argument("--payloads", help='JSON: {"POST /cert": {"form": {...}}, "POST /i18n/publish": {"json": {...}}}')
+    ap.add_argument("--build-script", help="enkel het request script schrijven (JSONL) en stoppen")
+    ap.add_argument("--script", help="bestaand request script herspelen i.p.v. de logs te lezen")
+    ap.add_argument("--url", help="doel (default: runtime/hub_endpoint.json, anders http://127.0.0.1:5000)")
+    ap.add_argument("--spawn", choices=("waitress", "dev"), help="zelf een server starten (huidige tree)")
+    ap.add_argument("--threads", type=int, default=8, help="worker threads voor --spawn waitress")
+    ap.add_argument("--speed", default="1", help="1 = realtime, N = N keer sneller, max = zonder pauzes")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--limit", type=int, help="maximaal N requests")
+    ap.add_argument("--top", type=int, default=25, help="rijen per tabel")
+    ap.add_argument("--json", help="rapport ook als JSON wegschrijven")
+    args = ap.parse_args()
+
+    def _when(s: Optional[str]) -> Optional[float]:
+        if not s:
+            return None
+        for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+            try:
+                return datetime.strptime(s, fmt).timestamp()
+            except ValueError:
+                pass
+        raise SystemExit(f"ongeldige datum: {s}")
+
+    if args.script:
+        script = load_script(Path(args.script))
+    else:
+        since = _when(args.since)
+        if args.days:
+            since = max(since or 0.0, (datetime.now() - timedelta(days=args.days)).timestamp())
+        payloads = json.loads(Path(args.payloads).read_text(encoding="utf-8")) if args.payloads else {}
+        exclude = tuple(p for p in args.exclude.split(",") if p)
+        script = build_script(Path(args.logs), since=since, until=_when(args.until), exclude=exclude, payloads=payloads)
+    if args.limit:
+        script.entries = script.entries[: args.limit]
+
+    span = script.entries[-1].t if script.entries else 0.0
+    print(f"script: {len(script.entries)} requests over {span / 3600:.2f} u ({script.start} .. {script.end})")
+    for reason, n in sorted(script.skipped.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"  overgeslagen: {n:6d}  {reason}")
+    if args.build_script:
+        save_script(script, Path(args.build_script))
+        print(f"geschreven: {args.build_script}")
+        return
+    if not script.entries:
+        raise SystemExit("niets te herspelen")
+
+    speed = None if args.speed == "max" else float(args.speed)
+    if speed is not None and speed <= 0:
+        raise SystemExit("--speed moet > 0 zijn (of max)")
+    if speed:
+        print(f"verwachte duur bij {speed:g}x: {span / speed:.0f}s")
+
+    key = route_keyer()
+    proc = None
+    url = args.url or default_url()
+    if args.spawn:
+        proc, url = spawn_server(args.spawn, args.threads)
+    try:
+        print(f"replay -> {url}  speed={args.speed}  concurrency={args.concurrency}")
+        results, elapsed = replay(
+            script, url, speed=speed, concurrency=args.concurrency,
+            progress=lambda i, n: print(f"  {i}/{n}", end="\r", flush=True),
+        )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(10)
+
+    by_route = summarize(results, lambda r: key(r.entry.method, r.entry.path))
+    by_tool = summarize(results, lambda r: r.entry.tool or "hub")
+    lags = sorted(r.lag_ms for r in results)
+    errors = sum(1 for r in results if r.status == 0 or r.status >= 500)
+
+    print(f"\n\n{len(results)} requests in {elapsed:.1f}s = {len(results) / elapsed:.1f} req/s, {errors} fouten")
+    if speed:
+        print(f"schedule lag p50 {_pct(lags, 0.5):.1f} ms, p95 {_pct(lags, 0.95):.1f} ms, max {lags[-1]:.1f} ms"
+              + ("  (verhoog --concurrency)" if _pct(lags, 0.95) > 100 else ""))
+    print_table("per route (ms; diff = andere status dan gelogd, bv. 304 vs 200 zonder browsercache)", by_route, args.top)
+    print_table("per tool", by_tool, args.top)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "meta": {"url": url, "speed": args.speed, "concurrency": args.concurrency, "requests": len(results),
+                     "seconds": round(elapsed, 2), "start": script.start, "end": script.end, "skipped": script.skipped},
+            "routes": by_route,
+            "tools": by_tool,
+        }, indent=1), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,50 @@
 from __future__ import annotations
 
-import importlib
-import json
-import time
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from runtime.boot_trace import BOOT
 
-from flask import Flask, Response, jsonify, request, send_from_directory
-
-from runtime.hub_logging import setup_logging
+if __name__ == "__main__":
+    # boot timeline: ook de imports van master zelf (flask, ...) meten
+    BOOT.imports.start()
+    BOOT.begin("master.imports")
+
+import gzip  # noqa: E402
+import importlib  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+import time  # noqa: E402
+from dataclasses import dataclass, replace  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Any, Dict, List, Optional, Tuple  # noqa: E402
+
+from flask import Flask, Response, jsonify, request, send_from_directory  # noqa: E402
+
+from runtime.compression import install_compression  # noqa: E402
+from runtime.conditional_get import install_conditional_get  # noqa: E402
+from runtime.config_store import config_version, configure as configure_config_store, read_json  # noqa: E402
+from runtime.hub_logging import setup_logging  # noqa: E402
+from runtime.live_stats import install_live_stats  # noqa: E402
+from runtime.metrics import install_metrics, response_size  # noqa: E402
+from runtime.profiler import install_profiler  # noqa: E402
+from runtime.route_index import RouteIndexCache  # noqa: E402
+from runtime.serving import ServerConfig, serve, warmup  # noqa: E402
+from runtime.slow_requests import install_slow_watchdog  # noqa: E402
+from runtime.state_store import configure_state, state_info  # noqa: E402
+from runtime.static_assets import install_static_pipeline  # noqa: E402
+from runtime.templates import DEFAULT_BYTECODE_DIR, get_registry, install_templates  # noqa: E402
 
 BASE_DIR = Path(__file__).resolve().parent
 CONFIG_DIR = BASE_DIR / "config"
 TOOLS_JSON = CONFIG_DIR / "tools.json"
 HUB_SETTINGS_JSON = CONFIG_DIR / "hub_settings.json"
+THEME_JSON = CONFIG_DIR / "theme.json"
 IMAGES_DIR = BASE_DIR / "images"
+BOOT_TIMELINE_JSON = BASE_DIR / "runtime" / "boot_timeline.json"
+HUB_ENDPOINT_JSON = BASE_DIR / "runtime" / "hub_endpoint.json"
 
 
 def load_tools_config() -> List[dict]:
-    if not TOOLS_JSON.exists():
-        return []
-    raw = TOOLS_JSON.read_text(encoding="utf-8").strip()
-    if not raw:
-        return []
-    try:
-        data = json.loads(raw)
-    except Exception:
+    data = read_json(TOOLS_JSON)
+    if data is None:
         return []
     if isinstance(data, dict) and "tools" in data:
         data = data["tools"]
@@ -47,21 +66,14 @@ def load_hub_settings() -> Dict[str, Any]:
         "button_bg": True,
         "button_rounded": True,
     }
-    if not HUB_SETTINGS_JSON.exists():
-        return dict(defaults)
-
-    raw = HUB_SETTINGS_JSON.read_text(encoding="utf-8").strip()
-    if not raw:
+    data = read_json(HUB_SETTINGS_JSON)
+    if data is None:
         return dict(defaults)
 
-    try:
-        data = json.loads(raw)
-        if isinstance(data, list) and data and isinstance(data[0], dict):
-            defaults.update(data[0])
-        elif isinstance(data, dict):
-            defaults.update(data)
-    except Exception:
-        pass
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        defaults.update(data[0])
+    elif isinstance(data, dict):
+        defaults.update(data)
 
     try:
         defaults["home_columns"] = int(defaults.get("home_columns", 3) or 3)
@@ -86,50 +98,214 @@ def _hex_to_rgb(hex_color: str) -> str:
         return "53,230,223"
 
 
-def _guess_tool_from_path(path: str, tools_cfg: List[dict]) -> str:
-    p = (path or "/").strip()
-    if not p.startswith("/"):
-        p = "/" + p
+# =========================
+# Route index (tool attributie + paginanamen)
+# =========================
+HUB_PAGES: Dict[str, str] = {
+    "/": "Home",
+    "/beheer/tools": "Beheer · Tools",
+    "/beheer/hub": "Beheer · Hub",
+    "/beheer/theme": "Beheer · Theme",
+    "/beheer/config": "Beheer · Config",
+    "/beheer/logs": "Beheer · Logs",
+    "/beheer/system": "Beheer · System",
+}
+
+ROUTE_INDEX = RouteIndexCache(TOOLS_JSON, HUB_PAGES)
+
+
+# =========================
+# Click logging
+# =========================
+_CLICK_FMT = 'OK click tool=%s path="%s" href="%s" tag=%s id="%s" class="%s" text="%s" ip=%s'
+CLICK_BATCH_MAX = 200          # meer items in één beacon -> rest genegeerd
+CLICK_MAX_AGE_SEC = 600        # client-timestamp ouder dan dit -> servertijd
+
+
+def _click_fields(data: Any) -> Optional[Tuple[str, str, str, str, str, str]]:
+    """(path, href, tag, id, class, text) uit één click-payload; None als het geen object is."""
+    if not isinstance(data, dict):
+        return None
+    return (
+        str(data.get("path") or ""),
+        str(data.get("href") or ""),
+        str(data.get("tag") or "")[:40],
+        str(data.get("id") or "")[:80],
+        str(data.get("cls") or "")[:180],
+        str(data.get("text") or "")[:180],
+    )
+
+
+def _click_created(data: dict, now: float) -> float:
+    """Klik-tijdstip (client ts in ms) zodat gebatchte clicks hun echte tijd houden."""
+    try:
+        ts = float(data.get("ts")) / 1000.0
+    except (TypeError, ValueError):
+        return now
+    if now - CLICK_MAX_AGE_SEC <= ts <= now:
+        return ts
+    return now
+
+
+# =========================
+# Home snapshot
+# =========================
+@dataclass(frozen=True)
+class _HomeBlob:
+    version: int
+    html: bytes
+    gzip: bytes
+
 
-    best = ""
-    best_len = 0
-    for t in tools_cfg:
-        wp = (t.get("web_path") or "").strip()
-        if not wp:
+# (tools+hub versie, cards-grid fragment)
+_HOME_CARDS: Tuple[int, str] = (-1, "")
+_HOME_BLOB: Optional[_HomeBlob] = None
+
+
+def _build_home_cards() -> str:
+    from beheer.main_layout import load_tools
+
+    tools_cards: List[str] = []
+    for t in load_tools():
+        if not t.get("enabled", True):
             continue
-        if not wp.startswith("/"):
-            wp = "/" + wp
-        if p == wp or p.startswith(wp.rstrip("/") + "/"):
-            if len(wp) > best_len:
-                best_len = len(wp)
-                best = str(t.get("id") or wp.strip("/"))
-    return best or ""
+        if t.get("hidden", False):
+            continue
+
+        web_path = (t.get("web_path") or "").strip()
+        if web_path and not web_path.startswith("/"):
+            web_path = "/" + web_path
+
+        icon = t.get("icon_web") or t.get("icon") or "🧩"
+        accent = t.get("accent", "#35e6df")
+        accent_rgb = _hex_to_rgb(accent)
+
+        accent_mode = (t.get("accent_mode") or "left").strip().lower()
+        mode_class = ""
+        if accent_mode == "ring":
+            mode_class = "accent-ring"
+        elif accent_mode == "bg":
+            mode_class = "accent-bg"
+
+        accent_width = int(t.get("accent_width") or 5)
+        ring_width = int(t.get("ring_width") or 1)
+        ring_glow = int(t.get("ring_glow") or 18)
+
+        desc = (t.get("description") or "").strip()
+
+        tools_cards.append(
+            f"""
+            <a class="toolcard {mode_class}" href="{web_path}"
+               data-log="toolcard:{t.get('id','tool')}"
+               style="--accent:{accent}; --accent-rgb:{accent_rgb};
+                      --accent-width:{accent_width}px; --ring-width:{ring_width}px; --ring-glow:{ring_glow}px;">
+              <div class="toolcard-head">
+                <div class="toolcard-icon">{icon}</div>
+                <div>{t.get("name","Tool")}</div>
+              </div>
+              <div class="toolcard-desc">{desc}</div>
+            </a>
+            """
+        )
+
+    hub = load_hub_settings()
+    cols = int(hub.get("home_columns", 3) or 3)
+    cols = max(1, min(12, cols))
+
+    return f"""
+          <div class="panel">
+            <h2 style="margin:0 0 6px 0;">Home</h2>
+            <div class="hint">Tools/cards komen uit <code>config/tools.json</code>.</div>
+          </div>
+
+          <div class="cards grid" style="--cols:{cols};">
+            {''.join(tools_cards) if tools_cards else '<div class="panel">Geen tools geactiveerd.</div>'}
+          </div>
+        """
+
 
+def _home_content() -> str:
+    global _HOME_CARDS
+    ver = config_version(TOOLS_JSON, HUB_SETTINGS_JSON)
+    if _HOME_CARDS[0] != ver:
+        _HOME_CARDS = (ver, _build_home_cards())
+    return _HOME_CARDS[1]
 
-def create_app(hub_log, errors_log, requests_log, clicks_log, tools_cfg: List[dict]) -> Flask:
+
+def _home_snapshot() -> _HomeBlob:
+    """Volledige home-pagina als bytes (+ gzip); enkel opnieuw bij tools/hub/theme wijziging."""
+    global _HOME_BLOB
+    from beheer.main_layout import render_page
+
+    ver = config_version(TOOLS_JSON, HUB_SETTINGS_JSON, THEME_JSON)
+    blob = _HOME_BLOB
+    if blob is None or blob.version != ver:
+        html = render_page(title="Home", content_html=_home_content()).encode("utf-8")
+        blob = _HomeBlob(version=ver, html=html, gzip=gzip.compress(html, compresslevel=9, mtime=0))
+        _HOME_BLOB = blob
+    return blob
+
+
+def clear_home_cache() -> None:
+    global _HOME_CARDS, _HOME_BLOB
+    _HOME_CARDS = (-1, "")
+    _HOME_BLOB = None
+
+
+def create_app(hub_log, errors_log, requests_log, clicks_log) -> Flask:
     hub = load_hub_settings()
     app_name = str(hub.get("flask_app_name") or "CyNiT-Hub").strip() or "CyNiT-Hub"
 
+    # hoe vaak config/*.json ge-stat wordt (0 = elke read)
+    if "config_check_interval_sec" in hub:
+        try:
+            configure_config_store(check_interval=float(hub["config_check_interval_sec"]))
+        except Exception:
+            pass
+
     app = Flask(app_name, static_folder="static", static_url_path="/static")
     app.config["FLASK_APP_NAME"] = app_name
 
-    # --------- access logging ----------
+    # static/: content-hashed URLs via url_for + voorgecomprimeerde .gz/.br (immutable)
+    if hub.get("static_fingerprint", True):
+        try:
+            install_static_pipeline(app, hub_log)
+        except Exception:
+            hub_log.exception("Static asset pipeline failed (plain /static)")
+
+    # tool templates: 1x compileren (+ bytecode op disk, overleeft restarts)
+    install_templates(app, bytecode_cache_dir=DEFAULT_BYTECODE_DIR if hub.get("template_bytecode_cache", True) else None)
+
+    # --------- access logging + metrics ----------
     @app.before_request
     def _before():
         request._cynit_t0 = time.perf_counter()  # type: ignore[attr-defined]
 
+    # vóór conditional GET: een 304 uit de precheck telt ook mee (in-flight + latency)
+    metrics = install_metrics(app, ROUTE_INDEX.tool_id)
+
     @app.after_request
     def _after(resp: Response):
         try:
             t0 = getattr(request, "_cynit_t0", None)
-            ms = int((time.perf_counter() - t0) * 1000) if t0 else -1
+            elapsed = (time.perf_counter() - t0) * 1000 if t0 else -1.0
+            ms = int(elapsed)
+            if t0:
+                metrics.observe(
+                    request.endpoint or "<unmatched>",
+                    request.path,
+                    elapsed,
+                    resp.status_code,
+                    response_size(resp),
+                )
             requests_log.info(
-                "OK %s %s -> %s (%sms) ip=%s",
+                "OK %s %s -> %s (%sms) ip=%s tool=%s",
                 request.method,
                 request.path,
                 resp.status_code,
                 ms,
                 request.remote_addr,
+                ROUTE_INDEX.tool_id(request.path) or "hub",
             )
         except Exception:
             pass
@@ -140,30 +316,72 @@ def create_app(hub_log, errors_log, requests_log, clicks_log, tools_cfg: List[di
         if exc is not None:
             errors_log.exception("Unhandled exception on %s %s", request.method, request.path)
 
+    # --------- conditional GET (ETag/304) ----------
+    # layout (render_page) hangt af van tools/hub/theme config
+    conditional = install_conditional_get(app, base_paths=(TOOLS_JSON, HUB_SETTINGS_JSON, THEME_JSON))
+
+    # --------- response compressie (gzip/deflate, WSGI-laag) ----------
+    # slaat responses met eigen Content-Encoding over (static pipeline, home blob)
+    compression = install_compression(app, hub.get("compression"))
+    if compression is not None:
+        metrics.add_collector("compression", compression.stats, compression.prometheus_lines)
+
+    # --------- slow-request watchdog (stack samples van requests > threshold_ms -> logs/slow.log) ----------
+    slow = install_slow_watchdog(app, hub.get("slow_requests"), ROUTE_INDEX.tool_id)
+    if slow is not None:
+        metrics.add_collector("slow_requests", slow.stats, slow.prometheus_lines)
+
+    # --------- live paneel /beheer/system (sampler thread enkel zolang er een SSE client is) ----------
+    install_live_stats(app, hub.get("live_stats"), metrics)
+
+    # --------- opt-in request profiler (?_profile=1 vanaf localhost) ----------
+    # buitenste laag: compressie en body-iteratie zitten mee in het profiel
+    install_profiler(app, hub.get("profiling"), ROUTE_INDEX.tool_id)
+
     # --------- click logging ----------
+    # single click (compat: oude click_logger.js / externe callers)
     @app.post("/_log/click")
     def log_click():
         data = request.get_json(force=True, silent=True) or {}
-        path = str(data.get("path") or "")
-        href = str(data.get("href") or "")
-        text = str(data.get("text") or "")[:180]
-        el_id = str(data.get("id") or "")[:80]
-        cls = str(data.get("cls") or "")[:180]
-        tag = str(data.get("tag") or "")[:40]
-
-        tool_id = _guess_tool_from_path(path or request.path, tools_cfg)
-
-        clicks_log.info(
-            'OK click tool=%s path="%s" href="%s" tag=%s id="%s" class="%s" text="%s" ip=%s',
-            tool_id,
-            path,
-            href,
-            tag,
-            el_id,
-            cls,
-            text,
-            request.remote_addr,
-        )
+        path, href, tag, el_id, cls, text = _click_fields(data) or ("", "", "", "", "", "")
+
+        tool_id = ROUTE_INDEX.tool_id(path or request.path)
+
+        clicks_log.info(_CLICK_FMT, tool_id, path, href, tag, el_id, cls, text, request.remote_addr)
+        return ("", 204)
+
+    # batch: [{...}, ...] of {"clicks": [...]} via navigator.sendBeacon
+    @app.post("/_log/clicks")
+    def log_clicks():
+        data = request.get_json(force=True, silent=True)
+        items = data.get("clicks") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return ("expected a JSON array of clicks", 400)
+        if not clicks_log.isEnabledFor(logging.INFO):
+            return ("", 204)
+
+        ip = request.remote_addr
+        now = time.time()
+        routes = ROUTE_INDEX.index()
+        records: List[logging.LogRecord] = []
+        for item in items[:CLICK_BATCH_MAX]:
+            fields = _click_fields(item)
+            if fields is None:
+                continue
+            info = routes.lookup(fields[0])
+            tool_id = info.tool_id if info is not None else ""
+
+            rec = clicks_log.makeRecord(
+                clicks_log.name, logging.INFO, __file__, 0, _CLICK_FMT, (tool_id, *fields, ip), None
+            )
+            rec.created = _click_created(item, now)
+            rec.msecs = (rec.created - int(rec.created)) * 1000
+            records.append(rec)
+
+        # hele batch in één keer naar de log writer (zelfde buffered write/flush)
+        records.sort(key=lambda r: r.created)
+        for rec in records:
+            clicks_log.handle(rec)
         return ("", 204)
 
     # --------- images ----------
@@ -178,69 +396,27 @@ def create_app(hub_log, errors_log, requests_log, clicks_log, tools_cfg: List[di
     # --------- HOME (toolcards terug!) ----------
     @app.get("/")
     def home():
-        from beheer.main_layout import render_page, load_tools
-
-        hub2 = load_hub_settings()
-        cols = int(hub2.get("home_columns", 3) or 3)
-        cols = max(1, min(12, cols))
-
-        tools_cards: List[str] = []
-        for t in load_tools():
-            if not t.get("enabled", True):
-                continue
-            if t.get("hidden", False):
-                continue
-
-            web_path = (t.get("web_path") or "").strip()
-            if web_path and not web_path.startswith("/"):
-                web_path = "/" + web_path
-
-            icon = t.get("icon_web") or t.get("icon") or "🧩"
-            accent = t.get("accent", "#35e6df")
-            accent_rgb = _hex_to_rgb(accent)
-
-            accent_mode = (t.get("accent_mode") or "left").strip().lower()
-            mode_class = ""
-            if accent_mode == "ring":
-                mode_class = "accent-ring"
-            elif accent_mode == "bg":
-                mode_class = "accent-bg"
-
-            accent_width = int(t.get("accent_width") or 5)
-            ring_width = int(t.get("ring_width") or 1)
-            ring_glow = int(t.get("ring_glow") or 18)
-
-            desc = (t.get("description") or "").strip()
-
-            tools_cards.append(
-                f"""
-                <a class="toolcard {mode_class}" href="{web_path}"
-                   data-log="toolcard:{t.get('id','tool')}"
-                   style="--accent:{accent}; --accent-rgb:{accent_rgb};
-                          --accent-width:{accent_width}px; --ring-width:{ring_width}px; --ring-glow:{ring_glow}px;">
-                  <div class="toolcard-head">
-                    <div class="toolcard-icon">{icon}</div>
-                    <div>{t.get("name","Tool")}</div>
-                  </div>
-                  <div class="toolcard-desc">{desc}</div>
-                </a>
-                """
-            )
+        gz = request.accept_encodings["gzip"] > 0
+        if request.query_string:
+            # zeldzaam: back-URL bevat de query -> live renderen, niet cachen
+            from beheer.main_layout import render_page
+            body = render_page(title="Home", content_html=_home_content()).encode("utf-8")
+            resp = Response(body, mimetype="text/html")
+        else:
+            blob = _home_snapshot()
+            resp = Response(blob.gzip if gz else blob.html, mimetype="text/html")
+            if gz:
+                resp.headers["Content-Encoding"] = "gzip"
+        resp.vary.add("Accept-Encoding")
+        return resp
 
-        content = f"""
-          <div class="panel">
-            <h2 style="margin:0 0 6px 0;">Home</h2>
-            <div class="hint">Tools/cards komen uit <code>config/tools.json</code>.</div>
-          </div>
-
-          <div class="cards grid" style="--cols:{cols};">
-            {''.join(tools_cards) if tools_cards else '<div class="panel">Geen tools geactiveerd.</div>'}
-          </div>
-        """
-        return render_page(title="Home", content_html=content)
+    conditional.deterministic("home", vary_gzip=True)
 
     @app.get("/_health")
     def health():
+        if not BOOT.finished:
+            # eerste geslaagde health check = einde van de boot timeline
+            BOOT.finish("first_health")
         return jsonify({"status": "ok"})
 
     return app
@@ -255,64 +431,172 @@ def register_beheer(app: Flask, hub_log) -> None:
         hub_log.exception("FAILED registering beheer routes")
 
 
-def register_tools(app: Flask, hub_log) -> None:
+def _tool_module_name(t: dict) -> str:
+    script = (t.get("script") or "").strip()
+    if not script:
+        return ""
+    module_name = script.replace(".py", "").replace("/", ".").replace("\\", ".")
+    if not module_name.startswith("tools."):
+        module_name = f"tools.{module_name}"
+    return module_name
+
+
+def _register_tool_module(app: Flask, module_name: str, hub_log) -> bool:
+    try:
+        with BOOT.span(f"import {module_name}"):
+            mod = importlib.import_module(module_name)
+        if hasattr(mod, "register_web_routes"):
+            hub_log.debug("Registering tool routes: %s", module_name)
+            with BOOT.span(f"register {module_name}"):
+                mod.register_web_routes(app)
+            hub_log.info("Tool loaded: %s (register_web_routes) OK", module_name)
+        else:
+            hub_log.warning("Tool module %s has no register_web_routes() OK", module_name)
+        return True
+    except Exception:
+        hub_log.exception("FAILED loading tool %s", module_name)
+        return False
+
+
+def _lazy_tools_enabled() -> bool:
+    env = os.environ.get("CYNIT_LAZY_TOOLS", "").strip().lower()
+    if env:
+        return env in ("1", "true", "yes", "on")
+    return bool(load_hub_settings().get("lazy_tools", False))
+
+
+def register_tools(app: Flask, hub_log, *, lazy: Optional[bool] = None) -> None:
+    """
+    Eager (default): alle enabled tools importeren + registreren bij startup.
+    Lazy (hub_settings.json "lazy_tools": true of CYNIT_LAZY_TOOLS=1): enkel een
+    prefix-dispatcher per web_path; import + register_web_routes bij de eerste hit.
+    Lazy werkt onder de dev server en waitress (thread-safe, zie runtime/lazy_tools.py).
+    """
+    if lazy is None:
+        lazy = _lazy_tools_enabled()
+
+    t0 = time.perf_counter()
+    loader = None
+    if lazy:
+        from runtime.lazy_tools import install_lazy_loader
+        loader = install_lazy_loader(app, lambda a, m: _register_tool_module(a, m, hub_log), hub_log)
+        lazy = loader is not None
+
     tools = load_tools_config()
     for t in tools:
         if not t.get("enabled", True):
             continue
 
-        script = (t.get("script") or "").strip()
-        if not script:
+        module_name = _tool_module_name(t)
+        if not module_name:
             continue
 
-        module_name = script.replace(".py", "").replace("/", ".").replace("\\", ".")
-        if not module_name.startswith("tools."):
-            module_name = f"tools.{module_name}"
+        web_path = (t.get("web_path") or "").strip()
+        if web_path and not web_path.startswith("/"):
+            web_path = "/" + web_path
 
-        try:
-            mod = importlib.import_module(module_name)
-            if hasattr(mod, "register_web_routes"):
-                hub_log.debug("Registering tool routes: %s", module_name)
-                mod.register_web_routes(app)
-                hub_log.info("Tool loaded: %s (register_web_routes) OK", module_name)
-            else:
-                hub_log.warning("Tool module %s has no register_web_routes() OK", module_name)
-        except Exception:
-            hub_log.exception("FAILED loading tool %s", module_name)
+        # zonder eigen prefix kan lazy niet weten wanneer te laden -> eager
+        if loader is not None and web_path not in ("", "/"):
+            extra = t.get("lazy_prefixes") or []
+            prefixes = tuple(str(p) for p in extra if isinstance(p, str))
+            loader.add(str(t.get("id") or module_name), module_name, web_path, prefixes)
+            hub_log.debug("Tool deferred (lazy): %s -> %s", module_name, web_path)
+            continue
 
+        _register_tool_module(app, module_name, hub_log)
+
+    hub_log.info("Tools registered (lazy=%s) in %.1fms OK", bool(lazy), (time.perf_counter() - t0) * 1000)
+
+
+def build_app(server: Optional[ServerConfig] = None) -> Flask:
+    """
+    Volledig geregistreerde app: logging + create_app + beheer + tools.
+    Gedeeld door main() (tray) en wsgi_prod.create_app (waitress-serve --call).
+    Warmup gebeurt door de caller, na zijn eigen hooks.
+    """
+    if server is None:
+        server = ServerConfig.from_settings(load_hub_settings())
 
-def main() -> None:
     tools_cfg = load_tools_config()
     tool_ids = [str(t.get("id") or "") for t in tools_cfg if isinstance(t, dict) and t.get("id")]
 
-    logs = setup_logging(BASE_DIR, tool_ids)
+    hub = load_hub_settings()
+    with BOOT.span("setup_logging"):
+        logs = setup_logging(
+            BASE_DIR,
+            tool_ids,
+            queue_size=int(hub.get("log_queue_size", 10000) or 10000),
+            flush_interval=float(hub.get("log_flush_interval_sec", 0.5) or 0.5),
+        )
     hub_log = logs.hub
-    errors_log = logs.errors
-    requests_log = logs.requests
-    clicks_log = logs.clicks
 
-    ssl_ctx = None
-    tls_log = BASE_DIR / "logs" / "tls.log"
+    # tool-state (tokens/sessies): in-process of gedeeld over workers (sqlite)
+    configure_state(hub)
+    hub_log.info("State store: %s OK", state_info())
+
+    with BOOT.span("create_app"):
+        app = create_app(hub_log, logs.errors, logs.requests, logs.clicks)
+    app.extensions["cynit_logs"] = logs
+    with BOOT.span("register_beheer"):
+        register_beheer(app, hub_log)
+    with BOOT.span("register_tools"):
+        # productie + preload = volledig geregistreerde app, ook met lazy_tools aan
+        register_tools(app, hub_log, lazy=False if (server.production and server.preload) else None)
+    if server.production and server.preload:
+        reg = get_registry(app)
+        if reg is not None:
+            with BOOT.span("compile_templates"):
+                hub_log.info("Templates precompiled: %d OK", reg.compile_all(app.jinja_env))
+
+    hub_log.info("FLASK_APP_NAME forced: %s OK", app.config.get("FLASK_APP_NAME"))
+    return app
 
+
+def _tls_bootstrap(hub_log) -> Optional[Tuple[str, str]]:
+    tls_log = BASE_DIR / "logs" / "tls.log"
     try:
         from runtime.tls_cert import ensure_localhost_cert, trust_cert_current_user_windows
         crt, key = ensure_localhost_cert(BASE_DIR, log_file=tls_log)
         trust_cert_current_user_windows(BASE_DIR, log_file=tls_log)
-        ssl_ctx = (str(crt), str(key))
         hub_log.info("TLS bootstrap OK")
+        return (str(crt), str(key))
     except Exception:
         hub_log.exception("TLS bootstrap failed (falling back to HTTP)")
+        return None
 
-    app = create_app(hub_log, errors_log, requests_log, clicks_log, tools_cfg)
-    register_beheer(app, hub_log)
-    register_tools(app, hub_log)
-
-    hub_log.info("FLASK_APP_NAME forced: %s OK", app.config.get("FLASK_APP_NAME"))
 
-    if ssl_ctx:
-        app.run(host="localhost", port=5000, debug=False, ssl_context=ssl_ctx)
-    else:
-        app.run(host="127.0.0.1", port=5000, debug=False)
+def main() -> None:
+    BOOT.end("master.imports")
+    BOOT.output = BOOT_TIMELINE_JSON
+
+    server = ServerConfig.from_settings(load_hub_settings())
+    # waitress serveert geen TLS: enkel als http expliciet toegelaten is, anders dev server (https)
+    refused_production = server.production and not server.allow_plain_http
+    if refused_production:
+        server = replace(server, mode="dev")
+    app = build_app(server)
+    hub_log = app.extensions["cynit_logs"].hub
+    if refused_production:
+        hub_log.warning("server.mode=waitress geweigerd: geen TLS en server.allow_plain_http=false -> dev server (https)")
+
+    # waitress kan geen TLS -> cert enkel voor de dev server
+    ssl_ctx = None
+    if not server.production:
+        with BOOT.span("tls_bootstrap"):
+            ssl_ctx = _tls_bootstrap(hub_log)
+
+    # warmup = eerste request -> pas na alle setup (daarna geen hooks/routes meer)
+    if server.production and server.warmup_paths:
+        with BOOT.span("warmup"):
+            warmup(app, server.warmup_paths, hub_log)
+
+    # imports na dit punt (lazy tools) horen niet meer bij de boot
+    BOOT.imports.stop()
+    BOOT.mark("ready", mode=server.mode)
+    BOOT.write()
+    hub_log.info("Boot ready in %.0fms (boot_id=%s) OK", BOOT.now_ms(), BOOT.boot_id)
+
+    serve(app, server, hub_log, ssl_ctx=ssl_ctx, endpoint_file=HUB_ENDPOINT_JSON)
 
 
 if __name__ == "__main__":
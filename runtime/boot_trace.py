@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/boot_trace.py — boot timeline: tray -> preflight -> master.main -> eerste /_health
+
+- spans + marks met monotonic timestamps (ms t.o.v. de boot-origin)
+- tray geeft origin door aan master via env (CYNIT_BOOT_ID / CYNIT_BOOT_T0_WALL)
+  -> beide processen schrijven op dezelfde tijdas
+- import-tijd boom (zoals -X importtime) in-process via een __import__ hook + importlib.import_module
+  (register_tools laadt tools zo -> hun import-subboom hangt onder de tool module)
+- master schrijft runtime/boot_timeline.json; tray merge't die in de heartbeat
+- enkel stdlib: wordt ook door scripts/tray_runner.py geïmporteerd (zonder flask/venv)
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+ENV_BOOT_ID = "CYNIT_BOOT_ID"
+ENV_BOOT_T0_WALL = "CYNIT_BOOT_T0_WALL"
+
+# import-boom: kleinere nodes weglaten (heartbeat wordt elke 5s geschreven)
+IMPORT_MIN_MS = 1.0
+IMPORT_MAX_DEPTH = 4
+
+
+@dataclass
+class Span:
+    name: str
+    proc: str
+    start_ms: float
+    end_ms: Optional[float] = None
+    depth: int = 0
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.end_ms if self.end_ms is not None else self.start_ms
+        out: Dict[str, Any] = {
+            "name": self.name,
+            "proc": self.proc,
+            "start_ms": round(self.start_ms, 2),
+            "ms": round(end - self.start_ms, 2),
+            "depth": self.depth,
+        }
+        if self.end_ms is None:
+            out["mark"] = True
+        if self.meta:
+            out["meta"] = self.meta
+        return out
+
+
+# =========================
+# Import timer (in-process -X importtime)
+# =========================
+@dataclass
+class _ImportNode:
+    name: str
+    ms: float = 0.0
+    self_ms: float = 0.0
+    children: List["_ImportNode"] = field(default_factory=list)
+
+    def to_dict(self, depth: int = 0) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"name": self.name, "ms": round(self.ms, 2), "self_ms": round(self.self_ms, 2)}
+        if depth < IMPORT_MAX_DEPTH:
+            kids = [c.to_dict(depth + 1) for c in self.children if c.ms >= IMPORT_MIN_MS]
+            if kids:
+                out["children"] = kids
+        return out
+
+
+class ImportTimer:
+    """
+    Wrapt builtins.__import__ en importlib.import_module: elke import van een module die nog
+    niet in sys.modules zit wordt getimed; geneste imports worden kinderen. Enkel de thread
+    die start() deed.
+    """
+
+    def __init__(self) -> None:
+        self.root = _ImportNode("<boot>")
+        self._stack: List[_ImportNode] = [self.root]
+        self._orig: Optional[Callable[..., Any]] = None
+        self._orig_import_module: Optional[Callable[..., Any]] = None
+        self._thread = 0
+
+    def _timed(self, name: str, fn: Callable[[], Any]) -> Any:
+        node = _ImportNode(name)
+        parent = self._stack[-1]
+        self._stack.append(node)
+        t0 = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            node.ms = (time.perf_counter() - t0) * 1000
+            node.self_ms = node.ms - sum(c.ms for c in node.children)
+            self._stack.pop()
+            parent.children.append(node)
+
+    @property
+    def active(self) -> bool:
+        return self._orig is not None
+
+    def start(self) -> None:
+        if self._orig is not None:
+            return
+        import sys
+
+        orig = builtins.__import__
+        orig_import_module = importlib.import_module
+        modules = sys.modules
+        self._orig = orig
+        self._orig_import_module = orig_import_module
+        self._thread = threading.get_ident()
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in modules or threading.get_ident() != self._thread:
+                return orig(name, globals, locals, fromlist, level)
+            return self._timed(name, lambda: orig(name, globals, locals, fromlist, level))
+
+        def timed_import_module(name, package=None):
+            if name.startswith(".") or name in modules or threading.get_ident() != self._thread:
+                return orig_import_module(name, package)
+            return self._timed(name, lambda: orig_import_module(name, package))
+
+        builtins.__import__ = timed_import
+        importlib.import_module = timed_import_module  # type: ignore[assignment]
+
+    def stop(self) -> None:
+        if self._orig is None:
+            return
+        builtins.__import__ = self._orig
+        self._orig = None
+        if self._orig_import_module is not None:
+            importlib.import_module = self._orig_import_module  # type: ignore[assignment]
+            self._orig_import_module = None
+        self.root.ms = sum(c.ms for c in self.root.children)
+
+    def tree(self) -> List[Dict[str, Any]]:
+        return [c.to_dict(1) for c in self.root.children if c.ms >= IMPORT_MIN_MS]
+
+    def total_ms(self) -> float:
+        return sum(c.ms for c in self.root.children)
+
+
+# =========================
+# Boot trace
+# =========================
+class BootTrace:
+    def __init__(self, proc: str, boot_id: Optional[str] = None, origin_wall: Optional[float] = None):
+        self.proc = proc
+        self.boot_id = boot_id or uuid.uuid4().hex[:12]
+        self.origin_wall = origin_wall if origin_wall is not None else time.time()
+        # monotonic binnen het proces, verschoven naar de gedeelde origin (wall clock enkel als anker)
+        self._mono0 = time.monotonic()
+        self._offset_ms = max(0.0, (time.time() - self.origin_wall) * 1000)
+        self._lock = threading.Lock()
+        self._open: List[Span] = []
+        self.spans: List[Span] = []
+        self.imports = ImportTimer()
+        self.finished = False
+        self.output: Optional[Path] = None
+
+    @classmethod
+    def from_env(cls, proc: str) -> "BootTrace":
+        boot_id = os.environ.get(ENV_BOOT_ID) or None
+        try:
+            origin_wall: Optional[float] = float(os.environ[ENV_BOOT_T0_WALL])
+        except (KeyError, ValueError):
+            origin_wall = None
+        return cls(proc, boot_id=boot_id, origin_wall=origin_wall)
+
+    def child_env(self) -> Dict[str, str]:
+        """Env voor een subprocess dat op dezelfde tijdas moet loggen."""
+        return {ENV_BOOT_ID: self.boot_id, ENV_BOOT_T0_WALL: repr(self.origin_wall)}
+
+    def now_ms(self) -> float:
+        return self._offset_ms + (time.monotonic() - self._mono0) * 1000
+
+    # ---------- spans ----------
+    def begin(self, name: str, **meta: Any) -> Optional[Span]:
+        if self.finished:
+            return None
+        with self._lock:
+            sp = Span(name=name, proc=self.proc, start_ms=self.now_ms(), depth=len(self._open), meta=meta)
+            self._open.append(sp)
+            self.spans.append(sp)
+        return sp
+
+    def end(self, name: str, **meta: Any) -> None:
+        with self._lock:
+            for i in range(len(self._open) - 1, -1, -1):
+                sp = self._open[i]
+                if sp.name == name:
+                    sp.end_ms = self.now_ms()
+                    sp.meta.update(meta)
+                    del self._open[i]
+                    return
+
+    @contextmanager
+    def span(self, name: str, **meta: Any) -> Iterator[None]:
+        sp = self.begin(name, **meta)
+        try:
+            yield
+        finally:
+            if sp is not None:
+                self.end(name)
+
+    def mark(self, name: str, **meta: Any) -> None:
+        if self.finished:
+            return
+        with self._lock:
+            self.spans.append(Span(name=name, proc=self.proc, start_ms=self.now_ms(), depth=len(self._open), meta=meta))
+
+    def has(self, name: str) -> bool:
+        return any(s.name == name for s in self.spans)
+
+    def finish(self, mark: Optional[str] = None, **meta: Any) -> None:
+        if self.finished:
+            return
+        if mark:
+            self.mark(mark, **meta)
+        self.imports.stop()
+        self.finished = True
+        self.write()
+
+    # ---------- export ----------
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = [s.to_dict() for s in self.spans]
+        out: Dict[str, Any] = {
+            "boot_id": self.boot_id,
+            "origin_wall": self.origin_wall,
+            "finished": self.finished,
+            "spans": spans,
+        }
+        if self.imports.root.children:
+            out["imports_ms"] = round(self.imports.total_ms(), 2)
+            out["imports"] = self.imports.tree()
+        return out
+
+    def write(self, path: Optional[Path] = None) -> None:
+        path = path or self.output
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception:
+            # tracing mag de boot nooit breken
+            pass
+
+
+# =========================
+# Helpers
+# =========================
+def read_timeline(path: Path, boot_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict):
+        return None
+    if boot_id is not None and data.get("boot_id") != boot_id:
+        return None
+    return data
+
+
+def merge_timelines(*timelines: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Tray + master timeline (zelfde boot_id) -> één waterfall, gesorteerd op start."""
+    parts = [t for t in timelines if t]
+    if not parts:
+        return {}
+    out: Dict[str, Any] = {
+        "boot_id": parts[0].get("boot_id"),
+        "origin_wall": parts[0].get("origin_wall"),
+        "finished": all(bool(t.get("finished")) for t in parts),
+        "spans": sorted((s for t in parts for s in t.get("spans", [])), key=lambda s: s.get("start_ms", 0)),
+    }
+    for t in parts:
+        if "imports" in t:
+            out["imports"] = t["imports"]
+            out["imports_ms"] = t.get("imports_ms", 0)
+    return out
+
+
+# master-proces (origin = tray restart als die env gezet is, anders import van deze module)
+BOOT = BootTrace.from_env("master")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/compression.py — WSGI middleware: gzip/deflate voor HTML, JSON, CSS, JS, tekst
+
+- onderhandelt via Accept-Encoding (q-waarden; gzip vóór deflate bij gelijke q)
+- enkel content-types uit de allowlist; al gecomprimeerde media (zip, xlsx, pdf, ico, ...) vallen
+  daar buiten en responses met een eigen Content-Encoding (static pipeline, home blob) blijven onaangeroerd
+- drempel: kleiner dan min_size = ongecomprimeerd. Bij gestreamde responses (geen Content-Length)
+  wordt enkel tot min_size gebufferd; daarna chunk per chunk gecomprimeerd met een sync flush
+  per ~16 KB, dus een generator van 250k regels wordt nooit volledig in geheugen gehouden
+- sterke ETag -> weak (W/"...") op de gecomprimeerde variant; conditional GET vergelijkt weak
+- stats(): aantallen, bytes in/uit en ratio per encoding + redenen om over te slaan (/_metrics, /beheer/system)
+- werkt rond app.wsgi_app -> zelfde gedrag onder master.main en wsgi_prod/waitress
+"""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from flask import Flask
+from werkzeug.http import parse_accept_header
+
+DEFAULT_TYPES: FrozenSet[str] = frozenset({
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "text/xml",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "application/xhtml+xml",
+    "application/manifest+json",
+    "image/svg+xml",
+})
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_LEVEL = 6
+STREAM_FLUSH_BYTES = 16 * 1024
+
+# zlib wbits: 16+15 = gzip container, 15 = zlib ("deflate" in HTTP = RFC 1950)
+_WBITS = {"gzip": 31, "deflate": 15}
+
+
+@dataclass
+class CompressionStats:
+    responses: int = 0
+    compressed: Dict[str, int] = field(default_factory=lambda: {"gzip": 0, "deflate": 0})
+    bytes_in: Dict[str, int] = field(default_factory=lambda: {"gzip": 0, "deflate": 0})
+    bytes_out: Dict[str, int] = field(default_factory=lambda: {"gzip": 0, "deflate": 0})
+    streamed: int = 0
+    skipped: Dict[str, int] = field(default_factory=dict)
+
+    def snapshot(self) -> Dict[str, Any]:
+        bin_ = sum(self.bytes_in.values())
+        bout = sum(self.bytes_out.values())
+        return {
+            "responses": self.responses,
+            "compressed": dict(self.compressed),
+            "streamed": self.streamed,
+            "bytes_in": dict(self.bytes_in),
+            "bytes_out": dict(self.bytes_out),
+            "ratio": round(bout / bin_, 4) if bin_ else None,
+            "saved_bytes": bin_ - bout,
+            "skipped": dict(sorted(self.skipped.items())),
+        }
+
+
+def negotiate(accept_encoding: str, available: Iterable[str] = ("gzip", "deflate")) -> Optional[str]:
+    """Beste encoding uit Accept-Encoding, of None (identity)."""
+    if not accept_encoding:
+        return None
+    accept = parse_accept_header(accept_encoding)
+    best, best_q = None, 0.0
+    for enc in available:
+        q = accept[enc]  # "*" telt mee via werkzeug
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        wsgi_app: Callable,
+        *,
+        min_size: int = DEFAULT_MIN_SIZE,
+        level: int = DEFAULT_LEVEL,
+        types: Iterable[str] = DEFAULT_TYPES,
+        encodings: Tuple[str, ...] = ("gzip", "deflate"),
+    ):
+        self.wsgi_app = wsgi_app
+        self.min_size = max(0, int(min_size))
+        self.level = max(1, min(9, int(level)))
+        self.types = frozenset(t.strip().lower() for t in types)
+        self.encodings = tuple(e for e in encodings if e in _WBITS)
+        self._stats = CompressionStats()
+        self._lock = threading.Lock()
+
+    # ---------- stats ----------
+    def _skip(self, reason: str) -> None:
+        with self._lock:
+            self._stats.responses += 1
+            self._stats.skipped[reason] = self._stats.skipped.get(reason, 0) + 1
+
+    def _done(self, enc: str, n_in: int, n_out: int, streamed: bool) -> None:
+        with self._lock:
+            s = self._stats
+            s.responses += 1
+            s.compressed[enc] += 1
+            s.bytes_in[enc] += n_in
+            s.bytes_out[enc] += n_out
+            if streamed:
+                s.streamed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snap = self._stats.snapshot()
+        snap.update(min_size=self.min_size, level=self.level)
+        return snap
+
+    def prometheus_lines(self) -> List[str]:
+        s = self.stats()
+        out = [
+            "# HELP cynit_compression_responses_total Responses seen by the compression middleware.",
+            "# TYPE cynit_compression_responses_total counter",
+        ]
+        for enc, n in s["compressed"].items():
+            out.append(f'cynit_compression_responses_total{{result="{enc}"}} {n}')
+        for reason, n in s["skipped"].items():
+            out.append(f'cynit_compression_responses_total{{result="skip_{reason}"}} {n}')
+        out += [
+            "# HELP cynit_compression_bytes_total Body bytes before (in) and after (out) compression.",
+            "# TYPE cynit_compression_bytes_total counter",
+        ]
+        for enc in s["bytes_in"]:
+            out.append(f'cynit_compression_bytes_total{{encoding="{enc}",direction="in"}} {s["bytes_in"][enc]}')
+            out.append(f'cynit_compression_bytes_total{{encoding="{enc}",direction="out"}} {s["bytes_out"][enc]}')
+        return out
+
+    # ---------- beslissing op basis van de headers ----------
+    def _reason_to_skip(self, status: str, headers: List[Tuple[str, str]]) -> Optional[str]:
+        code = int(status.split(" ", 1)[0] or 0)
+        if code < 200 or code in (204, 206, 304):
+            return "status"
+        h = {k.lower(): v for k, v in headers}
+        if h.get("content-encoding", "identity").lower() != "identity":
+            return "already_encoded"
+        if "no-transform" in h.get("cache-control", "").lower():
+            return "no_transform"
+        ctype = h.get("content-type", "").split(";", 1)[0].strip().lower()
+        if ctype not in self.types:
+            return "content_type"
+        length = h.get("content-length")
+        if length is not None and length.isdigit() and int(length) < self.min_size:
+            return "too_small"
+        return None
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        enc = None
+        if environ.get("REQUEST_METHOD", "GET") != "HEAD" and self.encodings:
+            enc = negotiate(environ.get("HTTP_ACCEPT_ENCODING", ""), self.encodings)
+
+        captured: Dict[str, Any] = {}
+
+        def _start(status: str, headers: List[Tuple[str, str]], exc_info: Any = None):
+            captured["status"], captured["headers"], captured["exc_info"] = status, headers, exc_info
+            reason = self._reason_to_skip(status, headers)
+            ctype_ok = reason not in ("content_type", "status", "already_encoded", "no_transform")
+            if ctype_ok and not any(k.lower() == "vary" and "accept-encoding" in v.lower() for k, v in headers):
+                _add_vary(headers)
+            if enc is None or reason is not None or captured.get("late"):
+                self._skip(reason or ("not_accepted" if enc is None else "late_start"))
+                captured["passthrough"] = True
+                return start_response(status, headers, exc_info)
+            # uitstellen: pas bij de eerste body-bytes weten we of het boven de drempel gaat
+            return captured.setdefault("pending", []).append
+
+        app_iter = self.wsgi_app(environ, _start)
+        if "status" not in captured:
+            # start_response pas tijdens het itereren (zeldzaam): niet comprimeren
+            captured["late"] = True
+            return app_iter
+        if captured.get("passthrough"):
+            return app_iter
+        return self._compress(app_iter, enc, captured, start_response)  # type: ignore[arg-type]
+
+    # ---------- body ----------
+    def _compress(self, app_iter: Iterable[bytes], enc: str, captured: Dict[str, Any], start_response: Callable) -> Iterator[bytes]:
+        status, headers, exc_info = captured["status"], captured["headers"], captured["exc_info"]
+        known_length = any(k.lower() == "content-length" for k, _ in headers)
+        it = iter(app_iter)
+        try:
+            # tot min_size bufferen (ook write()-data van start_response)
+            buf: List[bytes] = list(captured.get("pending") or [])
+            size = sum(len(b) for b in buf)
+            exhausted = False
+            while size < self.min_size:
+                try:
+                    chunk = next(it)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if chunk:
+                    buf.append(chunk)
+                    size += len(chunk)
+            if not exhausted:
+                # één chunk vooruit kijken: gewone Flask responses zijn één chunk -> Content-Length
+                try:
+                    chunk = next(it)
+                    buf.append(chunk)
+                    size += len(chunk)
+                except StopIteration:
+                    exhausted = True
+
+            if exhausted and size < self.min_size:
+                self._skip("too_small")
+                if not known_length:
+                    headers.append(("Content-Length", str(size)))
+                start_response(status, headers, exc_info)
+                if buf:
+                    yield b"".join(buf)
+                return
+
+            co = zlib.compressobj(self.level, zlib.DEFLATED, _WBITS[enc])
+            new_headers = [(k, v) for k, v in headers if k.lower() not in ("content-length", "etag")]
+            new_headers.append(("Content-Encoding", enc))
+            for k, v in headers:
+                if k.lower() == "etag":
+                    new_headers.append(("ETag", v if v.startswith("W/") else "W/" + v))
+
+            n_in, n_out = size, 0
+            if exhausted:
+                # volledig gekend: in één keer, met Content-Length
+                body = co.compress(b"".join(buf)) + co.flush()
+                new_headers.append(("Content-Length", str(len(body))))
+                start_response(status, new_headers, exc_info)
+                self._done(enc, n_in, len(body), False)
+                yield body
+                return
+
+            start_response(status, new_headers, exc_info)
+            # gestreamd: om de STREAM_FLUSH_BYTES een sync flush (client ziet voortgang, ratio blijft goed)
+            flush_every = 0 if known_length else STREAM_FLUSH_BYTES
+            out = co.compress(b"".join(buf))
+            unflushed = size
+            if flush_every and unflushed >= flush_every:
+                out += co.flush(zlib.Z_SYNC_FLUSH)
+                unflushed = 0
+            buf = []
+            if out:
+                n_out += len(out)
+                yield out
+            for chunk in it:
+                if not chunk:
+                    continue
+                n_in += len(chunk)
+                unflushed += len(chunk)
+                out = co.compress(chunk)
+                if flush_every and unflushed >= flush_every:
+                    out += co.flush(zlib.Z_SYNC_FLUSH)
+                    unflushed = 0
+                if out:
+                    n_out += len(out)
+                    yield out
+            out = co.flush()
+            n_out += len(out)
+            self._done(enc, n_in, n_out, not known_length)
+            yield out
+        finally:
+            close = getattr(app_iter, "close", None)
+            if close is not None:
+                close()
+
+
+def _add_vary(headers: List[Tuple[str, str]]) -> None:
+    for i, (k, v) in enumerate(headers):
+        if k.lower() == "vary":
+            if v.strip() != "*":
+                headers[i] = (k, f"{v}, Accept-Encoding" if v.strip() else "Accept-Encoding")
+            return
+    headers.append(("Vary", "Accept-Encoding"))
+
+
+# =========================
+# Flask integratie
+# =========================
+def install_compression(app: Flask, settings: Optional[Dict[str, Any]] = None) -> Optional[CompressionMiddleware]:
+    """
+    hub_settings.json "compression": {"enabled": true, "min_size": 1024, "level": 6, "types": [...]}.
+    Idempotent; geeft None terug als compressie uit staat.
+    """
+    existing = app.extensions.get("cynit_compression")
+    if isinstance(existing, CompressionMiddleware):
+        return existing
+    cfg = settings if isinstance(settings, dict) else {}
+    if not cfg.get("enabled", True):
+        return None
+    types = cfg.get("types")
+    mw = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=int(cfg.get("min_size", DEFAULT_MIN_SIZE)),
+        level=int(cfg.get("level", DEFAULT_LEVEL)),
+        types=types if isinstance(types, list) and types else DEFAULT_TYPES,
+    )
+    app.wsgi_app = mw  # type: ignore[method-assign]
+    app.extensions["cynit_compression"] = mw
+    return mw
+
+
+def get_compression(app: Flask) -> Optional[CompressionMiddleware]:
+    mw = app.extensions.get("cynit_compression")
+    return mw if isinstance(mw, CompressionMiddleware) else None
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/conditional_get.py — ETag / Last-Modified / 304 voor hub-pagina's
+
+- elke GET 200 HTML/JSON response krijgt een strong ETag (hash van de body), behalve
+  Cache-Control: no-store en probes/scrapes (/_health, /_metrics: altijd de volledige body)
+- "deterministische" routes (output hangt enkel af van config + route + query)
+  krijgen een ETag uit config-versies; een match wordt al in before_request
+  met 304 beantwoord -> de view-functie draait dan niet
+- If-None-Match heeft voorrang op If-Modified-Since (RFC 9110)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Flask, Response, g, request
+
+from runtime.config_store import CONFIG_STORE, PathLike
+
+# Restart = nieuwe code mogelijk -> alle deterministische ETags ongeldig
+BOOT_ID = f"{time.time_ns():x}"
+BOOT_TS = int(time.time())
+
+_HASHED_MIMETYPES = {"text/html", "application/json", "text/plain", "text/markdown"}
+_EXT_KEY = "cynit_conditional_get"
+# health probe + metrics scrape: nooit hashen of met 304 beantwoorden
+_NO_ETAG_ENDPOINTS = ("health", "metrics_endpoint")
+
+
+@dataclass(frozen=True)
+class _Rule:
+    paths: Tuple[PathLike, ...]
+    extra: Optional[Callable[[], str]] = None
+    vary_gzip: bool = False  # view levert gzip/identity varianten -> aparte ETag per variant
+
+
+class ConditionalGet:
+    def __init__(self, app: Flask, base_paths: Iterable[PathLike] = ()):
+        self.app = app
+        self.base_paths: Tuple[PathLike, ...] = tuple(base_paths)
+        self.rules: Dict[str, _Rule] = {}
+        self.excluded = set(_NO_ETAG_ENDPOINTS)
+        self.precheck_hits = 0
+        self.content_hits = 0
+
+        app.before_request(self._precheck)
+        app.after_request(self._finalize)
+
+    # ---------- registratie ----------
+    def deterministic(
+        self,
+        endpoint: str,
+        *paths: PathLike,
+        extra: Optional[Callable[[], str]] = None,
+        vary_gzip: bool = False,
+    ) -> None:
+        """Markeer een GET-endpoint als functie van (config files + route + query + extra())."""
+        self.rules[endpoint] = _Rule(paths=tuple(paths), extra=extra, vary_gzip=vary_gzip)
+
+    # ---------- validators ----------
+    def _validators(self, rule: _Rule) -> Tuple[str, Optional[int]]:
+        h = hashlib.blake2b(digest_size=12)
+        h.update(BOOT_ID.encode())
+        last_mod = BOOT_TS
+        for p in self.base_paths + rule.paths:
+            snap = CONFIG_STORE.snapshot(p)
+            h.update(b"|%d" % snap.version)
+            if snap.signature is not None:
+                last_mod = max(last_mod, snap.signature[0] // 1_000_000_000)
+        h.update(b"|" + (request.full_path or request.path or "/").encode("utf-8", "replace"))
+        if rule.vary_gzip and request.accept_encodings["gzip"] > 0:
+            h.update(b"|gzip")
+        if rule.extra is not None:
+            h.update(b"|" + str(rule.extra()).encode("utf-8", "replace"))
+            # extra() heeft geen mtime -> enkel ETag valideren, geen If-Modified-Since
+            return f"d-{h.hexdigest()}", None
+        return f"d-{h.hexdigest()}", last_mod
+
+    @staticmethod
+    def _not_modified(etag: str, last_mod: Optional[int]) -> bool:
+        inm = request.if_none_match
+        if inm:
+            return inm.contains_weak(etag)  # RFC 7232: weak (na compressie W/"...")
+        ims = request.if_modified_since
+        if ims is not None and last_mod is not None:
+            return int(ims.timestamp()) >= last_mod
+        return False
+
+    @staticmethod
+    def _set_headers(resp: Response, etag: str, last_mod: Optional[int]) -> None:
+        resp.set_etag(etag)
+        if last_mod is not None:
+            resp.last_modified = datetime.fromtimestamp(last_mod, tz=timezone.utc)
+        if "Cache-Control" not in resp.headers:
+            # browser mag bewaren maar moet altijd revalideren
+            resp.headers["Cache-Control"] = "no-cache"
+
+    # ---------- hooks ----------
+    def _precheck(self) -> Optional[Response]:
+        if request.method not in ("GET", "HEAD"):
+            return None
+        rule = self.rules.get(request.endpoint or "")
+        if rule is None:
+            return None
+        try:
+            etag, last_mod = self._validators(rule)
+        except Exception:
+            return None
+        g._cynit_validators = (etag, last_mod)
+        if self._not_modified(etag, last_mod):
+            self.precheck_hits += 1
+            resp = Response(status=304)
+            self._set_headers(resp, etag, last_mod)
+            return resp
+        return None
+
+    def _finalize(self, resp: Response) -> Response:
+        if request.method not in ("GET", "HEAD") or resp.status_code != 200:
+            return resp
+        if resp.is_streamed or resp.direct_passthrough or "ETag" in resp.headers:
+            return resp
+        if resp.mimetype not in _HASHED_MIMETYPES:
+            return resp
+        if resp.cache_control.no_store or (request.endpoint or "") in self.excluded:
+            return resp
+
+        try:
+            validators = getattr(g, "_cynit_validators", None)
+            if validators is not None:
+                etag, last_mod = validators
+            else:
+                etag = "c-" + hashlib.blake2b(resp.get_data(), digest_size=12).hexdigest()
+                last_mod = None
+
+            self._set_headers(resp, etag, last_mod)
+            if self._not_modified(etag, last_mod):
+                self.content_hits += 1
+                resp.make_conditional(request)
+        except Exception:
+            # caching mag de response nooit breken
+            pass
+        return resp
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "deterministic_routes": len(self.rules),
+            "precheck_304": self.precheck_hits,
+            "content_304": self.content_hits,
+        }
+
+
+# =========================
+# Helpers
+# =========================
+def install_conditional_get(app: Flask, base_paths: Iterable[PathLike] = ()) -> ConditionalGet:
+    cg = ConditionalGet(app, base_paths)
+    app.extensions[_EXT_KEY] = cg
+    return cg
+
+
+def mark_deterministic(app: Flask, endpoint: str, *paths: PathLike, extra: Optional[Callable[[], str]] = None) -> None:
+    """No-op als de app geen conditional GET heeft (bv. standalone tool)."""
+    cg = app.extensions.get(_EXT_KEY)
+    if cg is not None:
+        cg.deterministic(endpoint, *paths, extra=extra)
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/config_store.py — centrale, gecachte toegang tot config/*.json
+
+- 1 parse per bestandswijziging i.p.v. per request
+- revalidatie via goedkope stat (mtime_ns + size + inode), max 1x per check_interval
+- immutable snapshots (FrozenDict / FrozenList) -> veilig delen tussen threads
+- monotone versie-teller (per bestand + globaal) voor caches die erop steunen
+- writers doen atomic replace (tmp + os.replace) -> readers zien nooit een half bestand
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+# (mtime_ns, size, inode) — None als het bestand ontbreekt
+Signature = Optional[Tuple[int, int, int]]
+
+DEFAULT_CHECK_INTERVAL = 1.0
+
+# PathLike -> abspath key (hot path: elke config-versie check)
+_KEY_CACHE: Dict[Any, str] = {}
+
+
+# =========================
+# Immutable containers
+# =========================
+def _readonly(*_args: Any, **_kwargs: Any) -> Any:
+    raise TypeError("config snapshot is read-only (gebruik thaw() of read_json_copy())")
+
+
+class FrozenDict(dict):
+    """dict die niet gemuteerd kan worden; isinstance(x, dict) blijft werken."""
+
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def copy(self) -> Dict[Any, Any]:  # type: ignore[override]
+        return dict(self)
+
+
+class FrozenList(list):
+    """list die niet gemuteerd kan worden; isinstance(x, list) blijft werken."""
+
+    __slots__ = ()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __iadd__ = _readonly
+    __imul__ = _readonly
+    append = _readonly
+    clear = _readonly
+    extend = _readonly
+    insert = _readonly
+    pop = _readonly
+    remove = _readonly
+    reverse = _readonly
+    sort = _readonly
+
+    def copy(self) -> list:  # type: ignore[override]
+        return list(self)
+
+
+def freeze(obj: Any) -> Any:
+    if isinstance(obj, FrozenDict) or isinstance(obj, FrozenList):
+        return obj
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return FrozenList(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Diepe, muteerbare kopie (plain dict/list) van een snapshot."""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+# =========================
+# Snapshot
+# =========================
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    path: str
+    data: Any  # FrozenDict/FrozenList/scalar, None als missing of ongeldig
+    version: int
+    signature: Signature
+    error: str = ""
+
+    @property
+    def exists(self) -> bool:
+        return self.signature is not None
+
+    @property
+    def ok(self) -> bool:
+        return self.signature is not None and not self.error and self.data is not None
+
+
+class _Entry:
+    __slots__ = ("snapshot", "checked_at")
+
+    def __init__(self, snapshot: ConfigSnapshot, checked_at: float):
+        self.snapshot = snapshot
+        self.checked_at = checked_at
+
+
+def _stat_signature(path: str) -> Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# =========================
+# Store
+# =========================
+class ConfigStore:
+    """
+    Thread-safe cache van geparste JSON-bestanden.
+
+    Reads binnen check_interval na de vorige stat kosten enkel een dict lookup.
+    Daarna volgt één os.stat; enkel als de signature wijzigt wordt opnieuw
+    gelezen en geparsed en krijgt het bestand een nieuwe (globale) versie.
+    """
+
+    def __init__(self, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        self._version = 0
+        self.check_interval = float(check_interval)
+        self.hits = 0
+        self.reloads = 0
+        self.stats_calls = 0
+
+    # ---------- helpers ----------
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        key = _KEY_CACHE.get(path)
+        if key is None:
+            raw = os.fspath(path)
+            key = os.path.abspath(raw)
+            # enkel absolute paden memoizen (relatief hangt af van cwd)
+            if os.path.isabs(raw) and len(_KEY_CACHE) < 1024:
+                _KEY_CACHE[path] = key
+        return key
+
+    def _next_version(self) -> int:
+        self._version += 1
+        return self._version
+
+    def _parse(self, key: str, sig: Signature) -> ConfigSnapshot:
+        if sig is None:
+            return ConfigSnapshot(key, None, self._next_version(), None)
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                raw = f.read().strip()
+            data = freeze(json.loads(raw)) if raw else None
+            err = ""
+        except Exception as exc:
+            data = None
+            err = f"{type(exc).__name__}: {exc}"
+        return ConfigSnapshot(key, data, self._next_version(), sig, err)
+
+    # ---------- read API ----------
+    @property
+    def version(self) -> int:
+        """Globale versie: stijgt bij elke gedetecteerde wijziging van om het even welk bestand."""
+        return self._version
+
+    def snapshot(self, path: PathLike) -> ConfigSnapshot:
+        key = self._key(path)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None and (now - entry.checked_at) < self.check_interval:
+            self.hits += 1
+            return entry.snapshot
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (now - entry.checked_at) < self.check_interval:
+                self.hits += 1
+                return entry.snapshot
+
+            self.stats_calls += 1
+            sig = _stat_signature(key)
+            if entry is not None and entry.snapshot.signature == sig:
+                entry.checked_at = now
+                self.hits += 1
+                return entry.snapshot
+
+            self.reloads += 1
+            snap = self._parse(key, sig)
+            self._entries[key] = _Entry(snap, now)
+            return snap
+
+    def read(self, path: PathLike, default: Any = None) -> Any:
+        """Immutable data (FrozenDict/FrozenList) of `default` als missing/ongeldig."""
+        data = self.snapshot(path).data
+        return default if data is None else data
+
+    def read_copy(self, path: PathLike, default: Any = None) -> Any:
+        """Muteerbare diepe kopie; `default` wordt as-is teruggegeven."""
+        data = self.snapshot(path).data
+        return default if data is None else thaw(data)
+
+    def file_version(self, *paths: PathLike) -> int:
+        """Hoogste versie van de gegeven bestanden (monotoon: wijzigt bij elke wijziging)."""
+        return max((self.snapshot(p).version for p in paths), default=0)
+
+    # ---------- write API ----------
+    def write_text(self, path: PathLike, text: str) -> None:
+        """Atomic replace: schrijf naar tmp in dezelfde map, fsync, os.replace."""
+        key = self._key(path)
+        folder = os.path.dirname(key)
+        os.makedirs(folder, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(key) + ".", suffix=".tmp", dir=folder)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Windows: os.replace faalt kort als een andere process het doelbestand open heeft
+            for attempt in range(10):
+                try:
+                    os.replace(tmp, key)
+                    break
+                except PermissionError:
+                    if attempt == 9:
+                        raise
+                    time.sleep(0.02 * (attempt + 1))
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+        self.invalidate(key)
+
+    def write_json(self, path: PathLike, data: Any, *, indent: Optional[int] = 2, ensure_ascii: bool = False) -> None:
+        self.write_text(path, json.dumps(data, indent=indent, ensure_ascii=ensure_ascii))
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Forceer een stat bij de volgende read (eigen writes zijn zo meteen zichtbaar)."""
+        with self._lock:
+            if path is None:
+                for e in self._entries.values():
+                    e.checked_at = float("-inf")
+                return
+            e = self._entries.get(self._key(path))
+            if e is not None:
+                e.checked_at = float("-inf")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self._entries),
+            "version": self._version,
+            "check_interval": self.check_interval,
+            "hits": self.hits,
+            "stats": self.stats_calls,
+            "reloads": self.reloads,
+        }
+
+
+# =========================
+# Default store (1 per process)
+# =========================
+def _env_interval() -> float:
+    try:
+        return max(0.0, float(os.environ.get("CYNIT_CONFIG_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL)))
+    except Exception:
+        return DEFAULT_CHECK_INTERVAL
+
+
+CONFIG_STORE = ConfigStore(check_interval=_env_interval())
+
+
+def configure(*, check_interval: Optional[float] = None) -> None:
+    if check_interval is not None:
+        CONFIG_STORE.check_interval = max(0.0, float(check_interval))
+
+
+def read_json(path: PathLike, default: Any = None) -> Any:
+    return CONFIG_STORE.read(path, default)
+
+
+def read_json_copy(path: PathLike, default: Any = None) -> Any:
+    return CONFIG_STORE.read_copy(path, default)
+
+
+def write_json(path: PathLike, data: Any, *, indent: Optional[int] = 2, ensure_ascii: bool = False) -> None:
+    CONFIG_STORE.write_json(path, data, indent=indent, ensure_ascii=ensure_ascii)
+
+
+def config_version(*paths: PathLike) -> int:
+    return CONFIG_STORE.file_version(*paths)
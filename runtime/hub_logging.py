@@ -4,9 +4,10 @@
 runtime/hub_logging.py — centrale logging voor CyNiT-Hub
 
 - logs/ folder auto-aanmaken
-- 4 vaste logfiles: hub.log, errors.log, requests.log, clicks.log
+- 5 vaste logfiles: hub.log, errors.log, requests.log, clicks.log, slow.log (stack samples van trage requests)
 - per tool: logs/tools/<toolid>.log (1 per tool)
 - rotatie: dagelijks + 7 dagen bewaren
+- non-blocking: request threads enqueuen enkel, één writer thread schrijft (runtime/log_pipeline.py)
 """
 
 from __future__ import annotations
@@ -16,7 +17,9 @@ import re
 from dataclasses import dataclass
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, Optional
+
+from runtime.log_pipeline import Destination, LogWriter, QueueRouterHandler, RouteTable
 
 _TOOL_SAFE = re.compile(r"[^a-zA-Z0-9._-]+")
 
@@ -49,9 +52,16 @@ class HubLoggers:
     errors: logging.Logger
     requests: logging.Logger
     clicks: logging.Logger
+    writer: Optional[LogWriter] = None
 
 
-def setup_logging(base_dir: Path, tool_ids: Iterable[str]) -> HubLoggers:
+def setup_logging(
+    base_dir: Path,
+    tool_ids: Iterable[str],
+    *,
+    queue_size: int = 10000,
+    flush_interval: float = 0.5,
+) -> HubLoggers:
     logs_dir = base_dir / "logs"
     tools_dir = logs_dir / "tools"
     logs_dir.mkdir(parents=True, exist_ok=True)
@@ -60,6 +70,7 @@ def setup_logging(base_dir: Path, tool_ids: Iterable[str]) -> HubLoggers:
     fmt_main = "%(asctime)s %(levelname)s:%(name)s:%(message)s"
     fmt_req = "%(asctime)s %(levelname)s:%(message)s"
     fmt_click = "%(asctime)s %(levelname)s:%(message)s"
+    fmt_slow = "%(asctime)s %(levelname)s:%(message)s"
 
     root = logging.getLogger()
 
@@ -70,6 +81,7 @@ def setup_logging(base_dir: Path, tool_ids: Iterable[str]) -> HubLoggers:
             errors=logging.getLogger("hub.errors"),
             requests=logging.getLogger("hub.requests"),
             clicks=logging.getLogger("hub.clicks"),
+            writer=getattr(root, "_cynit_writer", None),
         )
 
     # Remove any existing handlers (basicConfig leftovers)
@@ -79,22 +91,60 @@ def setup_logging(base_dir: Path, tool_ids: Iterable[str]) -> HubLoggers:
     # ✅ “alles loggen”
     root.setLevel(logging.DEBUG)
 
-    # Root handlers -> hub.log + errors.log
-    hub_handler = _make_daily_handler(logs_dir / "hub.log", logging.DEBUG, fmt_main, keep_days=7)
-    err_handler = _make_daily_handler(logs_dir / "errors.log", logging.ERROR, fmt_main, keep_days=7)
-    root.addHandler(hub_handler)
-    root.addHandler(err_handler)
+    # Bestemmingen (enkel de writer thread schrijft erin)
+    hub_dest = Destination("hub.log", _make_daily_handler(logs_dir / "hub.log", logging.DEBUG, fmt_main), logging.DEBUG)
+    err_dest = Destination("errors.log", _make_daily_handler(logs_dir / "errors.log", logging.ERROR, fmt_main), logging.ERROR)
+    req_dest = Destination("requests.log", _make_daily_handler(logs_dir / "requests.log", logging.INFO, fmt_req), logging.INFO)
+    click_dest = Destination("clicks.log", _make_daily_handler(logs_dir / "clicks.log", logging.INFO, fmt_click), logging.INFO)
+    slow_dest = Destination("slow.log", _make_daily_handler(logs_dir / "slow.log", logging.INFO, fmt_slow), logging.INFO)
+
+    # Console (handig)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(fmt_main))
+    console_dest = Destination("console", console, logging.INFO)
+
+    # Per-tool bestanden, bereikbaar via alle gangbare logger-namen
+    tool_dests: Dict[str, Destination] = {}
+    for tid_raw in tool_ids:
+        if not tid_raw:
+            continue
+        tid_safe = _safe_tool_id(str(tid_raw))
+        tool_file = tools_dir / f"{tid_safe}.log"
+        dest = Destination(f"tools/{tid_safe}.log", _make_daily_handler(tool_file, logging.DEBUG, fmt_main), logging.DEBUG)
+        for lname in {
+            str(tid_raw),
+            tid_safe,
+            f"tools.{tid_raw}",
+            f"tools.{tid_safe}",
+            f"tool_{tid_safe}",
+        }:
+            tool_dests[lname] = dest  # tool logs gaan ook naar hub.log + errors.log (root)
+
+    routes = RouteTable(
+        root=(hub_dest, err_dest, console_dest),
+        exclusive={"hub.requests": (req_dest,), "hub.clicks": (click_dest,), "hub.slow": (slow_dest,)},
+        tools=tool_dests,
+    )
+    writer = LogWriter(routes, queue_size=queue_size, flush_interval=flush_interval)
+    writer.start()
+    qh = QueueRouterHandler(writer)
+    root.addHandler(qh)
 
     # Dedicated loggers (requests/clicks) -> apart bestand, geen propagate
     requests_log = logging.getLogger("hub.requests")
     requests_log.setLevel(logging.INFO)
     requests_log.propagate = False
-    requests_log.addHandler(_make_daily_handler(logs_dir / "requests.log", logging.INFO, fmt_req, keep_days=7))
+    requests_log.addHandler(qh)
 
     clicks_log = logging.getLogger("hub.clicks")
     clicks_log.setLevel(logging.INFO)
     clicks_log.propagate = False
-    clicks_log.addHandler(_make_daily_handler(logs_dir / "clicks.log", logging.INFO, fmt_click, keep_days=7))
+    clicks_log.addHandler(qh)
+
+    slow_log = logging.getLogger("hub.slow")
+    slow_log.setLevel(logging.INFO)
+    slow_log.propagate = False
+    slow_log.addHandler(qh)
 
     # Named loggers
     hub_log = logging.getLogger("hub")
@@ -105,36 +155,15 @@ def setup_logging(base_dir: Path, tool_ids: Iterable[str]) -> HubLoggers:
     errors_log.setLevel(logging.ERROR)
     errors_log.propagate = True
 
-    # Per-tool handlers (zelfde retentie)
-    for tid_raw in tool_ids:
-        if not tid_raw:
-            continue
-        tid_safe = _safe_tool_id(str(tid_raw))
-        tool_file = tools_dir / f"{tid_safe}.log"
-        tool_handler = _make_daily_handler(tool_file, logging.DEBUG, fmt_main, keep_days=7)
-
-        # hang handler aan mogelijke logger-namen
-        for lname in {
-            str(tid_raw),
-            tid_safe,
-            f"tools.{tid_raw}",
-            f"tools.{tid_safe}",
-            f"tool_{tid_safe}",
-        }:
-            lg = logging.getLogger(lname)
-            lg.setLevel(logging.DEBUG)
-            lg.addHandler(tool_handler)
-            lg.propagate = True  # ook in hub.log + errors.log
-
     # Werkzeug minder noisy maar nog steeds nuttig
     logging.getLogger("werkzeug").setLevel(logging.INFO)
 
-    # Console (handig)
-    console = logging.StreamHandler()
-    console.setLevel(logging.INFO)
-    console.setFormatter(logging.Formatter(fmt_main))
-    root.addHandler(console)
-
     setattr(root, "_cynit_configured", True)
-    hub_log.info("Logging initialized -> %s (keep_days=7) OK", str(logs_dir))
-    return HubLoggers(hub=hub_log, errors=errors_log, requests=requests_log, clicks=clicks_log)
+    setattr(root, "_cynit_writer", writer)
+    hub_log.info("Logging initialized -> %s (keep_days=7, async writer) OK", str(logs_dir))
+    return HubLoggers(hub=hub_log, errors=errors_log, requests=requests_log, clicks=clicks_log, writer=writer)
+
+
+def log_writer_stats() -> Optional[Dict[str, object]]:
+    writer = getattr(logging.getLogger(), "_cynit_writer", None)
+    return writer.stats() if writer is not None else None
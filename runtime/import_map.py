@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/import_map.py — import map + modulepreload voor lokaal gevendorde ES modules
+
+- scant de .js bestanden onder een paar static/ mappen (bv. vendor/tiptap) op import-specifiers
+  (import/export ... from "x", import "x", import("x")); statisch, geen JS parser nodig
+- een tool-specifieke resolve(spec) -> pad onder static/ (of None) vertaalt CDN-achtige
+  specifiers ("/@tiptap/core@^3.15.3?target=es2022") naar het lokale bestand
+- ModuleGraph: specifier -> bestand, bestand -> afhankelijkheden, onopgeloste specifiers
+- render_import_map(): <script type="importmap"> (exacte keys, dus ook mét ?target=...) naar de
+  gehashte /static URL + <link rel="modulepreload"> voor de transitieve sluiting van de entries
+- gevolg: elke specifier van hetzelfde pakket wijst naar één URL (één module-instantie) en de
+  browser haalt de hele boom parallel op i.p.v. waterval per import via de shims
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import os
+import posixpath
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+# import x from "a"; export * from "a"; import "a"; import("a")
+_IMPORT_RE = re.compile(r"""(?:\bfrom|\bimport)\s*\(?\s*["']([^"'\n]+)["']""")
+MODULE_EXTS = {".js", ".mjs"}
+
+
+def scan_imports(path: Path) -> List[str]:
+    """Unieke specifiers in bronvolgorde."""
+    try:
+        src = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    seen: Dict[str, None] = {}
+    for m in _IMPORT_RE.finditer(src):
+        seen.setdefault(m.group(1), None)
+    return list(seen)
+
+
+@dataclass
+class ModuleGraph:
+    imports: Dict[str, str] = field(default_factory=dict)     # specifier -> pad onder static/
+    deps: Dict[str, List[str]] = field(default_factory=dict)  # pad -> paden die het importeert
+    unresolved: Set[str] = field(default_factory=set)
+    build_ms: float = 0.0
+
+    def closure(self, entries: Iterable[str]) -> List[str]:
+        """Transitieve afhankelijkheden van entries, afhankelijkheden eerst (post-order DFS)."""
+        out: List[str] = []
+        seen: Set[str] = set()
+        for entry in entries:
+            if entry in seen or entry not in self.deps:
+                continue
+            seen.add(entry)
+            stack = [(entry, iter(self.deps.get(entry, ())))]
+            while stack:
+                node, it = stack[-1]
+                nxt = next(it, None)
+                if nxt is None:
+                    stack.pop()
+                    out.append(node)
+                elif nxt not in seen:
+                    seen.add(nxt)
+                    stack.append((nxt, iter(self.deps.get(nxt, ()))))
+        return out
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "modules": len(self.deps),
+            "specifiers": len(self.imports),
+            "unresolved": sorted(self.unresolved),
+            "build_ms": self.build_ms,
+        }
+
+
+def build_module_graph(
+    static_dir: Path,
+    roots: Iterable[str],
+    resolve: Callable[[str], Optional[str]],
+) -> ModuleGraph:
+    """roots = mappen onder static_dir ("vendor/tiptap"); resolve(spec) -> pad onder static_dir."""
+    t0 = time.perf_counter()
+    static_dir = Path(static_dir)
+    graph = ModuleGraph()
+    for root in roots:
+        base = static_dir / root
+        if not base.is_dir():
+            continue
+        for dirpath, dirs, files in os.walk(base):
+            dirs.sort()
+            for name in sorted(files):
+                p = Path(dirpath) / name
+                if p.suffix.lower() not in MODULE_EXTS:
+                    continue
+                rel = p.relative_to(static_dir).as_posix()
+                deps: List[str] = []
+                for spec in scan_imports(p):
+                    if spec.startswith("."):
+                        target: Optional[str] = posixpath.normpath(posixpath.join(posixpath.dirname(rel), spec))
+                        if not (static_dir / target).is_file():
+                            target = None
+                    else:
+                        target = resolve(spec)
+                        if target is not None:
+                            graph.imports[spec] = target
+                    if target is None:
+                        graph.unresolved.add(spec)
+                    elif target not in deps:
+                        deps.append(target)
+                graph.deps[rel] = deps
+    graph.build_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return graph
+
+
+def render_import_map(
+    graph: ModuleGraph,
+    url: Callable[[str], str],
+    *,
+    entries: Iterable[str] = (),
+    aliases: Iterable[str] = (),
+) -> str:
+    """
+    url(pad) -> publieke URL (url_for("static", ...) = gehasht als de static pipeline actief is).
+    aliases: extra static paden die als "/static/<pad>" key in de map komen (directe imports
+    vanuit de pagina-JS landen zo op dezelfde URL als de imports tussen vendor modules).
+    """
+    urls: Dict[str, str] = {}
+
+    def _u(rel: str) -> str:
+        u = urls.get(rel)
+        if u is None:
+            u = urls[rel] = url(rel)
+        return u
+
+    imports = {spec: _u(rel) for spec, rel in sorted(graph.imports.items())}
+    for rel in aliases:
+        if rel in graph.deps:
+            imports["/static/" + rel] = _u(rel)
+
+    # </script> kan niet in een specifier zitten, maar "<" toch escapen (JSON blijft geldig)
+    data = json.dumps({"imports": imports}, separators=(",", ":")).replace("<", "\\u003c")
+    parts = [f'<script type="importmap">{data}</script>']
+    for rel in graph.closure(entries):
+        parts.append(f'<link rel="modulepreload" href="{html.escape(_u(rel))}">')
+    return "\n".join(parts)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/lazy_tools.py — tools pas importeren bij de eerste request onder hun prefix
+
+- bij startup enkel een prefix-tabel (web_path + optionele lazy_prefixes uit tools.json)
+- WSGI-laag vóór Flask: eerste hit op /<prefix> -> import + register_web_routes(app)
+- daarna gaat alles rechtstreeks via de Flask url_map (pending tabel wordt leeg)
+- zware imports (yaml/pdfkit/reportlab/jwt/cryptography/PIL) vertragen de (re)start niet meer
+- thread-safe (dev server threaded én waitress): load() registreert onder een lock op een kopie
+  van de url_map en publiceert die pas daarna met één toewijzing; lopende requests houden hun
+  adapter op de oude map, nieuwe requests zien alle routes van de tool tegelijk
+- "setup finished" check enkel uit voor de laadthread (thread-local), niet via Flask's
+  gedeelde _got_first_request
+- dat vraagt twee ingrepen zonder publieke Flask-hook (url_map.add omleiden, app._check_setup_finished
+  wrappen); bij installatie eerst getest op een wegwerp-app -> werkt het niet (andere Flask/Werkzeug),
+  dan geen lazy loader en registreert master alles eager
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+from werkzeug.routing import Map
+
+
+@dataclass
+class LazyTool:
+    tool_id: str
+    module_name: str
+    web_path: str                # "/voica1" -> matcht /voica1 en /voica1/...
+    prefixes: Tuple[str, ...]    # lazy_prefixes uit tools.json: plain startswith ("/crelt@")
+    loaded: bool = False
+    load_ms: float = 0.0
+    error: str = ""
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def matches(self, path: str) -> bool:
+        wp = self.web_path
+        if wp and (path == wp or path.startswith(wp + "/")):
+            return True
+        return path.startswith(self.prefixes) if self.prefixes else False
+
+
+class LazyToolLoader:
+    """
+    WSGI middleware rond app.wsgi_app.
+
+    register(app, module_name) wordt opgeroepen met Flask's "setup finished"
+    check uit voor deze thread: routes toevoegen na de eerste request is anders niet toegelaten.
+    """
+
+    def __init__(self, app: Flask, register: Callable[[Flask, str], bool], hub_log: Any):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self._register = register
+        self._log = hub_log
+        self._setup_lock = threading.Lock()
+        self._local = threading.local()
+        self.tools: List[LazyTool] = []
+        self.pending: List[LazyTool] = []
+
+    def add(self, tool_id: str, module_name: str, web_path: str, prefixes: Tuple[str, ...] = ()) -> None:
+        web_path = web_path.rstrip("/")
+        prefixes = tuple(p for p in prefixes if p and p != "/")
+        t = LazyTool(tool_id=tool_id, module_name=module_name, web_path=web_path, prefixes=prefixes)
+        self.tools.append(t)
+        self.pending.append(t)
+
+    def _find(self, path: str) -> Optional[LazyTool]:
+        for t in self.pending:
+            if t.matches(path):
+                return t
+        return None
+
+    def load(self, tool: LazyTool) -> None:
+        with tool.lock:
+            if tool.loaded:
+                return
+            t0 = time.perf_counter()
+            with self._setup_lock:
+                app = self.app
+                staged, ok = _register_staged(app, self._local, lambda: self._register(app, tool.module_name))
+                # view_functions staan er al: pas nu wordt de nieuwe map zichtbaar
+                app.url_map = staged
+                tool.loaded = True
+                # nieuwe lijst i.p.v. remove(): lezers zonder lock zien altijd een consistente lijst
+                self.pending = [t for t in self.pending if t is not tool]
+            tool.load_ms = (time.perf_counter() - t0) * 1000
+            if not ok:
+                tool.error = "register failed (zie hub.log)"
+            self._log.info("Lazy tool loaded on first hit: %s (%.1fms)", tool.module_name, tool.load_ms)
+
+    def load_all(self) -> None:
+        for t in list(self.pending):
+            self.load(t)
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Any:
+        if self.pending:
+            tool = self._find(environ.get("PATH_INFO") or "/")
+            if tool is not None:
+                self.load(tool)
+        return self.wsgi_app(environ, start_response)
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": t.tool_id,
+                "module": t.module_name,
+                "web_path": t.web_path,
+                "prefixes": list(t.prefixes),
+                "loaded": t.loaded,
+                "load_ms": round(t.load_ms, 1),
+                "error": t.error,
+            }
+            for t in self.tools
+        ]
+
+
+def _clone_map(src: Map) -> Map:
+    """Ongebonden kopie van alle rules (een Rule hoort bij precies één Map)."""
+    dst = type(src)(
+        default_subdomain=src.default_subdomain,
+        strict_slashes=src.strict_slashes,
+        merge_slashes=src.merge_slashes,
+        redirect_defaults=src.redirect_defaults,
+        converters=src.converters,
+        sort_parameters=src.sort_parameters,
+        sort_key=src.sort_key,
+        host_matching=src.host_matching,
+    )
+    for rule in src.iter_rules():
+        fresh = rule.empty()
+        if hasattr(rule, "provide_automatic_options"):
+            # Flask zet dit na het aanmaken van de rule; empty() neemt het niet mee
+            fresh.provide_automatic_options = rule.provide_automatic_options  # type: ignore[attr-defined]
+        dst.add(fresh)
+    return dst
+
+
+def _allow_setup(app: Flask, local: threading.local) -> None:
+    """Flask's "setup finished" check overslaan zolang local.setup waar is (enkel die thread)."""
+    check = app._check_setup_finished  # type: ignore[attr-defined]
+
+    def _check(f_name: str) -> None:
+        if not getattr(local, "setup", False):
+            check(f_name)
+
+    app._check_setup_finished = _check  # type: ignore[attr-defined]
+
+
+def _register_staged(app: Flask, local: threading.local, register: Callable[[], Any]) -> Tuple[Map, Any]:
+    """register() uitvoeren met nieuwe rules in een kopie van de url_map; de caller publiceert ze."""
+    live = app.url_map
+    staged = _clone_map(live)
+    # Flask doet self.url_map.add(rule): enkel deze thread voegt toe (onder de lock van de caller)
+    live.add = staged.add  # type: ignore[method-assign]
+    local.setup = True
+    try:
+        result = register()
+    finally:
+        local.setup = False
+        del live.add
+    return staged, result
+
+
+def _hooks_work(app: Flask) -> bool:
+    """Werken url_map.add-omleiding + setup-check op deze Flask/Werkzeug? Test op een wegwerp-app."""
+    if not callable(getattr(app, "_check_setup_finished", None)) or not hasattr(app.url_map, "__dict__"):
+        return False
+    try:
+        probe = type(app)("cynit_lazy_probe")
+        local = threading.local()
+        _allow_setup(probe, local)
+        probe.test_client().get("/")  # na de eerste request, zoals bij een echte first hit
+        staged, _ = _register_staged(probe, local, lambda: probe.add_url_rule("/_probe", "probe", lambda: "ok"))
+        if any(r.endpoint == "probe" for r in probe.url_map.iter_rules()):
+            return False
+        probe.url_map = staged
+        return probe.test_client().get("/_probe").status_code == 200
+    except Exception:
+        return False
+
+
+def install_lazy_loader(app: Flask, register: Callable[[Flask, str], bool], hub_log: Any) -> Optional[LazyToolLoader]:
+    """None als deze Flask/Werkzeug de ingrepen niet toelaat: de caller registreert dan eager."""
+    if not _hooks_work(app):
+        hub_log.warning("Lazy tools niet ondersteund door deze Flask/Werkzeug -> eager")
+        return None
+    loader = LazyToolLoader(app, register, hub_log)
+    app.wsgi_app = loader  # type: ignore[method-assign]
+    _allow_setup(app, loader._local)
+    app.extensions["cynit_lazy_tools"] = loader
+    return loader
+
+
+def get_lazy_loader(app: Flask) -> Optional[LazyToolLoader]:
+    loader = app.extensions.get("cynit_lazy_tools")
+    return loader if isinstance(loader, LazyToolLoader) else None
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/live_stats.py — live procescijfers voor /beheer/system (Server-Sent Events, 1x per seconde)
+
+- LiveStats.sample(): CPU % (process_time delta), RSS, threads, open file descriptors,
+  requests/sec + in-flight + p95 over de laatste minuut (uit RequestMetrics), log queue diepte,
+  hit ratio van de config store en de state namespaces
+- requests/sec en p95 zijn deltas tussen opeenvolgende totaal-histogrammen (ring van 60 s):
+  niets extra op het request hot path
+- LiveFeed: één sampler thread die enkel draait zolang er minstens één SSE client luistert;
+  zonder kijkers geen thread, geen timers, geen kosten. Alle clients krijgen dezelfde sample
+- een stream stopt na max_stream_sec (de browser herverbindt vanzelf) zodat een vergeten tab
+  geen waitress worker thread blijft bezetten; max_clients begrenst het aantal streams:
+  try_subscribe() reserveert de plaats atomair in de view, de stream geeft ze vrij als hij eindigt
+- geen psutil nodig (wel gebruikt als het er is): /proc op Linux, anders velden op null
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from flask import Flask
+
+from runtime.config_store import CONFIG_STORE
+from runtime.hub_logging import log_writer_stats
+from runtime.memory_diag import rss
+from runtime.metrics import RequestMetrics, Series
+from runtime.state_store import state_counters
+
+DEFAULT_INTERVAL_MS = 1000
+DEFAULT_MAX_CLIENTS = 4
+DEFAULT_MAX_STREAM_SEC = 900
+WINDOW_SEC = 60.0
+RETRY_MS = 3000
+
+_EXT_KEY = "cynit_live"
+
+
+# =========================
+# Proces
+# =========================
+def open_fds() -> Optional[int]:
+    try:
+        import psutil
+
+        p = psutil.Process()
+        return p.num_fds() if hasattr(p, "num_fds") else p.num_handles()
+    except Exception:
+        pass
+    try:
+        return len(os.listdir("/proc/self/fd")) - 1  # min de fd van listdir zelf
+    except OSError:
+        return None
+
+
+def _cache_counters() -> Dict[str, Tuple[int, int]]:
+    """naam -> (hits, misses). Config store: een reload (nieuwe parse) telt als miss."""
+    out = {"config": (CONFIG_STORE.hits, CONFIG_STORE.reloads)}
+    try:
+        for ns, c in state_counters().items():
+            out[f"state:{ns}"] = (c["hits"], c["misses"])
+    except Exception:
+        pass
+    return out
+
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    n = hits + misses
+    return round(hits / n, 4) if n > 0 else None
+
+
+# =========================
+# Sampler
+# =========================
+class LiveStats:
+    """Houdt de vorige meting + een ring van 60 s bij; enkel aangeroepen door de LiveFeed thread."""
+
+    def __init__(self, metrics: Optional[RequestMetrics]):
+        self.metrics = metrics
+        self._prev: Optional[Tuple[float, float, int]] = None        # (monotonic, process_time, count)
+        self._window: Deque[Tuple[float, Series, Dict[str, Tuple[int, int]]]] = deque()
+
+    def reset(self) -> None:
+        # na een periode zonder kijkers is het venster niet meer aaneengesloten
+        self._prev = None
+        self._window.clear()
+
+    def sample(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        cpu = time.process_time()
+        total, in_flight = self.metrics.totals() if self.metrics is not None else (Series(), 0)
+        caches = _cache_counters()
+
+        cpu_pct = rps = None
+        if self._prev is not None:
+            dt = now - self._prev[0]
+            if dt > 0:
+                cpu_pct = round((cpu - self._prev[1]) / dt * 100, 1)
+                rps = round((total.count - self._prev[2]) / dt, 2)
+        self._prev = (now, cpu, total.count)
+
+        self._window.append((now, total.copy(), caches))
+        while len(self._window) > 2 and now - self._window[1][0] >= WINDOW_SEC:
+            self._window.popleft()
+        t_old, s_old, c_old = self._window[0]
+        win = total.delta(s_old)
+
+        lw = log_writer_stats() or {}
+        mem = rss()
+        return {
+            "ts": time.time(),
+            "cpu_pct": cpu_pct,
+            "rss_mb": None if mem.get("rss_mb") is None else round(float(mem["rss_mb"]), 1),
+            "threads": threading.active_count(),
+            "fds": open_fds(),
+            "rps": rps,
+            "in_flight": in_flight,
+            "window_sec": round(now - t_old),
+            "requests_window": win.count,
+            "p95_ms": round(win.quantile(0.95), 1) if win.count else None,
+            "log_queue": lw.get("queue_depth"),
+            "log_queue_size": lw.get("queue_size"),
+            "log_dropped": sum(int(v) for v in (lw.get("dropped") or {}).values()),
+            "caches": {
+                name: {
+                    "ratio": _ratio(h - c_old.get(name, (0, 0))[0], m - c_old.get(name, (0, 0))[1]),
+                    "ratio_total": _ratio(h, m),
+                    "lookups": h + m,
+                }
+                for name, (h, m) in caches.items()
+            },
+        }
+
+
+# =========================
+# Feed (SSE)
+# =========================
+class LiveFeed:
+    def __init__(
+        self,
+        stats: LiveStats,
+        *,
+        interval_ms: float = DEFAULT_INTERVAL_MS,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        max_stream_sec: float = DEFAULT_MAX_STREAM_SEC,
+    ):
+        self.stats = stats
+        self.interval = max(0.2, float(interval_ms) / 1000.0)
+        self.max_clients = max(1, int(max_clients))
+        self.max_stream_sec = max(10.0, float(max_stream_sec))
+        self._cond = threading.Condition()
+        self._clients = 0
+        self._seq = 0
+        self._latest: Optional[Dict[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def clients(self) -> int:
+        return self._clients
+
+    def full(self) -> bool:
+        return self._clients >= self.max_clients
+
+    def try_subscribe(self) -> bool:
+        """Plaats reserveren (False als max_clients bereikt); de body uit stream() geeft ze vrij."""
+        with self._cond:
+            if self._clients >= self.max_clients:
+                return False
+            self._clients += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cynit-live-stats", daemon=True)
+                self._thread.start()
+            return True
+
+    def _unsubscribe(self) -> None:
+        with self._cond:
+            self._clients -= 1
+
+    def _run(self) -> None:
+        self.stats.reset()
+        next_at = time.monotonic()
+        while True:
+            with self._cond:
+                if self._clients <= 0:
+                    # laatste kijker weg: thread stopt, de volgende subscribe start een nieuwe
+                    self._thread = None
+                    self._latest = None
+                    return
+            try:
+                sample: Optional[Dict[str, Any]] = self.stats.sample()
+            except Exception:
+                sample = None
+            with self._cond:
+                if sample is not None:
+                    sample["clients"] = self._clients
+                    self._latest = sample
+                    self._seq += 1
+                self._cond.notify_all()
+            next_at += self.interval
+            time.sleep(max(0.0, next_at - time.monotonic()))
+            if time.monotonic() - next_at > self.interval:
+                next_at = time.monotonic()  # achterstand (bv. suspend) niet inhalen
+
+    def stream(self) -> "_Stream":
+        """
+        SSE body voor een plaats uit try_subscribe(): 'data: {json}' per sample, ': ping' als er
+        even niets komt. De plaats komt vrij bij het einde van de stream of bij close(), ook als de
+        server hem sluit vóór de eerste chunk.
+        """
+        return _Stream(self)
+
+    def _events(self) -> Iterator[bytes]:
+        yield f"retry: {RETRY_MS}\n\n".encode("ascii")
+        seen = -1
+        end = time.monotonic() + self.max_stream_sec
+        while time.monotonic() < end:
+            with self._cond:
+                if self._seq == seen or self._latest is None:
+                    self._cond.wait(self.interval * 3)
+                seq, sample = self._seq, self._latest
+            if sample is None or seq == seen:
+                yield b": ping\n\n"
+                continue
+            seen = seq
+            yield b"data: " + json.dumps(sample, separators=(",", ":")).encode("utf-8") + b"\n\n"
+
+
+class _Stream:
+    """Iterable i.p.v. generator: close() vóór de eerste next() geeft de plaats toch vrij."""
+
+    def __init__(self, feed: LiveFeed):
+        self._feed = feed
+        self._released = False
+        self._events = feed._events()
+
+    def __iter__(self) -> "_Stream":
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            return next(self._events)
+        except BaseException:
+            # max_stream_sec bereikt of fout: plaats meteen vrij, niet pas bij close()
+            self._release()
+            raise
+
+    def close(self) -> None:
+        try:
+            self._events.close()
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        with self._feed._cond:
+            if self._released:
+                return
+            self._released = True
+        self._feed._unsubscribe()
+
+
+# =========================
+# Flask integratie
+# =========================
+def install_live_stats(
+    app: Flask, settings: Optional[Dict[str, Any]], metrics: Optional[RequestMetrics]
+) -> Optional[LiveFeed]:
+    """
+    hub_settings.json "live_stats": {"enabled": true, "interval_ms": 1000, "max_clients": 4,
+    "max_stream_sec": 900}. Idempotent; None als uitgeschakeld. Start zelf niets: de sampler
+    thread komt pas bij de eerste SSE client.
+    """
+    existing = app.extensions.get(_EXT_KEY)
+    if isinstance(existing, LiveFeed):
+        return existing
+    cfg = settings if isinstance(settings, dict) else {}
+    if not cfg.get("enabled", True):
+        return None
+    feed = LiveFeed(
+        LiveStats(metrics),
+        interval_ms=float(cfg.get("interval_ms", DEFAULT_INTERVAL_MS)),
+        max_clients=int(cfg.get("max_clients", DEFAULT_MAX_CLIENTS)),
+        max_stream_sec=float(cfg.get("max_stream_sec", DEFAULT_MAX_STREAM_SEC)),
+    )
+    app.extensions[_EXT_KEY] = feed
+    return feed
+
+
+def get_live_feed(app: Flask) -> Optional[LiveFeed]:
+    feed = app.extensions.get(_EXT_KEY)
+    return feed if isinstance(feed, LiveFeed) else None
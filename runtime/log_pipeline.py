@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/log_pipeline.py — non-blocking logging: request threads enqueue, één writer thread schrijft
+
+- QueueRouterHandler: enige handler op root + hub.requests + hub.clicks; emit() = put_nowait
+- routing: logger-naam -> bestemmingen (hub/errors/tool/requests/clicks/console),
+  1x berekend per naam en daarna uit een dict (geen handler-keten per record)
+- writer: wordt niet per record gewekt (dat kost de request thread een GIL-wissel), maar
+  draint de queue elke tick (of vroeger bij high-water); gebufferde writes per bestand,
+  flush elke flush_interval (of meteen bij ERROR), dagelijkse rotatie via TimedRotatingFileHandler
+- queue vol: < WARNING meteen droppen, >= WARNING kort wachten; alles geteld in stats()
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from logging.handlers import TimedRotatingFileHandler
+from typing import Any, Dict, List, Optional, Tuple
+
+# args die veilig later (op de writer thread) geformatteerd kunnen worden
+_SAFE_ARG_TYPES = (str, int, float, bool, type(None))
+
+_STOP = object()
+
+
+@dataclass
+class Destination:
+    """Eén outputbestand (of console) met eigen formatter en minimum level."""
+
+    name: str
+    handler: logging.StreamHandler
+    level: int = logging.DEBUG
+    dirty: bool = False
+    written: int = 0
+
+    def write(self, record: logging.LogRecord) -> None:
+        h = self.handler
+        if isinstance(h, TimedRotatingFileHandler):
+            if h.shouldRollover(record):
+                self.flush()
+                h.doRollover()
+            if h.stream is None:
+                h.stream = h._open()
+        h.stream.write(h.format(record) + h.terminator)
+        self.dirty = True
+        self.written += 1
+
+    def flush(self) -> None:
+        if self.dirty and self.handler.stream is not None:
+            try:
+                self.handler.stream.flush()
+            except Exception:
+                pass
+        self.dirty = False
+
+    def close(self) -> None:
+        self.flush()
+        try:
+            self.handler.close()
+        except Exception:
+            pass
+
+
+@dataclass
+class RouteTable:
+    """
+    logger-naam -> bestemmingen.
+    - exclusive: naam (of parent) met eigen bestand, geen propagate (hub.requests/hub.clicks)
+    - tools: alias (voica1, tools.voica1, tool_voica1, ...) -> tool-bestand
+    - root: bestemmingen voor alles wat propageert (hub.log, errors.log, console)
+    """
+
+    root: Tuple[Destination, ...] = ()
+    exclusive: Dict[str, Tuple[Destination, ...]] = field(default_factory=dict)
+    tools: Dict[str, Destination] = field(default_factory=dict)
+    _cache: Dict[str, Tuple[Destination, ...]] = field(default_factory=dict)
+
+    def route(self, name: str) -> Tuple[Destination, ...]:
+        dests = self._cache.get(name)
+        if dests is None:
+            dests = self._resolve(name)
+            self._cache[name] = dests
+        return dests
+
+    def _resolve(self, name: str) -> Tuple[Destination, ...]:
+        # zelfde semantiek als logger-hiërarchie: "tools.voica1.sub" valt onder "tools.voica1"
+        tool: Optional[Destination] = None
+        probe = name
+        while probe:
+            if probe in self.exclusive:
+                return self.exclusive[probe]
+            if tool is None and probe in self.tools:
+                tool = self.tools[probe]
+            probe = probe.rpartition(".")[0]
+        return self.root + ((tool,) if tool is not None else ())
+
+    def destinations(self) -> List[Destination]:
+        seen: Dict[int, Destination] = {}
+        for d in self.root:
+            seen[id(d)] = d
+        for ds in self.exclusive.values():
+            for d in ds:
+                seen[id(d)] = d
+        for d in self.tools.values():
+            seen[id(d)] = d
+        return list(seen.values())
+
+
+class LogWriter:
+    def __init__(self, routes: RouteTable, *, queue_size: int = 10000, flush_interval: float = 0.5,
+                 tick: float = 0.05, block_timeout: float = 0.05):
+        self.routes = routes
+        self.q: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.flush_interval = flush_interval
+        self.tick = min(tick, flush_interval)
+        self.block_timeout = block_timeout
+        self._high_water = max(1, queue_size // 2)
+        self._wake = threading.Event()
+
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.flushes = 0
+        self.max_depth = 0
+        self.dropped: Dict[str, int] = {}
+        self._dropped_reported = 0
+        self._drop_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="cynit-log-writer", daemon=True)
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    # ---------- producer (request threads) ----------
+    def put(self, record: logging.LogRecord) -> None:
+        try:
+            self.q.put_nowait(record)
+        except queue.Full:
+            self._wake.set()
+            if record.levelno < logging.WARNING:
+                self._drop(record)
+                return
+            try:
+                self.q.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self._drop(record)
+                return
+        self.enqueued += 1
+        if len(self.q.queue) >= self._high_water:
+            self._wake.set()
+
+    def _drop(self, record: logging.LogRecord) -> None:
+        with self._drop_lock:  # enkel op het (zeldzame) drop-pad
+            lvl = record.levelname
+            self.dropped[lvl] = self.dropped.get(lvl, 0) + 1
+
+    # ---------- consumer (writer thread) ----------
+    def _run(self) -> None:
+        q = self.q
+        last_flush = time.monotonic()
+        while True:
+            self._wake.wait(self.tick)
+            self._wake.clear()
+
+            n = 0
+            stop = False
+            urgent = False
+            while True:
+                try:
+                    rec = q.get_nowait()
+                except queue.Empty:
+                    break
+                if rec is _STOP:
+                    stop = True
+                    break
+                if n == 0:
+                    self.max_depth = max(self.max_depth, q.qsize() + 1)
+                n += 1
+                urgent = self._write(rec) or urgent
+            if n:
+                self.batches += 1
+
+            if urgent or stop or time.monotonic() - last_flush >= self.flush_interval:
+                self._report_drops()
+                self._flush_all()
+                last_flush = time.monotonic()
+            if stop:
+                self._stopped.set()
+                return
+
+    def _write(self, record: logging.LogRecord) -> bool:
+        for dest in self.routes.route(record.name):
+            if record.levelno >= dest.level:
+                try:
+                    dest.write(record)
+                except Exception:
+                    # nooit de writer laten sterven op één record
+                    pass
+        self.written += 1
+        return record.levelno >= logging.ERROR
+
+    def _report_drops(self) -> None:
+        total = sum(self.dropped.values())
+        if total > self._dropped_reported:
+            rec = logging.LogRecord(
+                "hub.logging", logging.WARNING, __file__, 0,
+                "Log queue full: %d records dropped (total %d, per level %s)",
+                (total - self._dropped_reported, total, dict(self.dropped)), None,
+            )
+            self._dropped_reported = total
+            self._write(rec)
+
+    def _flush_all(self) -> None:
+        for d in self.routes.destinations():
+            d.flush()
+        self.flushes += 1
+
+    # ---------- lifecycle ----------
+    def drain(self, timeout: float = 2.0) -> None:
+        """Wacht (begrensd) tot alles wat nu in de queue zit geschreven + geflusht is."""
+        if not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        self._wake.set()
+        while not self.q.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # writer flusht zelf na de laatste batch; nog één interval wachten is genoeg
+        time.sleep(min(self.flush_interval, max(0.0, deadline - time.monotonic())))
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if not self._thread.is_alive():
+            return
+        try:
+            self.q.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._wake.set()
+        self._stopped.wait(timeout)
+        for d in self.routes.destinations():
+            d.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.q.qsize(),
+            "queue_size": self.q.maxsize,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "flushes": self.flushes,
+            "dropped": dict(self.dropped),
+        }
+
+
+class QueueRouterHandler(logging.Handler):
+    """Enige handler op het request-pad: record klaarzetten en enqueuen, verder niets."""
+
+    def __init__(self, writer: LogWriter):
+        super().__init__(level=logging.DEBUG)
+        self.writer = writer
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # geen handler-lock nodig: Queue is thread-safe
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            args = record.args
+            if args and not (isinstance(args, tuple) and all(isinstance(a, _SAFE_ARG_TYPES) for a in args)):
+                # mutable/proxy args (bv. flask.request) nu renderen, niet op de writer thread
+                record.msg = record.getMessage()
+                record.args = None
+            self.writer.put(record)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.writer.drain()
+
+    def close(self) -> None:
+        self.writer.stop()
+        super().close()
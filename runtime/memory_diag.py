@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/memory_diag.py — geheugen-diagnose voor een hub die weken draait (tray watchdog)
+
+- rss(): huidige + piek RSS (psutil, anders /proc/self/status, anders ru_maxrss)
+- gc_info(): generatie-tellers, drempels, collecties per generatie, # getrackte objecten
+- type_sizes(): grootste objecttypes (aantal + shallow sys.getsizeof) over gc.get_objects()
+- module_stores(): grootste dict/list/set/deque globals per hub-module (tools/, runtime/, beheer/)
+  -> de module-level caches en stores zonder limiet vallen hier meteen op
+- tracemalloc: start/stop, benoemde snapshots (in geheugen, max MAX_SNAPSHOTS) en een diff
+  gegroepeerd op file:line; groei wordt toegewezen aan de eerste hub-module in de traceback
+  (tools/voica1.py, runtime/log_pipeline.py, ...) zodat library-allocaties bij hun aanroeper landen
+- alles on-demand (enkel als /beheer/system/memory geopend wordt); niets draait op de achtergrond
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+HUB_DIRS = ("tools", "runtime", "beheer")
+HUB_FILES = ("master.py",)
+
+MAX_SNAPSHOTS = 8
+DEFAULT_FRAMES = 10
+
+_lock = threading.Lock()
+_snapshots: "OrderedDict[str, Tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+
+
+# =========================
+# RSS / GC / types
+# =========================
+def rss() -> Dict[str, Optional[float]]:
+    """{"rss_mb", "peak_mb", "source"} — best effort, zonder psutil ook op Linux."""
+    try:
+        import psutil
+
+        mi = psutil.Process().memory_info()
+        peak = getattr(mi, "peak_wset", None)  # Windows
+        return {"rss_mb": mi.rss / 1e6, "peak_mb": peak / 1e6 if peak else None, "source": "psutil"}
+    except Exception:
+        pass
+    try:
+        vals: Dict[str, float] = {}
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, kb = line.split(":", 1)
+                    vals[key] = int(kb.split()[0]) * 1024 / 1e6
+        return {"rss_mb": vals.get("VmRSS"), "peak_mb": vals.get("VmHWM"), "source": "/proc"}
+    except Exception:
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak / 1e6 if sys.platform == "darwin" else peak * 1024 / 1e6
+        return {"rss_mb": None, "peak_mb": peak_mb, "source": "getrusage"}
+    except Exception:
+        return {"rss_mb": None, "peak_mb": None, "source": "n/a"}
+
+
+def gc_info() -> Dict[str, Any]:
+    return {
+        "counts": gc.get_count(),
+        "thresholds": gc.get_threshold(),
+        "stats": gc.get_stats(),          # per generatie: collections, collected, uncollectable
+        "tracked": len(gc.get_objects()),
+        "garbage": len(gc.garbage),
+        "enabled": gc.isenabled(),
+    }
+
+
+def collect() -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    before = rss().get("rss_mb")
+    freed = gc.collect()
+    return {"collected": freed, "ms": round((time.perf_counter() - t0) * 1000, 1),
+            "rss_before_mb": before, "rss_after_mb": rss().get("rss_mb")}
+
+
+def type_sizes(limit: int = 25) -> Tuple[List[Tuple[str, int, int]], float]:
+    """([(type, aantal, shallow bytes)] gesorteerd op bytes, ms). Enkel gc-getrackte objecten."""
+    t0 = time.perf_counter()
+    counts: Dict[type, int] = {}
+    sizes: Dict[type, int] = {}
+    getsize = sys.getsizeof
+    for obj in gc.get_objects():
+        t = type(obj)
+        counts[t] = counts.get(t, 0) + 1
+        try:
+            sizes[t] = sizes.get(t, 0) + getsize(obj)
+        except Exception:
+            pass
+    rows = [(f"{t.__module__}.{t.__qualname__}" if t.__module__ != "builtins" else t.__qualname__, counts[t], sizes.get(t, 0))
+            for t in counts]
+    rows.sort(key=lambda r: -r[2])
+    return rows[:limit], (time.perf_counter() - t0) * 1000
+
+
+_CONTAINERS = (dict, list, set, frozenset, deque, OrderedDict)
+
+
+def _hub_module(filename: str) -> Optional[str]:
+    """'tools/voica1.py' als het bestand bij de hub hoort, anders None."""
+    try:
+        rel = os.path.relpath(filename, BASE_DIR).replace("\\", "/")
+    except ValueError:
+        return None
+    if rel.startswith(".."):
+        return None
+    if rel in HUB_FILES or rel.split("/", 1)[0] in HUB_DIRS:
+        return rel
+    return None
+
+
+def module_stores(limit: int = 25) -> List[Dict[str, Any]]:
+    """Grootste container-globals in hub-modules: (module, naam, type, len, shallow KB)."""
+    out: List[Dict[str, Any]] = []
+    for name, mod in list(sys.modules.items()):
+        fn = getattr(mod, "__file__", None)
+        if not fn or _hub_module(fn) is None:
+            continue
+        for attr, val in list(vars(mod).items()):
+            if attr.startswith("__") or not isinstance(val, _CONTAINERS):
+                continue
+            try:
+                n = len(val)
+                size = sys.getsizeof(val)
+                if isinstance(val, dict):
+                    size += sum(sys.getsizeof(v) for v in list(val.values())[:10000])
+                elif n:
+                    size += sum(sys.getsizeof(v) for v in list(val)[:10000])
+            except Exception:
+                continue
+            if n:
+                out.append({"module": name, "name": attr, "type": type(val).__name__, "len": n, "bytes": size})
+    out.sort(key=lambda r: -r["bytes"])
+    return out[:limit]
+
+
+# =========================
+# tracemalloc
+# =========================
+def tracemalloc_status() -> Dict[str, Any]:
+    if not tracemalloc.is_tracing():
+        return {"tracing": False, "snapshots": snapshot_names()}
+    cur, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": True,
+        "frames": tracemalloc.get_traceback_limit(),
+        "traced_mb": cur / 1e6,
+        "peak_mb": peak / 1e6,
+        "overhead_mb": tracemalloc.get_tracemalloc_memory() / 1e6,
+        "snapshots": snapshot_names(),
+    }
+
+
+def start_tracing(frames: int = DEFAULT_FRAMES) -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(max(1, min(50, int(frames))))
+
+
+def stop_tracing() -> None:
+    """Stopt tracing; bestaande snapshots blijven bruikbaar."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def take_snapshot(name: str) -> str:
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc staat niet aan")
+    name = (name or "").strip()[:40] or time.strftime("%H:%M:%S")
+    snap = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    with _lock:
+        _snapshots.pop(name, None)
+        _snapshots[name] = (time.time(), snap)
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return name
+
+
+def snapshot_names() -> List[Dict[str, Any]]:
+    with _lock:
+        return [{"name": n, "ts": ts, "traces": len(s.traces)} for n, (ts, s) in _snapshots.items()]
+
+
+def drop_snapshots() -> None:
+    with _lock:
+        _snapshots.clear()
+
+
+@dataclass
+class DiffRow:
+    where: str          # file:line
+    owner: str          # hub-module die de allocatie veroorzaakte ("-" = buiten de hub)
+    size_diff: int
+    size: int
+    count_diff: int
+
+
+def _owner(tb: tracemalloc.Traceback) -> str:
+    # frames: oudste eerst -> van achter naar voor = dichtst bij de allocatie
+    for frame in reversed(tb):
+        mod = _hub_module(frame.filename)
+        if mod is not None:
+            return mod
+    return "-"
+
+
+def _where(frame: tracemalloc.Frame) -> str:
+    mod = _hub_module(frame.filename)
+    if mod is not None:
+        return f"{mod}:{frame.lineno}"
+    fn = frame.filename.replace("\\", "/")
+    for marker in ("/site-packages/", "/dist-packages/", "/lib/python"):
+        i = fn.find(marker)
+        if i >= 0:
+            fn = fn[i + len(marker):]
+            break
+    return f"{fn}:{frame.lineno}"
+
+
+def diff(old_name: str, new_name: str, limit: int = 30) -> Dict[str, Any]:
+    """Groei tussen twee snapshots: top file:line + totaal per hub-module."""
+    with _lock:
+        old = _snapshots.get(old_name)
+        new = _snapshots.get(new_name)
+    if old is None or new is None:
+        raise KeyError("snapshot niet gevonden")
+    t0 = time.perf_counter()
+    stats = new[1].compare_to(old[1], "traceback")
+    # per allocatie-plaats (file:line van de allocatie zelf) + eigenaar uit de traceback
+    rows: Dict[Tuple[str, str], DiffRow] = {}
+    owners: Dict[str, List[int]] = {}
+    for st in stats:
+        if not st.size_diff and not st.count_diff:
+            continue
+        tb = st.traceback
+        where = _where(tb[-1]) if len(tb) else "?"
+        owner = _owner(tb)
+        row = rows.get((where, owner))
+        if row is None:
+            rows[(where, owner)] = DiffRow(where, owner, st.size_diff, st.size, st.count_diff)
+        else:
+            row.size_diff += st.size_diff
+            row.size += st.size
+            row.count_diff += st.count_diff
+        agg = owners.setdefault(owner, [0, 0])
+        agg[0] += st.size_diff
+        agg[1] += st.count_diff
+    top = sorted(rows.values(), key=lambda r: -r.size_diff)[:limit]
+    by_owner = sorted(
+        ({"owner": k, "size_diff": v[0], "count_diff": v[1]} for k, v in owners.items()),
+        key=lambda r: -r["size_diff"],
+    )
+    return {
+        "old": old_name,
+        "new": new_name,
+        "seconds": round(new[0] - old[0], 1),
+        "total_diff": sum(r.size_diff for r in rows.values()),
+        "top": top,
+        "owners": by_owner[:limit],
+        "ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
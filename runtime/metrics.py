@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/metrics.py — in-process request metrics (Prometheus text + JSON)
+
+- latency histogrammen per endpoint en per tool id (log-lineaire buckets: 1..9 x 10^k ms)
+- request counters per status-klasse, in-flight gauge, response-size summary
+- lock-vrij op het hot path: elke thread schrijft in een eigen shard,
+  /_metrics telt de shards op
+- shards van gestopte threads worden in één aggregaat (onder lock) gevouwen: onder waitress
+  (vaste pool) gebeurt dat zelden, onder de dev server (1 thread per request) bij elke nieuwe
+  thread en elke scrape -> #shards blijft begrensd door het aantal levende threads
+- werkt via Flask hooks -> zelfde gedrag onder master.main en wsgi_prod/waitress
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, Response, jsonify, request
+
+# bucket-grenzen in ms: 0.1..0.9, 1..9, 10..90, ... 10000..90000, daarna +Inf
+BUCKETS_MS: Tuple[float, ...] = tuple(
+    round(m * 10.0 ** e, 6) for e in range(-1, 5) for m in range(1, 10)
+)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+_EXT_KEY = "cynit_metrics"
+
+
+@dataclass
+class Series:
+    """Histogram + counters van één endpoint/tool; ook publiek via RequestMetrics.totals() (live paneel)."""
+
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    count: int = 0
+    sum_ms: float = 0.0
+    status: List[int] = field(default_factory=lambda: [0] * len(STATUS_CLASSES))
+    size_count: int = 0
+    size_sum: int = 0
+    size_max: int = 0
+
+    def observe(self, ms: float, status: int, size: Optional[int]) -> None:
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        sc = status // 100 - 1
+        if 0 <= sc < len(STATUS_CLASSES):
+            self.status[sc] += 1
+        if size is not None:
+            self.size_count += 1
+            self.size_sum += size
+            if size > self.size_max:
+                self.size_max = size
+
+    def merge(self, other: "Series") -> None:
+        for i, v in enumerate(other.buckets):
+            self.buckets[i] += v
+        for i, v in enumerate(other.status):
+            self.status[i] += v
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.size_count += other.size_count
+        self.size_sum += other.size_sum
+        self.size_max = max(self.size_max, other.size_max)
+
+    def copy(self) -> "Series":
+        c = Series()
+        c.merge(self)
+        return c
+
+    def delta(self, older: "Series") -> "Series":
+        """Verschil met een eerdere kopie (venster-histogram, bv. p95 over de laatste minuut)."""
+        d = Series()
+        d.buckets = [a - b for a, b in zip(self.buckets, older.buckets)]
+        d.status = [a - b for a, b in zip(self.status, older.status)]
+        d.count = self.count - older.count
+        d.sum_ms = self.sum_ms - older.sum_ms
+        return d
+
+    def quantile(self, q: float) -> float:
+        """Schatting (ms) via lineaire interpolatie binnen de bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lo = BUCKETS_MS[i - 1] if i > 0 else 0.0
+                hi = BUCKETS_MS[i] if i < len(BUCKETS_MS) else BUCKETS_MS[-1]
+                return lo + (hi - lo) * ((rank - seen) / n)
+            seen += n
+        return BUCKETS_MS[-1]
+
+
+class _Shard:
+    """Alles wat één thread schrijft; enkel die thread muteert."""
+
+    def __init__(self, thread: Optional[threading.Thread] = None) -> None:
+        self.thread = thread
+        self.endpoints: Dict[str, Series] = {}
+        self.tools: Dict[str, Series] = {}
+        self.in_flight = 0
+
+    def fold(self, other: "_Shard") -> None:
+        for src, dst in ((other.endpoints, self.endpoints), (other.tools, self.tools)):
+            for key, series in list(src.items()):
+                dst.setdefault(key, Series()).merge(series)
+        self.in_flight += other.in_flight
+
+
+class RequestMetrics:
+    def __init__(self, tool_of: Callable[[str], str]):
+        self._tool_of = tool_of
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._retired = _Shard()  # som van de shards van gestopte threads (enkel onder _shards_lock)
+        self._shards_lock = threading.Lock()
+        self.started = time.time()
+        # extra bronnen (bv. compressie): naam -> (snapshot(), prometheus regels())
+        self._collectors: Dict[str, Tuple[Callable[[], Dict[str, Any]], Optional[Callable[[], List[str]]]]] = {}
+
+    def add_collector(
+        self,
+        name: str,
+        snapshot: Callable[[], Dict[str, Any]],
+        prometheus: Optional[Callable[[], List[str]]] = None,
+    ) -> None:
+        self._collectors[name] = (snapshot, prometheus)
+
+    def _shard(self) -> _Shard:
+        sh = getattr(self._local, "shard", None)
+        if sh is None:
+            sh = _Shard(threading.current_thread())
+            self._local.shard = sh
+            with self._shards_lock:  # 1x per thread
+                self._prune()
+                self._shards.append(sh)
+        return sh
+
+    def _prune(self) -> None:
+        """Onder _shards_lock: shards van gestopte threads in _retired vouwen (die schrijven niet meer)."""
+        live: List[_Shard] = []
+        for sh in self._shards:
+            if sh.thread is not None and not sh.thread.is_alive():
+                self._retired.fold(sh)
+            else:
+                live.append(sh)
+        self._shards = live
+
+    def _collect(self) -> List[_Shard]:
+        """Levende shards + een kopie van het aggregaat van gestopte threads."""
+        with self._shards_lock:
+            self._prune()
+            retired = _Shard()
+            retired.fold(self._retired)
+            return self._shards + [retired]
+
+    # ---------- hot path ----------
+    def begin(self) -> None:
+        self._shard().in_flight += 1
+
+    def end(self) -> None:
+        self._shard().in_flight -= 1
+
+    def observe(self, endpoint: str, path: str, ms: float, status: int, size: Optional[int]) -> None:
+        sh = self._shard()
+        s = sh.endpoints.get(endpoint)
+        if s is None:
+            s = sh.endpoints[endpoint] = Series()
+        s.observe(ms, status, size)
+
+        tool = self._tool_of(path) or "hub"
+        t = sh.tools.get(tool)
+        if t is None:
+            t = sh.tools[tool] = Series()
+        t.observe(ms, status, size)
+
+    # ---------- scrape ----------
+    def _merged(self) -> Tuple[Dict[str, Series], Dict[str, Series], int]:
+        shards = self._collect()
+        endpoints: Dict[str, Series] = {}
+        tools: Dict[str, Series] = {}
+        in_flight = 0
+        for sh in shards:
+            in_flight += sh.in_flight
+            for src, dst in ((sh.endpoints, endpoints), (sh.tools, tools)):
+                for key, series in list(src.items()):
+                    dst.setdefault(key, Series()).merge(series)
+        return endpoints, tools, in_flight
+
+    def totals(self) -> Tuple[Series, int]:
+        """Alle requests samen (som over de tools) + in-flight; veel goedkoper dan snapshot()."""
+        shards = self._collect()
+        total = Series()
+        in_flight = 0
+        for sh in shards:
+            in_flight += sh.in_flight
+            for series in list(sh.tools.values()):
+                total.merge(series)
+        return total, in_flight
+
+    def snapshot(self) -> Dict[str, Any]:
+        endpoints, tools, in_flight = self._merged()
+
+        def pack(series: Dict[str, Series]) -> Dict[str, Any]:
+            return {
+                key: {
+                    "count": s.count,
+                    "sum_ms": round(s.sum_ms, 3),
+                    "avg_ms": round(s.sum_ms / s.count, 3) if s.count else 0.0,
+                    "p50_ms": round(s.quantile(0.50), 3),
+                    "p95_ms": round(s.quantile(0.95), 3),
+                    "p99_ms": round(s.quantile(0.99), 3),
+                    "status": dict(zip(STATUS_CLASSES, s.status)),
+                    "size": {"count": s.size_count, "sum": s.size_sum, "max": s.size_max},
+                }
+                for key, s in sorted(series.items())
+            }
+
+        return {
+            "uptime_sec": int(time.time() - self.started),
+            "in_flight": in_flight,
+            "threads": len(self._shards),
+            "endpoints": pack(endpoints),
+            "tools": pack(tools),
+            **{name: snap() for name, (snap, _) in self._collectors.items()},
+        }
+
+    def prometheus(self) -> str:
+        endpoints, tools, in_flight = self._merged()
+        out: List[str] = [
+            "# HELP cynit_http_in_flight Requests currently being handled.",
+            "# TYPE cynit_http_in_flight gauge",
+            f"cynit_http_in_flight {in_flight}",
+        ]
+        for kind, series in (("endpoint", endpoints), ("tool", tools)):
+            _prom_family(out, f"cynit_{kind}", kind, series)
+        for _, prom in self._collectors.values():
+            if prom is not None:
+                out.extend(prom())
+        return "\n".join(out) + "\n"
+
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _prom_family(out: List[str], prefix: str, label: str, series: Dict[str, Series]) -> None:
+    items = sorted(series.items())
+
+    out.append(f"# HELP {prefix}_requests_total Requests per {label} and status class.")
+    out.append(f"# TYPE {prefix}_requests_total counter")
+    for key, s in items:
+        for sc, n in zip(STATUS_CLASSES, s.status):
+            if n:
+                out.append(f'{prefix}_requests_total{{{label}="{_esc(key)}",status="{sc}"}} {n}')
+
+    out.append(f"# HELP {prefix}_request_duration_seconds Request latency per {label}.")
+    out.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+    for key, s in items:
+        lv = _esc(key)
+        cum = 0
+        for bound, n in zip(BUCKETS_MS, s.buckets):
+            cum += n
+            out.append(f'{prefix}_request_duration_seconds_bucket{{{label}="{lv}",le="{bound / 1000:g}"}} {cum}')
+        out.append(f'{prefix}_request_duration_seconds_bucket{{{label}="{lv}",le="+Inf"}} {s.count}')
+        out.append(f'{prefix}_request_duration_seconds_sum{{{label}="{lv}"}} {s.sum_ms / 1000:.6f}')
+        out.append(f'{prefix}_request_duration_seconds_count{{{label}="{lv}"}} {s.count}')
+
+    out.append(f"# HELP {prefix}_response_size_bytes Response body size per {label}.")
+    out.append(f"# TYPE {prefix}_response_size_bytes summary")
+    for key, s in items:
+        lv = _esc(key)
+        out.append(f'{prefix}_response_size_bytes_sum{{{label}="{lv}"}} {s.size_sum}')
+        out.append(f'{prefix}_response_size_bytes_count{{{label}="{lv}"}} {s.size_count}')
+
+
+# =========================
+# Flask integratie
+# =========================
+def install_metrics(app: Flask, tool_of: Callable[[str], str]) -> RequestMetrics:
+    """
+    Registreert de in-flight hooks + /_metrics.
+    observe() wordt opgeroepen vanuit de access-log after_request (die als laatste draait).
+    """
+    metrics = RequestMetrics(tool_of)
+    app.extensions[_EXT_KEY] = metrics
+
+    @app.before_request
+    def _metrics_begin():
+        metrics.begin()
+        request._cynit_in_flight = True  # type: ignore[attr-defined]
+
+    @app.teardown_request
+    def _metrics_end(exc: Optional[BaseException]):
+        if getattr(request, "_cynit_in_flight", False):
+            metrics.end()
+
+    @app.get("/_metrics")
+    def metrics_endpoint():
+        fmt = (request.args.get("format") or "").lower()
+        if fmt == "json" or (not fmt and request.accept_mimetypes.best == "application/json"):
+            resp = jsonify(metrics.snapshot())
+        else:
+            resp = Response(metrics.prometheus(), mimetype="text/plain")
+            resp.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
+    return metrics
+
+
+def get_metrics(app: Flask) -> Optional[RequestMetrics]:
+    return app.extensions.get(_EXT_KEY)
+
+
+def response_size(resp: Response) -> Optional[int]:
+    if resp.is_streamed:
+        return None
+    n = resp.content_length
+    if n is None:
+        try:
+            n = len(resp.get_data())
+        except Exception:
+            return None
+    return int(n)
+
+
+def top_endpoints(snapshot: Dict[str, Any], key: str = "endpoints", n: int = 12) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    rows = list((snapshot.get(key) or {}).items())
+    rows.sort(key=lambda kv: -float(kv[1].get("sum_ms", 0)))
+    return rows[:n]
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/profiler.py — opt-in profiler voor één request (collapsed stacks + flamegraph data)
+
+- aanzetten per request: ?_profile=1 (of =trace / =sample) of header X-CyNiT-Profile
+- enkel vanaf localhost (loopback) of IPs uit hub_settings "profiling.allow_ips"; anders wordt
+  de vlag genegeerd en loopt het request gewoon door. /beheer/system/profiles kan zelf een pad
+  profileren (intern request, dus ook loopback)
+- "trace" (deterministisch): sys.setprofile op de request thread, exacte self-tijd per stack,
+  ook C-calls (json.loads, re, os.scandir, ...)
+- "sample": achtergrondthread leest sys._current_frames() van de request thread elke ~1 ms;
+  weinig overhead, geschikt voor lange requests
+- WSGI-laag rond app.wsgi_app: ook compressie + body-iteratie (generators) zitten in het profiel;
+  de body van een geprofileerd request wordt gebufferd
+- opslag: runtime/profiles/<id>.json (route, tool, status, tijdstip, totale tijd, stacks) +
+  <id>.collapsed ("a;b;c <µs>", flamegraph.pl / speedscope); enkel de laatste `keep` blijven
+- response krijgt X-CyNiT-Profile: /beheer/system/profiles/<id>
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import json
+import os
+import re
+import sys
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, request
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_DIR = BASE_DIR / "runtime" / "profiles"
+DEFAULT_KEEP = 50
+DEFAULT_SAMPLE_INTERVAL_MS = 1.0
+MODES = ("trace", "sample")
+
+PROFILE_PARAM = "_profile"
+PROFILE_HEADER = "HTTP_X_CYNIT_PROFILE"
+_ENV_ROUTE = "cynit.profile.route"
+
+_ID_SAFE = re.compile(r"[^a-zA-Z0-9_-]+")
+_SITE = re.compile(r".*[\\/](?:site|dist)-packages[\\/]")
+
+
+# =========================
+# Frame labels
+# =========================
+# code object -> label; weak: code van herladen / lazy geladen modules blijft niet hangen
+_LABELS: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+# (module, qualname) -> label voor C-calls; nooit de callable zelf als key (d.get houdt d vast)
+_C_LABELS: Dict[Tuple[str, str], str] = {}
+_C_LABELS_MAX = 4096
+
+
+def _short_file(filename: str) -> str:
+    try:
+        rel = os.path.relpath(filename, BASE_DIR)
+        if not rel.startswith(".."):
+            return rel.replace("\\", "/")
+    except ValueError:  # andere schijf (Windows)
+        pass
+    m = _SITE.match(filename)
+    if m:
+        return filename[m.end():].replace("\\", "/")
+    return os.path.basename(filename)
+
+
+def frame_label(code: Any) -> str:
+    """'load_db (tools/useful_links.py:180)' — gecachet per code object."""
+    label = _LABELS.get(code)
+    if label is None:
+        label = f"{code.co_name} ({_short_file(code.co_filename)}:{code.co_firstlineno})"
+        _LABELS[code] = label
+    return label
+
+
+def _c_label(fn: Any) -> str:
+    mod = getattr(fn, "__module__", None) or type(getattr(fn, "__self__", None)).__name__
+    key = (str(mod), str(getattr(fn, "__qualname__", None) or getattr(fn, "__name__", "?")))
+    label = _C_LABELS.get(key)
+    if label is None:
+        label = f"{key[1]} [{key[0]}]"
+        if len(_C_LABELS) >= _C_LABELS_MAX:
+            _C_LABELS.clear()
+        _C_LABELS[key] = label
+    return label
+
+
+# =========================
+# Profilers
+# =========================
+class _Tracer:
+    """Deterministisch: exacte self-tijd per call stack (sys.setprofile, enkel deze thread)."""
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.frames: List[List[float]] = []   # [start, child_tijd]
+        self.stacks: Dict[str, float] = {}
+        self.calls = 0
+        self._clock = time.perf_counter
+
+    def _push(self, name: str) -> None:
+        self.names.append(name)
+        self.frames.append([self._clock(), 0.0])
+        self.calls += 1
+
+    def _pop(self) -> None:
+        if not self.frames:
+            return  # return van een frame dat al liep vóór de start
+        start, child = self.frames.pop()
+        elapsed = self._clock() - start
+        key = ";".join(self.names)
+        self.names.pop()
+        self.stacks[key] = self.stacks.get(key, 0.0) + (elapsed - child)
+        if self.frames:
+            self.frames[-1][1] += elapsed
+
+    def __call__(self, frame: Any, event: str, arg: Any) -> None:
+        if event == "call":
+            self._push(frame_label(frame.f_code))
+        elif event == "c_call":
+            self._push(_c_label(arg))
+        elif event in ("return", "c_return", "c_exception"):
+            self._pop()
+
+    def start(self) -> None:
+        sys.setprofile(self)
+
+    def stop(self) -> Dict[str, float]:
+        sys.setprofile(None)
+        while self.frames:  # niet afgesloten frames (zou niet mogen) toch meetellen
+            self._pop()
+        return self.stacks
+
+
+class _Sampler:
+    """Sampling: leest de stack van één thread met vaste interval (gewicht = echte tijd)."""
+
+    def __init__(self, thread_id: int, base_frame: Any, interval: float) -> None:
+        self.thread_id = thread_id
+        self.base = base_frame
+        self.interval = max(0.0002, interval)
+        self.stacks: Dict[str, float] = {}
+        self.calls = 0                       # = aantal samples
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cynit-profiler", daemon=True)
+
+    def _sample(self, dt: float) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        names: List[str] = []
+        while frame is not None and frame is not self.base:
+            names.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        if names:
+            key = ";".join(reversed(names))
+            self.stacks[key] = self.stacks.get(key, 0.0) + dt
+            self.calls += 1
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Dict[str, float]:
+        self._stop.set()
+        self._thread.join(1.0)
+        return self.stacks
+
+
+# =========================
+# Opslag
+# =========================
+@dataclass
+class Profile:
+    id: str
+    ts: float
+    method: str
+    path: str
+    route: str
+    tool: str
+    status: int
+    total_ms: float
+    mode: str
+    calls: int                                        # trace: calls, sample: samples
+    stacks: Dict[str, float] = field(default_factory=dict)   # collapsed stack -> µs
+
+    def summary(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d.pop("stacks")
+        return d
+
+
+def collapsed(stacks: Dict[str, float]) -> str:
+    """Brendan Gregg formaat: 'a;b;c <µs>' per regel."""
+    return "".join(f"{k} {int(v)}\n" for k, v in sorted(stacks.items()) if v >= 1)
+
+
+def top_functions(stacks: Dict[str, float], limit: int = 30) -> List[Tuple[str, float, float]]:
+    """[(frame, self µs, totaal µs)] — totaal telt een frame één keer per stack (recursie)."""
+    self_t: Dict[str, float] = {}
+    total_t: Dict[str, float] = {}
+    for key, us in stacks.items():
+        parts = key.split(";")
+        self_t[parts[-1]] = self_t.get(parts[-1], 0.0) + us
+        for name in set(parts):
+            total_t[name] = total_t.get(name, 0.0) + us
+    rows = [(n, self_t.get(n, 0.0), t) for n, t in total_t.items()]
+    rows.sort(key=lambda r: -r[1])
+    return rows[:limit]
+
+
+class ProfileStore:
+    def __init__(self, directory: Path, keep: int = DEFAULT_KEEP):
+        self.dir = Path(directory)
+        self.keep = max(1, int(keep))
+        self._lock = threading.Lock()
+
+    def save(self, p: Profile) -> None:
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            base = self.dir / p.id
+            tmp = base.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(asdict(p)), encoding="utf-8")
+            os.replace(tmp, base.with_suffix(".json"))
+            base.with_suffix(".collapsed").write_text(collapsed(p.stacks), encoding="utf-8")
+            for old in sorted(self.dir.glob("*.json"))[: -self.keep]:
+                old.unlink(missing_ok=True)
+                old.with_suffix(".collapsed").unlink(missing_ok=True)
+
+    def list(self, limit: int = 100) -> List[Dict[str, Any]]:
+        out = []
+        for f in sorted(self.dir.glob("*.json"), reverse=True)[:limit]:
+            p = self.load(f.stem)
+            if p is not None:
+                out.append(p.summary())
+        return out
+
+    def load(self, profile_id: str) -> Optional[Profile]:
+        if _ID_SAFE.search(profile_id or "x/"):
+            return None
+        try:
+            return Profile(**json.loads((self.dir / f"{profile_id}.json").read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def collapsed_path(self, profile_id: str) -> Optional[Path]:
+        if _ID_SAFE.search(profile_id or "x/"):
+            return None
+        p = self.dir / f"{profile_id}.collapsed"
+        return p if p.is_file() else None
+
+
+# =========================
+# WSGI middleware
+# =========================
+def _requested_mode(environ: Dict[str, Any]) -> Optional[str]:
+    raw = environ.get(PROFILE_HEADER)
+    if raw is None:
+        qs = environ.get("QUERY_STRING", "")
+        if PROFILE_PARAM not in qs:
+            return None
+        from urllib.parse import parse_qs
+
+        vals = parse_qs(qs, keep_blank_values=True).get(PROFILE_PARAM)
+        if not vals:
+            return None
+        raw = vals[0]
+    raw = (raw or "1").strip().lower()
+    if raw in ("0", "false", "off", "no"):
+        return None
+    return raw if raw in MODES else "trace"
+
+
+class ProfilerMiddleware:
+    def __init__(
+        self,
+        wsgi_app: Callable,
+        store: ProfileStore,
+        *,
+        tool_of: Callable[[str], str],
+        allow_ips: Iterable[str] = (),
+        sample_interval_ms: float = DEFAULT_SAMPLE_INTERVAL_MS,
+    ):
+        self.wsgi_app = wsgi_app
+        self.store = store
+        self.tool_of = tool_of
+        self.allow_ips = frozenset(str(ip).strip() for ip in allow_ips if str(ip).strip())
+        self.sample_interval = float(sample_interval_ms) / 1000.0
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+
+    def allowed(self, remote_addr: str) -> bool:
+        if remote_addr in self.allow_ips:
+            return True
+        try:
+            return ipaddress.ip_address(remote_addr).is_loopback
+        except ValueError:
+            return False
+
+    def _new_id(self, ts: float) -> str:
+        with self._seq_lock:
+            self._seq = (self._seq + 1) % 1000
+            seq = self._seq
+        return time.strftime("%Y%m%d-%H%M%S", time.localtime(ts)) + f"-{int(ts * 1000) % 1000:03d}{seq:03d}"
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        mode = _requested_mode(environ)
+        if mode is None or not self.allowed(str(environ.get("REMOTE_ADDR") or "")):
+            return self.wsgi_app(environ, start_response)
+        return self._profiled(environ, start_response, mode)
+
+    def _profiled(self, environ: Dict[str, Any], start_response: Callable, mode: str) -> List[bytes]:
+        ts = time.time()
+        pid = self._new_id(ts)
+        captured: Dict[str, Any] = {}
+
+        def _start(status: str, headers: List[Tuple[str, str]], exc_info: Any = None):
+            captured["status"], captured["headers"], captured["exc_info"] = status, headers, exc_info
+            return captured.setdefault("written", []).append
+
+        if mode == "sample":
+            prof: Any = _Sampler(threading.get_ident(), sys._getframe(), self.sample_interval)
+        else:
+            prof = _Tracer()
+        t0 = time.perf_counter()
+        prof.start()
+        try:
+            app_iter = self.wsgi_app(environ, _start)
+            try:
+                body = list(captured.get("written") or []) + [c for c in app_iter if c]
+            finally:
+                close = getattr(app_iter, "close", None)
+                if close is not None:
+                    close()
+        finally:
+            stacks = prof.stop()
+            total_ms = (time.perf_counter() - t0) * 1000
+
+        status = str(captured.get("status") or "500 INTERNAL SERVER ERROR")
+        path = str(environ.get("PATH_INFO") or "/")
+        profile = Profile(
+            id=pid,
+            ts=ts,
+            method=str(environ.get("REQUEST_METHOD") or "GET"),
+            path=path,
+            route=str(environ.get(_ENV_ROUTE) or "<unmatched>"),
+            tool=self.tool_of(path) or "hub",
+            status=int(status.split(" ", 1)[0] or 0),
+            total_ms=round(total_ms, 2),
+            mode=mode,
+            calls=prof.calls,
+            stacks={k: round(v * 1e6, 1) for k, v in stacks.items()},
+        )
+        try:
+            self.store.save(profile)
+            headers = list(captured.get("headers") or []) + [("X-CyNiT-Profile", f"/beheer/system/profiles/{pid}")]
+        except OSError:
+            headers = list(captured.get("headers") or [])
+        start_response(status, headers, captured.get("exc_info"))
+        return body
+
+
+# =========================
+# Flask integratie
+# =========================
+def install_profiler(
+    app: Flask, settings: Optional[Dict[str, Any]], tool_of: Callable[[str], str]
+) -> Optional[ProfilerMiddleware]:
+    """
+    hub_settings.json "profiling": {"enabled": true, "allow_ips": [], "dir": "runtime/profiles",
+    "keep": 50, "sample_interval_ms": 1}. Idempotent; None als profiling uit staat.
+    """
+    existing = app.extensions.get("cynit_profiler")
+    if isinstance(existing, ProfilerMiddleware):
+        return existing
+    cfg = settings if isinstance(settings, dict) else {}
+    if not cfg.get("enabled", True):
+        return None
+    directory = Path(cfg.get("dir") or DEFAULT_DIR)
+    if not directory.is_absolute():
+        directory = BASE_DIR / directory
+    allow = cfg.get("allow_ips")
+    mw = ProfilerMiddleware(
+        app.wsgi_app,
+        ProfileStore(directory, int(cfg.get("keep", DEFAULT_KEEP))),
+        tool_of=tool_of,
+        allow_ips=allow if isinstance(allow, list) else (),
+        sample_interval_ms=float(cfg.get("sample_interval_ms", DEFAULT_SAMPLE_INTERVAL_MS)),
+    )
+
+    # url rule voor het profiel (na ctx.pop is werkzeug.request al weg)
+    @app.teardown_request
+    def _profile_route(exc: Optional[BaseException]):
+        if request.url_rule is not None and (PROFILE_HEADER in request.environ or PROFILE_PARAM in request.args):
+            request.environ[_ENV_ROUTE] = request.url_rule.rule
+
+    app.wsgi_app = mw  # type: ignore[method-assign]
+    app.extensions["cynit_profiler"] = mw
+    return mw
+
+
+def get_profiler(app: Flask) -> Optional[ProfilerMiddleware]:
+    mw = app.extensions.get("cynit_profiler")
+    return mw if isinstance(mw, ProfilerMiddleware) else None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/route_index.py — pad -> (tool id, paginanaam) via een segment-trie
+
+- opgebouwd uit tools.json (web_path/id/name) + vaste hub-pagina's (home, beheer)
+- lookup = O(aantal segmenten): langste prefix wint, zoals de oude lineaire scan
+- query/fragment worden genegeerd ("/links?cat=x" -> useful_links)
+- index wordt enkel herbouwd als tools.json wijzigt (ConfigStore versie)
+- gebruikt door click logging, access logging, metrics en wsgi_prod page-switch logging
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from runtime.config_store import PathLike, config_version, read_json
+
+
+@dataclass(frozen=True)
+class RouteInfo:
+    tool_id: str      # "" = hub zelf (home, beheer, ...)
+    page_name: str
+
+
+@dataclass
+class _Node:
+    children: Dict[str, "_Node"] = field(default_factory=dict)
+    prefix: Optional[RouteInfo] = None  # geldt voor dit pad en alles eronder
+    exact: Optional[RouteInfo] = None   # enkel dit pad
+
+
+def _segments(path: str) -> Tuple[str, ...]:
+    p = (path or "/").split("?", 1)[0].split("#", 1)[0]
+    return tuple(s for s in p.split("/") if s)
+
+
+class RouteIndex:
+    def __init__(self, version: int = -1):
+        self.version = version
+        self.root = _Node()
+        self.size = 0
+
+    def add(self, path: str, info: RouteInfo, *, exact: bool = False) -> None:
+        node = self.root
+        for seg in _segments(path):
+            node = node.children.setdefault(seg, _Node())
+        if exact:
+            node.exact = info
+        else:
+            node.prefix = info
+        self.size += 1
+
+    def lookup(self, path: str) -> Optional[RouteInfo]:
+        node = self.root
+        best = node.prefix
+        segs = _segments(path)
+        for seg in segs:
+            nxt = node.children.get(seg)
+            if nxt is None:
+                return best
+            node = nxt
+            if node.prefix is not None:
+                best = node.prefix
+        return node.exact or best
+
+
+def build_route_index(
+    tools: Iterable[Any],
+    static_pages: Optional[Mapping[str, str]] = None,
+    version: int = -1,
+) -> RouteIndex:
+    """
+    static_pages: {pad: naam}; "/" is exact (anders zou home alles matchen),
+    andere paden gelden als prefix (/beheer/tools/... -> "Beheer · Tools").
+    Tools komen na de vaste pagina's: een tool op een beheer-pad wint.
+    """
+    idx = RouteIndex(version)
+    for path, name in (static_pages or {}).items():
+        idx.add(path, RouteInfo("", str(name)), exact=not _segments(path))
+
+    for t in tools:
+        if not isinstance(t, Mapping):
+            continue
+        wp = str(t.get("web_path") or "").strip()
+        if not wp:
+            continue
+        if not wp.startswith("/"):
+            wp = "/" + wp
+        tool_id = str(t.get("id") or wp.strip("/"))
+        idx.add(wp, RouteInfo(tool_id, str(t.get("name") or tool_id)))
+    return idx
+
+
+class RouteIndexCache:
+    """Index voor een tools.json; herbouwd bij een nieuwe config-versie (thread-safe)."""
+
+    def __init__(self, tools_json: PathLike, static_pages: Optional[Mapping[str, str]] = None):
+        self.tools_json = tools_json
+        self.static_pages: Dict[str, str] = dict(static_pages or {})
+        self._index = RouteIndex()
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def index(self) -> RouteIndex:
+        ver = config_version(self.tools_json)
+        idx = self._index
+        if idx.version == ver:
+            return idx
+        with self._lock:
+            if self._index.version != ver:
+                data = read_json(self.tools_json)
+                if isinstance(data, Mapping) and "tools" in data:
+                    data = data["tools"]
+                tools = data if isinstance(data, (list, tuple)) else ()
+                self._index = build_route_index(tools, self.static_pages, ver)
+                self.rebuilds += 1
+            return self._index
+
+    def lookup(self, path: str) -> Optional[RouteInfo]:
+        return self.index().lookup(path)
+
+    def tool_id(self, path: str) -> str:
+        info = self.lookup(path)
+        return info.tool_id if info is not None else ""
+
+    def page_name(self, path: str) -> str:
+        info = self.lookup(path)
+        return info.page_name if info is not None else (path or "/")
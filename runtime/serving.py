@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/serving.py — hoe master de app serveert: Werkzeug dev server of waitress (productie)
+
+- keuze via hub_settings.json -> "server": {"mode": "dev" | "waitress", ...}
+- waitress: threads, connection_limit, backlog, channel_timeout (= idle/keep-alive timeout)
+- waitress heeft geen TLS: enkel met "allow_plain_http": true (opt-in) wordt het http://host:port;
+  anders weigert master de productie-modus en blijft de dev server op https://localhost
+- lazy_tools: werkt onder beide servers, altijd multithreaded (laden is thread-safe, zie runtime/lazy_tools.py)
+- warmup: een paar GETs via de test client vóór het socket opengaat (home snapshot, layout shell)
+- runtime/hub_endpoint.json: welke URL er effectief geserveerd wordt (tray "Open Hub")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Mapping, Optional, Tuple
+
+from flask import Flask
+
+SERVER_MODES = ("dev", "waitress")
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    mode: str = "dev"
+    allow_plain_http: bool = False  # waitress = geen TLS: bewust kiezen voor http i.p.v. https
+    host: str = ""                 # "" = mode-default (dev+TLS: localhost, anders 127.0.0.1)
+    port: int = 5000
+    threads: int = 8
+    connection_limit: int = 100
+    backlog: int = 1024
+    channel_timeout: int = 30      # sec: inactieve (keep-alive) connecties sluiten
+    cleanup_interval: int = 10
+    preload: bool = True           # productie: templates precompilen (van de tools die al geladen zijn)
+    warmup_paths: Tuple[str, ...] = ("/",)
+
+    @classmethod
+    def from_settings(cls, hub: Mapping[str, Any]) -> "ServerConfig":
+        raw = hub.get("server")
+        if not isinstance(raw, Mapping):
+            return cls()
+
+        def _int(key: str, default: int, lo: int, hi: int) -> int:
+            try:
+                return max(lo, min(hi, int(raw.get(key, default))))
+            except (TypeError, ValueError):
+                return default
+
+        mode = str(raw.get("mode") or "dev").strip().lower()
+        if mode not in SERVER_MODES:
+            mode = "dev"
+        warm = raw.get("warmup_paths", cls.warmup_paths)
+        if not isinstance(warm, (list, tuple)):
+            warm = cls.warmup_paths
+
+        return cls(
+            mode=mode,
+            allow_plain_http=bool(raw.get("allow_plain_http", False)),
+            host=str(raw.get("host") or "").strip(),
+            port=_int("port", 5000, 1, 65535),
+            threads=_int("threads", 8, 1, 256),
+            connection_limit=_int("connection_limit", 100, 1, 10000),
+            backlog=_int("backlog", 1024, 1, 65535),
+            channel_timeout=_int("channel_timeout", 30, 1, 3600),
+            cleanup_interval=_int("cleanup_interval", 10, 1, 3600),
+            preload=bool(raw.get("preload", True)),
+            warmup_paths=tuple(str(p) for p in warm if isinstance(p, str) and p.startswith("/")),
+        )
+
+    @property
+    def production(self) -> bool:
+        return self.mode == "waitress"
+
+
+def warmup(app: Flask, paths: Tuple[str, ...], hub_log: Any) -> None:
+    """Eerste request-kosten (snapshots, templates, imports) vóór de eerste echte client."""
+    t0 = time.perf_counter()
+    client = app.test_client()
+    for p in paths:
+        try:
+            # buffered: body volledig renderen en de response sluiten (close() sluit o.a. het
+            # slow-request record af, zoals een echte server dat doet)
+            client.get(p, buffered=True)
+        except Exception:
+            hub_log.exception("Warmup GET %s failed", p)
+    hub_log.info("Warmup %s in %.1fms OK", list(paths), (time.perf_counter() - t0) * 1000)
+
+
+def write_endpoint_file(path: Path, url: str, mode: str) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"url": url, "mode": mode, "pid": os.getpid(), "ts": time.time()}, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def serve(
+    app: Flask,
+    cfg: ServerConfig,
+    hub_log: Any,
+    *,
+    ssl_ctx: Optional[Tuple[str, str]] = None,
+    endpoint_file: Optional[Path] = None,
+) -> None:
+    """Blokkeert tot de server stopt."""
+    if cfg.production and ssl_ctx and not cfg.allow_plain_http:
+        hub_log.warning("server.mode=waitress zonder TLS en allow_plain_http=false -> dev server (https)")
+    elif cfg.production:
+        try:
+            from waitress import serve as waitress_serve
+        except ImportError:
+            hub_log.warning("server.mode=waitress maar waitress is niet geïnstalleerd -> dev server")
+        else:
+            host = cfg.host or "127.0.0.1"
+            url = f"http://{host}:{cfg.port}"
+            if endpoint_file is not None:
+                write_endpoint_file(endpoint_file, url, "waitress")
+            hub_log.info("Serving via waitress on %s (%s) OK", url, asdict(cfg))
+            waitress_serve(
+                app,
+                host=host,
+                port=cfg.port,
+                threads=cfg.threads,
+                connection_limit=cfg.connection_limit,
+                backlog=cfg.backlog,
+                channel_timeout=cfg.channel_timeout,
+                cleanup_interval=cfg.cleanup_interval,
+                ident=str(app.config.get("FLASK_APP_NAME") or "CyNiT-Hub"),
+            )
+            return
+
+    if ssl_ctx:
+        host = cfg.host or "localhost"
+        url = f"https://{host}:{cfg.port}"
+    else:
+        host = cfg.host or "127.0.0.1"
+        url = f"http://{host}:{cfg.port}"
+    if endpoint_file is not None:
+        write_endpoint_file(endpoint_file, url, "dev")
+    hub_log.info("Serving via Werkzeug dev server on %s OK", url)
+    app.run(host=host, port=cfg.port, debug=False, ssl_context=ssl_ctx, threaded=True)
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/slow_requests.py — watchdog die de stack van trage requests samplet (altijd aan, goedkoop)
+
+- WSGI-laag: elk request registreert zich (thread id, start, pad) tot de body volledig verstuurd is
+- één watchdog thread: zolang geen request ouder is dan threshold_ms slaapt hij tot het eerste
+  request die grens zou halen (geen polling bij normaal verkeer); daarna sys._current_frames()
+  van enkel die threads, elke sample_interval_ms (default 50 ms = 20 Hz)
+- per traag request: collapsed stacks (gewicht = echte tijd tussen samples), route, tool id, status
+  -> logs/slow.log (één JSON per regel via de log writer) + de laatste `keep` in geheugen
+  (/beheer/system/slow, flamegraph zoals bij de profielen)
+- text/event-stream responses (live paneel /beheer/system) worden niet gevolgd
+- wsgi.file_wrapper bodies (send_file) gaan ongewijzigd door naar de server (sendfile fast path);
+  het request telt als afgelopen zodra de app ze teruggeeft
+- typische vangsten: requests.post zonder timeout (token2dcb), wkhtmltopdf (i18n export_pdf),
+  os.walk over een netwerkshare (tree_exporter)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from flask import Flask, request
+
+from runtime.profiler import frame_label
+
+DEFAULT_THRESHOLD_MS = 2000
+DEFAULT_SAMPLE_INTERVAL_MS = 50
+DEFAULT_KEEP = 50
+MAX_IDLE_WAIT = 5.0
+
+_ENV_ROUTE = "cynit.slow.route"
+
+
+@dataclass
+class _InFlight:
+    thread_id: int
+    start: float                                   # perf_counter
+    ts: float                                      # wall clock
+    method: str
+    path: str
+    base: Any = None                               # frame waarboven niet meer gesampled wordt
+    last_sample: float = 0.0
+    samples: int = 0
+    stacks: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class SlowRequest:
+    id: int
+    ts: float
+    method: str
+    path: str
+    route: str
+    tool: str
+    status: int
+    total_ms: float
+    samples: int
+    stacks: Dict[str, float]                       # collapsed stack -> µs
+
+    def summary(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d.pop("stacks")
+        return d
+
+
+class _Body:
+    """
+    Response body met afsluiten van het record: bij de laatste chunk, en anders in close().
+    Een klasse en geen generator: de finally van een generator loopt niet als de server hem
+    sluit vóór de eerste next(), close() hier wel -> geen record dat in _inflight blijft hangen.
+    """
+
+    __slots__ = ("_watchdog", "_app_iter", "_it", "_rec", "_environ", "_status")
+
+    def __init__(self, watchdog: "SlowRequestWatchdog", app_iter: Iterable[bytes], rec: _InFlight,
+                 environ: Dict[str, Any], status: Dict[str, str]):
+        self._watchdog = watchdog
+        self._app_iter = app_iter
+        self._it: Optional[Iterator[bytes]] = None
+        self._rec = rec
+        self._environ = environ
+        self._status = status
+
+    def __iter__(self) -> "_Body":
+        return self
+
+    def __next__(self) -> bytes:
+        # tijdens het itereren (gestreamde responses) is deze frame de basis
+        self._rec.base = sys._getframe()
+        if self._it is None:
+            self._it = iter(self._app_iter)
+        try:
+            return next(self._it)
+        except StopIteration:
+            # body volledig verstuurd: nu afsluiten, niet pas bij close() (sommige servers/clients doen dat laat)
+            self._done()
+            raise
+
+    def close(self) -> None:
+        try:
+            close = getattr(self._app_iter, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._done()
+
+    def _done(self) -> None:
+        self._watchdog._finish(self._rec, self._environ, self._status.get("status", "500"))
+
+
+class SlowRequestWatchdog:
+    def __init__(
+        self,
+        wsgi_app: Callable,
+        *,
+        tool_of: Callable[[str], str],
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        sample_interval_ms: float = DEFAULT_SAMPLE_INTERVAL_MS,
+        keep: int = DEFAULT_KEEP,
+        log: Optional[logging.Logger] = None,
+    ):
+        self.wsgi_app = wsgi_app
+        self.tool_of = tool_of
+        self.threshold = max(0.01, float(threshold_ms) / 1000.0)
+        self.interval = max(0.005, float(sample_interval_ms) / 1000.0)
+        self.log = log or logging.getLogger("hub.slow")
+        self._inflight: Dict[int, _InFlight] = {}          # id(record) -> record
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._recent: Deque[SlowRequest] = deque(maxlen=max(1, int(keep)))
+        self._seq = 0
+        self._counts = {"slow": 0, "samples": 0}
+        self._thread: Optional[threading.Thread] = None
+        self._deadline = 0.0                              # volgende geplande wake-up van de watchdog
+
+    # ---------- WSGI ----------
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        rec = _InFlight(
+            thread_id=threading.get_ident(),
+            start=time.perf_counter(),
+            ts=time.time(),
+            method=str(environ.get("REQUEST_METHOD") or "GET"),
+            path=str(environ.get("PATH_INFO") or "/"),
+            base=sys._getframe(),
+        )
+        with self._lock:
+            self._inflight[id(rec)] = rec
+        self._ensure_thread(rec.start + self.threshold)
+        status: Dict[str, str] = {}
+
+        def _start(st: str, headers: List[Any], exc_info: Any = None):
+            status["status"] = st
+            if any(k.lower() == "content-type" and v.startswith("text/event-stream") for k, v in headers):
+                # SSE (live paneel) loopt bewust lang: geen traag request
+                with self._lock:
+                    self._inflight.pop(id(rec), None)
+            return start_response(st, headers, exc_info)
+
+        try:
+            app_iter = self.wsgi_app(environ, _start)
+        except BaseException:
+            self._finish(rec, environ, "500")
+            raise
+        file_wrapper = environ.get("wsgi.file_wrapper")
+        if isinstance(file_wrapper, type) and isinstance(app_iter, file_wrapper):
+            # send_file: de server stuurt het bestand zelf (waitress ReadOnlyFileBasedBuffer,
+            # sendfile); niet omwikkelen, anders valt die fast path weg. Geen Python-code meer te samplen
+            self._finish(rec, environ, status.get("status", "500"))
+            return app_iter
+        return _Body(self, app_iter, rec, environ, status)
+
+    def _finish(self, rec: _InFlight, environ: Dict[str, Any], status: str) -> None:
+        with self._lock:
+            if self._inflight.pop(id(rec), None) is None:
+                return  # al afgesloten
+            samples, stacks = rec.samples, dict(rec.stacks)
+        rec.base = None  # frame-referentie loslaten (cyclus frame <-> record)
+        total = time.perf_counter() - rec.start
+        if total < self.threshold or not samples:
+            return
+        with self._lock:
+            self._seq += 1
+            self._counts["slow"] += 1
+            seq = self._seq
+        slow = SlowRequest(
+            id=seq,
+            ts=rec.ts,
+            method=rec.method,
+            path=rec.path,
+            route=str(environ.get(_ENV_ROUTE) or "<unmatched>"),
+            tool=self.tool_of(rec.path) or "hub",
+            status=int(str(status).split(" ", 1)[0] or 0),
+            total_ms=round(total * 1000, 1),
+            samples=samples,
+            stacks={k: round(v * 1e6, 1) for k, v in stacks.items()},
+        )
+        self._recent.append(slow)
+        try:
+            self.log.info("SLOW %s", json.dumps(asdict(slow), ensure_ascii=False))
+        except Exception:
+            pass
+
+    # ---------- watchdog thread ----------
+    def _ensure_thread(self, crosses_at: float) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            # enkel wekken als dit request de drempel haalt vóór de geplande wake-up
+            if crosses_at < self._deadline:
+                self._wake.set()
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="cynit-slow-watchdog", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            # vóór het inlezen: een request dat tijdens deze ronde binnenkomt wekt de volgende wait
+            self._wake.clear()
+            self._deadline = float("inf")
+            now = time.perf_counter()
+            with self._lock:
+                recs = list(self._inflight.values())
+            slow = [r for r in recs if now - r.start >= self.threshold]
+            if slow:
+                self._sample(slow, now)
+                wait = self.interval
+            elif recs:
+                wait = min(MAX_IDLE_WAIT, self.threshold - (now - min(r.start for r in recs)))
+            else:
+                wait = MAX_IDLE_WAIT
+            self._deadline = time.perf_counter() + wait
+            self._wake.wait(max(0.001, wait))
+
+    def _sample(self, recs: List[_InFlight], now: float) -> None:
+        frames = sys._current_frames()
+        for rec in recs:
+            frame = frames.get(rec.thread_id)
+            names: List[str] = []
+            base = rec.base
+            while frame is not None and frame is not base:
+                names.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if not names:
+                continue
+            # eerste sample telt vanaf de drempel, daarna de echte tijd sinds de vorige
+            dt = now - (rec.last_sample or (rec.start + self.threshold))
+            key = ";".join(reversed(names))
+            with self._lock:
+                if id(rec) not in self._inflight:
+                    continue
+                rec.stacks[key] = rec.stacks.get(key, 0.0) + max(dt, 0.0)
+                rec.samples += 1
+                rec.last_sample = now
+                self._counts["samples"] += 1
+
+    # ---------- inzage ----------
+    def recent(self) -> List[SlowRequest]:
+        return list(reversed(self._recent))
+
+    def get(self, slow_id: int) -> Optional[SlowRequest]:
+        for s in self._recent:
+            if s.id == slow_id:
+                return s
+        return None
+
+    def in_flight(self) -> List[Dict[str, Any]]:
+        """Requests die nu al langer dan de drempel lopen."""
+        now = time.perf_counter()
+        with self._lock:
+            recs = list(self._inflight.values())
+        return [
+            {"method": r.method, "path": r.path, "tool": self.tool_of(r.path) or "hub",
+             "elapsed_ms": round((now - r.start) * 1000), "samples": r.samples}
+            for r in recs if now - r.start >= self.threshold
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {**counts, "threshold_ms": round(self.threshold * 1000), "sample_interval_ms": round(self.interval * 1000),
+                "slow_in_flight": len(self.in_flight())}
+
+    def prometheus_lines(self) -> List[str]:
+        s = self.stats()
+        return [
+            "# HELP cynit_slow_requests_total Requests slower than the watchdog threshold.",
+            "# TYPE cynit_slow_requests_total counter",
+            f"cynit_slow_requests_total {s['slow']}",
+            "# HELP cynit_slow_requests_in_flight Requests currently running past the threshold.",
+            "# TYPE cynit_slow_requests_in_flight gauge",
+            f"cynit_slow_requests_in_flight {s['slow_in_flight']}",
+        ]
+
+
+# =========================
+# Flask integratie
+# =========================
+def install_slow_watchdog(
+    app: Flask, settings: Optional[Dict[str, Any]], tool_of: Callable[[str], str]
+) -> Optional[SlowRequestWatchdog]:
+    """
+    hub_settings.json "slow_requests": {"enabled": true, "threshold_ms": 2000,
+    "sample_interval_ms": 50, "keep": 50}. Idempotent; None als uitgeschakeld.
+    """
+    existing = app.extensions.get("cynit_slow")
+    if isinstance(existing, SlowRequestWatchdog):
+        return existing
+    cfg = settings if isinstance(settings, dict) else {}
+    if not cfg.get("enabled", True):
+        return None
+    wd = SlowRequestWatchdog(
+        app.wsgi_app,
+        tool_of=tool_of,
+        threshold_ms=float(cfg.get("threshold_ms", DEFAULT_THRESHOLD_MS)),
+        sample_interval_ms=float(cfg.get("sample_interval_ms", DEFAULT_SAMPLE_INTERVAL_MS)),
+        keep=int(cfg.get("keep", DEFAULT_KEEP)),
+    )
+
+    # url rule bewaren voor de slow-log (na ctx.pop is het request object weg)
+    @app.teardown_request
+    def _slow_route(exc: Optional[BaseException]):
+        if request.url_rule is not None:
+            request.environ[_ENV_ROUTE] = request.url_rule.rule
+
+    app.wsgi_app = wd  # type: ignore[method-assign]
+    app.extensions["cynit_slow"] = wd
+    return wd
+
+
+def get_slow_watchdog(app: Flask) -> Optional[SlowRequestWatchdog]:
+    wd = app.extensions.get("cynit_slow")
+    return wd if isinstance(wd, SlowRequestWatchdog) else None
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/state_store.py — kortlevende tool-state (tokens, sessies, decode-resultaten) achter één API
+
+- StateNamespace: get/put/expire/delete per tool ("jwt_ui.tokens", "dcbapi.sessions", ...),
+  ook als mapping bruikbaar (ns[key] = value, ns.get(key), key in ns)
+- backends:
+  * "memory" (default): dict in dit proces, zoals de oude module-level dicts
+  * "sqlite": runtime/state.sqlite3 in WAL-mode, gedeeld door alle worker-processen
+    (download-link van worker A werkt ook op worker B); de hub zelf serveert (nog) als één
+    proces (runtime/serving.py), de backend is de voorwaarde voor een latere worker-modus
+- keuze via hub_settings.json -> "state": {"backend": "memory" | "sqlite", "path": "..."}
+  of env CYNIT_STATE_BACKEND / CYNIT_STATE_PATH (env wint; geërfd door geforkte workers)
+- waarden moeten JSON-serialiseerbaar zijn (sqlite bewaart JSON; memory checkt niet)
+- ttl in seconden (None = geen expiry); verlopen entries zijn onzichtbaar en worden lui
+  opgeruimd + periodiek door de ttl_cache sweeper
+- begrensd per namespace (NamespaceLimits: default_ttl, max_entries, max_bytes); memory = LRU,
+  sqlite = oudste eerst; state_stats() levert size/bytes/hits/misses/evictions voor /beheer/system,
+  state_counters() enkel hits/misses (live paneel)
+- None als waarde = "bestaat niet" (get() kan die twee niet onderscheiden)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from runtime.ttl_cache import TTLCache, register_sweep, start_sweeper
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_DB = BASE_DIR / "runtime" / "state.sqlite3"
+STATE_BACKENDS = ("memory", "sqlite")
+
+# elke N puts: verlopen entries opruimen + budget afdwingen (sqlite; memory doet dat per put)
+PURGE_EVERY = 256
+# achtergrond-sweep van verlopen entries (beide backends)
+SWEEP_INTERVAL_SEC = 60.0
+
+
+def _deadline(ttl: Optional[float]) -> Optional[float]:
+    return None if ttl is None else time.time() + max(0.0, float(ttl))
+
+
+# =========================
+# Limieten per namespace
+# =========================
+@dataclass(frozen=True)
+class NamespaceLimits:
+    default_ttl: Optional[float] = None   # sec; None = geen expiry
+    max_entries: int = 1000
+    max_bytes: Optional[int] = None       # benaderd (memory: approx_size, sqlite: JSON-lengte)
+
+
+DEFAULT_LIMITS = NamespaceLimits()
+_limits: Dict[str, NamespaceLimits] = {}
+
+
+def _limits_for(ns: str) -> NamespaceLimits:
+    return _limits.get(ns, DEFAULT_LIMITS)
+
+
+# =========================
+# Backends
+# =========================
+class StateBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def get(self, ns: str, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def put(self, ns: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, ns: str, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def expire(self, ns: str, key: str, ttl: Optional[float]) -> bool:
+        """Nieuwe ttl vanaf nu (None = nooit). False als de key niet (meer) bestaat."""
+
+    def purge(self) -> int:
+        """Verlopen entries verwijderen en budgetten afdwingen; geeft het aantal terug."""
+        return 0
+
+    @abstractmethod
+    def count(self, ns: Optional[str] = None) -> int:
+        ...
+
+    @abstractmethod
+    def stats(self, ns: str) -> Dict[str, Any]:
+        ...
+
+    def counters(self, ns: str) -> Dict[str, int]:
+        """Enkel hits/misses (zonder size/bytes te tellen) — goedkoop genoeg om elke seconde te lezen."""
+        s = self.stats(ns)
+        return {"hits": int(s.get("hits", 0)), "misses": int(s.get("misses", 0))}
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(StateBackend):
+    """Eén TTLCache (TTL + LRU binnen max_entries/max_bytes) per namespace."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._caches: Dict[str, TTLCache] = {}
+        self._lock = threading.Lock()
+
+    def _cache(self, ns: str) -> TTLCache:
+        c = self._caches.get(ns)
+        if c is None:
+            with self._lock:
+                c = self._caches.get(ns)
+                if c is None:
+                    lim = _limits_for(ns)
+                    c = TTLCache(ns, max_entries=lim.max_entries, max_bytes=lim.max_bytes,
+                                 default_ttl=lim.default_ttl)
+                    self._caches[ns] = c
+        return c
+
+    def get(self, ns: str, key: str) -> Optional[Any]:
+        return self._cache(ns).get(key)
+
+    def put(self, ns: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._cache(ns).put(key, value, ttl)
+
+    def delete(self, ns: str, key: str) -> bool:
+        return self._cache(ns).delete(key)
+
+    def expire(self, ns: str, key: str, ttl: Optional[float]) -> bool:
+        return self._cache(ns).expire(key, ttl)
+
+    def purge(self) -> int:
+        return sum(c.sweep() for c in list(self._caches.values()))
+
+    def count(self, ns: Optional[str] = None) -> int:
+        if ns is None:
+            return sum(len(c) for c in list(self._caches.values()))
+        return len(self._cache(ns))
+
+    def stats(self, ns: str) -> Dict[str, Any]:
+        return self._cache(ns).stats()
+
+    def counters(self, ns: str) -> Dict[str, int]:
+        c = self._cache(ns)
+        return {"hits": c.hits, "misses": c.misses}
+
+
+class SQLiteBackend(StateBackend):
+    """
+    Eén tabel (ns, key) -> JSON + expires (epoch) + created. WAL: lezers blokkeren schrijvers
+    niet, meerdere processen kunnen tegelijk lezen; één connectie per thread.
+    Budget-evictie is "oudste eerst" (FIFO op created): een LRU-timestamp bijwerken zou
+    van elke read een write maken.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path = DEFAULT_DB, *, busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._puts = 0
+        # hits/misses/evictions: enkel dit proces (de tabel zelf is gedeeld); waitress-threads
+        # tellen tegelijk -> onder _lock, zoals TTLCache in de memory backend
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires REAL, created REAL,"
+            " PRIMARY KEY (ns, key)) WITHOUT ROWID"
+        )
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(state)")}
+        if "created" not in cols:
+            conn.execute("ALTER TABLE state ADD COLUMN created REAL")
+        conn.execute("CREATE INDEX IF NOT EXISTS state_expires ON state(expires) WHERE expires IS NOT NULL")
+        conn.execute("CREATE INDEX IF NOT EXISTS state_created ON state(ns, created)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            # na fork nooit de connectie van de parent hergebruiken
+            conn = sqlite3.connect(str(self.path), timeout=self.busy_timeout_ms / 1000, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, ns: str, field: str, n: int = 1) -> None:
+        with self._lock:
+            c = self._counters.setdefault(ns, {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0})
+            c[field] += n
+
+    def get(self, ns: str, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value, expires FROM state WHERE ns=? AND key=?", (ns, key)
+        ).fetchone()
+        if row is None:
+            self._count(ns, "misses")
+            return None
+        if row[1] is not None and row[1] <= time.time():
+            self._conn().execute("DELETE FROM state WHERE ns=? AND key=? AND expires<=?", (ns, key, time.time()))
+            self._count(ns, "expirations")
+            self._count(ns, "misses")
+            return None
+        self._count(ns, "hits")
+        return json.loads(row[0])
+
+    def put(self, ns: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO state (ns, key, value, expires, created) VALUES (?, ?, ?, ?, ?)",
+            (ns, key, payload, _deadline(ttl), now),
+        )
+        with self._lock:
+            self._puts += 1
+            puts = self._puts
+        if puts % PURGE_EVERY == 0:
+            self.purge()
+        else:
+            lim = _limits_for(ns)
+            if lim.max_entries and puts % 16 == 0:
+                self._enforce(ns, lim)
+
+    def delete(self, ns: str, key: str) -> bool:
+        cur = self._conn().execute("DELETE FROM state WHERE ns=? AND key=?", (ns, key))
+        return cur.rowcount > 0
+
+    def expire(self, ns: str, key: str, ttl: Optional[float]) -> bool:
+        cur = self._conn().execute(
+            "UPDATE state SET expires=? WHERE ns=? AND key=? AND (expires IS NULL OR expires>?)",
+            (_deadline(ttl), ns, key, time.time()),
+        )
+        return cur.rowcount > 0
+
+    def _enforce(self, ns: str, lim: NamespaceLimits) -> int:
+        conn = self._conn()
+        n = 0
+        over = conn.execute("SELECT COUNT(*) FROM state WHERE ns=?", (ns,)).fetchone()[0] - lim.max_entries
+        if over > 0:
+            cur = conn.execute(
+                "DELETE FROM state WHERE ns=? AND key IN "
+                "(SELECT key FROM state WHERE ns=? ORDER BY created LIMIT ?)",
+                (ns, ns, over),
+            )
+            n += max(0, cur.rowcount)
+        if lim.max_bytes:
+            total = 0
+            doomed = []
+            for key, size in conn.execute(
+                "SELECT key, length(value) FROM state WHERE ns=? ORDER BY created DESC", (ns,)
+            ):
+                total += int(size or 0)
+                if total > lim.max_bytes:
+                    doomed.append((ns, key))
+            if doomed:
+                conn.executemany("DELETE FROM state WHERE ns=? AND key=?", doomed)
+                n += len(doomed)
+        if n:
+            self._count(ns, "evictions", n)
+        return n
+
+    def purge(self) -> int:
+        cur = self._conn().execute("DELETE FROM state WHERE expires IS NOT NULL AND expires<=?", (time.time(),))
+        n = max(0, cur.rowcount)
+        for ns, lim in list(_limits.items()):
+            n += self._enforce(ns, lim)
+        return n
+
+    def count(self, ns: Optional[str] = None) -> int:
+        now = time.time()
+        if ns is None:
+            row = self._conn().execute(
+                "SELECT COUNT(*) FROM state WHERE expires IS NULL OR expires>?", (now,)
+            ).fetchone()
+        else:
+            row = self._conn().execute(
+                "SELECT COUNT(*) FROM state WHERE ns=? AND (expires IS NULL OR expires>?)", (ns, now)
+            ).fetchone()
+        return int(row[0])
+
+    def stats(self, ns: str) -> Dict[str, Any]:
+        lim = _limits_for(ns)
+        size, nbytes = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(value)), 0) FROM state WHERE ns=?", (ns,)
+        ).fetchone()
+        out: Dict[str, Any] = {
+            "name": ns,
+            "size": int(size),
+            "bytes": int(nbytes),
+            "max_entries": lim.max_entries,
+            "max_bytes": lim.max_bytes,
+            "default_ttl": lim.default_ttl,
+        }
+        with self._lock:
+            out.update(self._counters.get(ns) or {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0})
+        return out
+
+    def counters(self, ns: str) -> Dict[str, int]:
+        with self._lock:
+            c = dict(self._counters.get(ns) or {})
+        return {"hits": int(c.get("hits", 0)), "misses": int(c.get("misses", 0))}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# =========================
+# Backend-keuze (proces-breed)
+# =========================
+_backend: Optional[StateBackend] = None
+_backend_lock = threading.Lock()
+
+
+def configure_state(settings: Optional[Mapping[str, Any]] = None) -> StateBackend:
+    """
+    Kies de backend uit hub_settings["state"] (+ env override). Mag vóór of na het
+    importeren van tools: namespaces resolven de backend pas bij gebruik.
+    """
+    global _backend
+    raw = (settings or {}).get("state") if settings else None
+    cfg: Dict[str, Any] = dict(raw) if isinstance(raw, Mapping) else {}
+    if os.environ.get("CYNIT_STATE_BACKEND"):
+        cfg["backend"] = os.environ["CYNIT_STATE_BACKEND"]
+    if os.environ.get("CYNIT_STATE_PATH"):
+        cfg["path"] = os.environ["CYNIT_STATE_PATH"]
+
+    kind = str(cfg.get("backend") or "memory").strip().lower()
+    if kind not in STATE_BACKENDS:
+        kind = "memory"
+
+    try:
+        interval = max(1.0, float(cfg.get("sweep_interval_sec", SWEEP_INTERVAL_SEC)))
+    except (TypeError, ValueError):
+        interval = SWEEP_INTERVAL_SEC
+
+    with _backend_lock:
+        old = _backend
+        if kind == "sqlite":
+            path = Path(str(cfg.get("path") or DEFAULT_DB))
+            if not path.is_absolute():
+                path = BASE_DIR / path
+            _backend = SQLiteBackend(path)
+        else:
+            _backend = MemoryBackend()
+    if old is not None:
+        old.close()
+    # memory-caches (TTLCache) sweept de sweeper zelf; sqlite via purge()
+    register_sweep("state_store", _purge_shared)
+    start_sweeper(interval)
+    return _backend
+
+
+def _purge_shared() -> None:
+    b = _backend
+    if isinstance(b, SQLiteBackend):
+        b.purge()
+
+
+def get_backend() -> StateBackend:
+    b = _backend
+    if b is None:
+        b = configure_state(None)
+    return b
+
+
+def state_info() -> Dict[str, Any]:
+    b = get_backend()
+    info: Dict[str, Any] = {"backend": b.name, "entries": b.count()}
+    if isinstance(b, SQLiteBackend):
+        info["path"] = str(b.path)
+    return info
+
+
+def state_stats() -> Dict[str, Any]:
+    """Backend + stats per geregistreerde namespace (size, bytes, hits, misses, evictions, ...)."""
+    b = get_backend()
+    out: Dict[str, Any] = state_info()
+    out["namespaces"] = {name: b.stats(name) for name in sorted(_namespaces)}
+    return out
+
+
+def state_counters() -> Dict[str, Dict[str, int]]:
+    """hits/misses per namespace (dit proces), zonder de sqlite tabel te scannen."""
+    b = get_backend()
+    return {name: b.counters(name) for name in sorted(_namespaces)}
+
+
+# =========================
+# Namespace (wat tools gebruiken)
+# =========================
+class StateNamespace:
+    """
+    Eén logische store van een tool. limits.default_ttl geldt voor put()/ns[key] = v zonder ttl.
+    Keys zijn strings; waarden JSON-serialiseerbaar.
+    """
+
+    def __init__(self, name: str, limits: NamespaceLimits = DEFAULT_LIMITS):
+        self.name = name
+        self.limits = limits
+
+    @property
+    def default_ttl(self) -> Optional[float]:
+        return self.limits.default_ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = get_backend().get(self.name, str(key))
+        return default if value is None else value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        get_backend().put(self.name, str(key), value, self.default_ttl if ttl is None else ttl)
+
+    def expire(self, key: str, ttl: Optional[float]) -> bool:
+        return get_backend().expire(self.name, str(key), ttl)
+
+    def delete(self, key: str) -> bool:
+        return get_backend().delete(self.name, str(key))
+
+    def __len__(self) -> int:
+        return get_backend().count(self.name)
+
+    def __contains__(self, key: object) -> bool:
+        return get_backend().get(self.name, str(key)) is not None
+
+    def __getitem__(self, key: str) -> Any:
+        value = get_backend().get(self.name, str(key))
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:  # pragma: no cover - bewust niet ondersteund
+        raise TypeError("StateNamespace is niet itereerbaar (gedeelde backend)")
+
+    def stats(self) -> Dict[str, Any]:
+        return get_backend().stats(self.name)
+
+    def __repr__(self) -> str:
+        return f"StateNamespace({self.name!r}, backend={get_backend().name!r}, {asdict(self.limits)})"
+
+
+_namespaces: Dict[str, StateNamespace] = {}
+
+
+def state_namespace(
+    name: str,
+    *,
+    default_ttl: Optional[float] = None,
+    max_entries: int = DEFAULT_LIMITS.max_entries,
+    max_bytes: Optional[int] = None,
+) -> StateNamespace:
+    """Registreert (1x) de limieten; moet vóór het eerste gebruik van de namespace gebeuren."""
+    ns = _namespaces.get(name)
+    if ns is None:
+        lim = NamespaceLimits(default_ttl=default_ttl, max_entries=max_entries, max_bytes=max_bytes)
+        _limits[name] = lim
+        ns = _namespaces.setdefault(name, StateNamespace(name, lim))
+    return ns
+
+
+def token_ttl(data: Mapping[str, Any], default: int = 3600) -> int:
+    """Levensduur van een access token uit de token-response (expires_in), anders default."""
+    try:
+        return max(1, int(data.get("expires_in") or default))
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/static_assets.py — content-hashed static/ met voorgecomprimeerde varianten
+
+- manifest: static/css/main.css -> css/main.<hash12>.css (runtime/static_build/manifest.json);
+  bij startup enkel opnieuw gehasht als size/mtime van een bestand wijzigde
+- url_for("static", filename="css/main.css") geeft transparant de gehashte URL (url_defaults)
+- serveren: gehashte naam -> origineel bestand of .br/.gz sibling volgens Accept-Encoding,
+  Cache-Control: immutable + Vary: Accept-Encoding; ongehashte namen = gewone Flask static
+- compressie (gzip -9, brotli als de module er is) content-addressed in static_build/compressed/,
+  gebouwd op een achtergrond-thread (of volledig via: python -m runtime.static_assets)
+- bestand gewijzigd terwijl de hub draait: oude hash krijgt de nieuwe inhoud met no-cache
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, request, send_file
+
+try:  # optioneel
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover
+    brotli = None
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+STATIC_DIR = BASE_DIR / "static"
+BUILD_DIR = BASE_DIR / "runtime" / "static_build"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# enkel web-assets fingerprinten (vendor bevat ook .h/.a/.md die niemand via url_for vraagt)
+COMPRESSIBLE = {".css", ".js", ".mjs", ".map", ".svg", ".json", ".txt", ".html", ".xml"}
+FINGERPRINT = COMPRESSIBLE | {".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".woff", ".woff2", ".ttf", ".eot"}
+MIN_COMPRESS_BYTES = 512
+HASH_LEN = 12
+
+
+@dataclass(frozen=True)
+class Asset:
+    path: str          # relatief t.o.v. static/, posix ("css/main.css")
+    hashed: str        # "css/main.<digest>.css"
+    digest: str
+    size: int
+    mtime_ns: int
+    mimetype: str
+
+
+def _hashed_name(rel: str, digest: str) -> str:
+    head, dot, ext = rel.rpartition(".")
+    if not dot or "/" in ext:
+        return f"{rel}.{digest}"
+    return f"{head}.{digest}.{ext}"
+
+
+def _digest_file(p: Path) -> str:
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:HASH_LEN]
+
+
+class StaticManifest:
+    def __init__(self, static_dir: Path = STATIC_DIR, build_dir: Path = BUILD_DIR):
+        self.static_dir = Path(static_dir)
+        self.build_dir = Path(build_dir)
+        self.manifest_file = self.build_dir / "manifest.json"
+        self.compressed_dir = self.build_dir / "compressed"
+        self.assets: Dict[str, Asset] = {}      # origineel -> asset
+        self.by_hashed: Dict[str, Asset] = {}   # gehasht -> asset
+        self._lock = threading.Lock()
+        self.build_ms = 0.0
+        self.rehashed = 0
+        self.compressed = 0
+
+    # ---------- build ----------
+    def _load_previous(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.manifest_file.read_text(encoding="utf-8"))
+            assets = data.get("assets") if isinstance(data, dict) else None
+            return assets if isinstance(assets, dict) else {}
+        except Exception:
+            return {}
+
+    def build(self) -> "StaticManifest":
+        t0 = time.perf_counter()
+        prev = self._load_previous()
+        assets: Dict[str, Asset] = {}
+        rehashed = 0
+        for root, dirs, files in os.walk(self.static_dir):
+            dirs.sort()
+            for name in sorted(files):
+                p = Path(root) / name
+                if p.suffix.lower() not in FINGERPRINT:
+                    continue
+                rel = p.relative_to(self.static_dir).as_posix()
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                old = prev.get(rel)
+                if old and old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+                    digest = str(old["digest"])
+                else:
+                    digest = _digest_file(p)
+                    rehashed += 1
+                mt = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                assets[rel] = Asset(rel, _hashed_name(rel, digest), digest, st.st_size, st.st_mtime_ns, mt)
+
+        with self._lock:
+            self.assets = assets
+            self.by_hashed = {a.hashed: a for a in assets.values()}
+        self.rehashed = rehashed
+        if rehashed or len(prev) != len(assets):
+            self._write_manifest()
+        self.build_ms = round((time.perf_counter() - t0) * 1000, 1)
+        return self
+
+    def _write_manifest(self) -> None:
+        try:
+            self.build_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_file.with_name(self.manifest_file.name + ".tmp")
+            data = {"generated": time.time(), "assets": {k: asdict(v) for k, v in sorted(self.assets.items())}}
+            tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+            os.replace(tmp, self.manifest_file)
+        except OSError:
+            pass
+
+    # ---------- compressie ----------
+    def compressed_path(self, asset: Asset, encoding: str) -> Path:
+        return self.compressed_dir / f"{asset.digest}.{'br' if encoding == 'br' else 'gz'}"
+
+    def _compressible(self, asset: Asset) -> bool:
+        return asset.size >= MIN_COMPRESS_BYTES and Path(asset.path).suffix.lower() in COMPRESSIBLE
+
+    def compress_all(self) -> int:
+        """gz (+br) siblings voor alles wat nog geen heeft; geeft het aantal nieuwe bestanden terug."""
+        n = 0
+        self.compressed_dir.mkdir(parents=True, exist_ok=True)
+        for asset in list(self.assets.values()):
+            if not self._compressible(asset):
+                continue
+            targets = [("gzip", lambda b: gzip.compress(b, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                targets.append(("br", lambda b: brotli.compress(b, quality=11)))
+            todo = [(enc, fn) for enc, fn in targets if not self.compressed_path(asset, enc).exists()]
+            if not todo:
+                continue
+            try:
+                raw = (self.static_dir / asset.path).read_bytes()
+            except OSError:
+                continue
+            for enc, fn in todo:
+                data = fn(raw)
+                if len(data) >= len(raw) * 0.95:
+                    data = b""  # marker: comprimeren loont niet -> origineel serveren
+                out = self.compressed_path(asset, enc)
+                tmp = out.with_name(out.name + ".tmp")
+                try:
+                    tmp.write_bytes(data)
+                    os.replace(tmp, out)
+                    n += 1
+                except OSError:
+                    pass
+        self.compressed += n
+        return n
+
+    # ---------- lookup ----------
+    def url_path(self, filename: str) -> str:
+        a = self.assets.get(filename)
+        return a.hashed if a is not None else filename
+
+    def resolve(self, hashed: str) -> Optional[Asset]:
+        return self.by_hashed.get(hashed)
+
+    def refresh(self, asset: Asset) -> Tuple[Asset, bool]:
+        """(actuele asset, nog dezelfde inhoud?) — vangt edits terwijl de hub draait op."""
+        p = self.static_dir / asset.path
+        try:
+            st = p.stat()
+        except OSError:
+            return asset, False
+        if st.st_size == asset.size and st.st_mtime_ns == asset.mtime_ns:
+            return asset, True
+        digest = _digest_file(p)
+        fresh = Asset(asset.path, _hashed_name(asset.path, digest), digest, st.st_size, st.st_mtime_ns, asset.mimetype)
+        with self._lock:
+            self.assets[asset.path] = fresh
+            self.by_hashed[fresh.hashed] = fresh
+            self.by_hashed[asset.hashed] = fresh
+        return fresh, digest == asset.digest
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "assets": len(self.assets),
+            "build_ms": self.build_ms,
+            "rehashed": self.rehashed,
+            "compressed": self.compressed,
+            "brotli": brotli is not None,
+        }
+
+
+def _pick_encoding(manifest: StaticManifest, asset: Asset) -> Tuple[Optional[str], Optional[Path]]:
+    accept = request.accept_encodings
+    for enc in ("br", "gzip"):
+        if accept[enc] <= 0:
+            continue
+        p = manifest.compressed_path(asset, enc)
+        try:
+            if p.stat().st_size > 0:
+                return enc, p
+        except OSError:
+            continue
+    return None, None
+
+
+def install_static_pipeline(app: Flask, hub_log: Any = None, *, background: bool = True) -> StaticManifest:
+    manifest = StaticManifest(Path(app.static_folder or STATIC_DIR)).build()
+    app.extensions["cynit_static"] = manifest
+    original = app.view_functions.get("static")
+
+    @app.url_defaults
+    def _static_hashed(endpoint: str, values: Dict[str, Any]) -> None:
+        if endpoint == "static" and "filename" in values:
+            values["filename"] = manifest.url_path(values["filename"])
+
+    def static_hashed(filename: str):
+        asset = manifest.resolve(filename)
+        if asset is None:
+            return original(filename=filename) if original else app.send_static_file(filename)
+
+        asset, same = manifest.refresh(asset)
+        enc, path = _pick_encoding(manifest, asset) if same else (None, None)
+        resp = send_file(
+            path or (manifest.static_dir / asset.path),
+            mimetype=asset.mimetype,
+            etag=f"{asset.digest}-{enc or 'id'}",
+            conditional=True,
+            max_age=None,
+        )
+        if enc:
+            resp.headers["Content-Encoding"] = enc
+        if manifest._compressible(asset):
+            resp.vary.add("Accept-Encoding")
+        resp.headers["Cache-Control"] = IMMUTABLE if same else "no-cache"
+        return resp
+
+    app.view_functions["static"] = static_hashed
+
+    if background:
+        def _compress() -> None:
+            try:
+                n = manifest.compress_all()
+                if hub_log is not None and n:
+                    hub_log.info("Static assets: %d precompressed variants built OK", n)
+            except Exception:
+                if hub_log is not None:
+                    hub_log.exception("Static asset compression failed")
+
+        threading.Thread(target=_compress, name="cynit-static-compress", daemon=True).start()
+
+    if hub_log is not None:
+        hub_log.info("Static manifest: %s OK", manifest.stats())
+    return manifest
+
+
+def get_static_manifest(app: Flask) -> Optional[StaticManifest]:
+    m = app.extensions.get("cynit_static")
+    return m if isinstance(m, StaticManifest) else None
+
+
+if __name__ == "__main__":
+    # build-stap (CI / installer): manifest + alle gecomprimeerde varianten synchroon
+    m = StaticManifest().build()
+    n = m.compress_all()
+    print(f"static manifest: {len(m.assets)} assets ({m.rehashed} rehashed) in {m.build_ms}ms; {n} compressed variants")
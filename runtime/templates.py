@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/templates.py — registry voor de inline Jinja templates van tools (1x compileren i.p.v. per request)
+
+- tools registreren hun CONTENT_TEMPLATE in register_web_routes: register_template(app, "voica1/content.html", SRC)
+- de registry is een Jinja loader vóór de gewone app-loader: Jinja's eigen template-cache houdt
+  de gecompileerde Template bij; render_registered(naam, **ctx) = flask.render_template
+  (zelfde context processors + autoescape als render_template_string, want naam eindigt op .html)
+- optionele bytecode cache op disk (runtime/jinja_cache): ook na een restart niet opnieuw compileren
+- CYNIT_TEMPLATE_REGISTRY=0: registry uit (oud gedrag: elke render compileert), bv. voor benchmarks
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, current_app, render_template, render_template_string
+from jinja2 import BaseLoader, ChoiceLoader, Environment, FileSystemBytecodeCache, TemplateNotFound
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_BYTECODE_DIR = BASE_DIR / "runtime" / "jinja_cache"
+
+
+REGISTRY_ENABLED = os.environ.get("CYNIT_TEMPLATE_REGISTRY", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class TemplateRegistry(BaseLoader):
+    """naam -> bron; uptodate zolang dezelfde bron geregistreerd blijft (identity check, O(1))."""
+
+    def __init__(self) -> None:
+        self._sources: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.compile_ms: Dict[str, float] = {}
+
+    def register(self, name: str, source: str) -> None:
+        with self._lock:
+            self._sources[name] = source
+
+    def source(self, name: str) -> Optional[str]:
+        return self._sources.get(name)
+
+    def get_source(self, environment: Environment, template: str) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        src = self._sources.get(template)
+        if src is None:
+            raise TemplateNotFound(template)
+        return src, None, lambda: self._sources.get(template) is src
+
+    def list_templates(self) -> List[str]:
+        return sorted(self._sources)
+
+    def compile_all(self, env: Environment) -> int:
+        """Alles nu al compileren (productie-warmup); geeft het aantal templates terug."""
+        n = 0
+        for name in self.list_templates():
+            t0 = time.perf_counter()
+            env.get_template(name)
+            self.compile_ms[name] = round((time.perf_counter() - t0) * 1000, 2)
+            n += 1
+        return n
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "templates": len(self._sources),
+            "names": self.list_templates(),
+            "compile_ms": dict(self.compile_ms),
+            "enabled": REGISTRY_ENABLED,
+        }
+
+
+def install_templates(app: Flask, *, bytecode_cache_dir: Optional[Path] = None) -> TemplateRegistry:
+    """Idempotent. bytecode_cache_dir=None = geen disk-cache."""
+    reg = app.extensions.get("cynit_templates")
+    if isinstance(reg, TemplateRegistry):
+        if bytecode_cache_dir is not None and app.jinja_env.bytecode_cache is None:
+            _attach_bytecode_cache(app, bytecode_cache_dir)
+        return reg
+
+    reg = TemplateRegistry()
+    env = app.jinja_env
+    env.loader = ChoiceLoader([reg, env.loader]) if env.loader is not None else reg
+    app.extensions["cynit_templates"] = reg
+    if bytecode_cache_dir is not None:
+        _attach_bytecode_cache(app, bytecode_cache_dir)
+    return reg
+
+
+def _attach_bytecode_cache(app: Flask, directory: Path) -> None:
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(directory), "cynit_%s.cache")
+    except OSError:
+        pass  # read-only install: gewoon zonder disk-cache
+
+
+def get_registry(app: Flask) -> Optional[TemplateRegistry]:
+    reg = app.extensions.get("cynit_templates")
+    return reg if isinstance(reg, TemplateRegistry) else None
+
+
+def register_template(app: Flask, name: str, source: str) -> None:
+    """Vanuit register_web_routes; werkt ook op een standalone Flask app (registry wordt aangemaakt)."""
+    install_templates(app).register(name, source)
+
+
+def render_registered(name: str, **context: Any) -> str:
+    """Render een geregistreerde template binnen een request (of app) context."""
+    if not REGISTRY_ENABLED:
+        reg = get_registry(current_app._get_current_object())  # type: ignore[attr-defined]
+        src = reg.source(name) if reg is not None else None
+        if src is None:
+            raise TemplateNotFound(name)
+        return render_template_string(src, **context)
+    return render_template(name, **context)
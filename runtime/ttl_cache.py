@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+runtime/ttl_cache.py — begrensde key/value container: TTL per entry + LRU binnen een budget
+
+- budget: max_entries en (optioneel) max_bytes (benaderd via approx_size, geen deep getsizeof)
+- get() verplaatst naar achter (LRU); put() evict van voor tot het budget weer klopt
+- verlopen entries: lui bij get/put + periodiek door één gedeelde sweeper thread
+- stats(): size, bytes, hits, misses, evictions, expirations (voor /beheer/system)
+- thread-safe (één lock per cache; kritieke secties zijn O(1) behalve evict/sweep)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# vaste overhead per entry (tuple, OrderedDict-node, key) — ruwe schatting
+_ENTRY_OVERHEAD = 100
+
+
+def approx_size(obj: Any, _depth: int = 0) -> int:
+    """Goedkope schatting in bytes van JSON-achtige data (str/bytes/dict/list/getallen)."""
+    if isinstance(obj, str):
+        return 49 + len(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return 33 + len(obj)
+    if _depth > 8:
+        return 64
+    if isinstance(obj, dict):
+        return 64 + sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return 56 + sum(approx_size(v, _depth + 1) for v in obj)
+    return 28
+
+
+class TTLCache:
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.default_ttl = default_ttl
+        self._clock = clock
+        # key -> (value, expires_at | None, size)
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _register(self)
+
+    # ---------- lezen ----------
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            if item[1] is not None and item[1] <= self._clock():
+                self._remove(key, item)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def __contains__(self, key: object) -> bool:
+        item = self._data.get(key)  # type: ignore[arg-type]
+        return item is not None and (item[1] is None or item[1] > self._clock())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ---------- schrijven ----------
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        exp = None if ttl is None else self._clock() + max(0.0, float(ttl))
+        size = _ENTRY_OVERHEAD + approx_size(key) + approx_size(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._data[key] = (value, exp, size)
+            self.bytes += size
+            self._evict()
+
+    def expire(self, key: str, ttl: Optional[float]) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or (item[1] is not None and item[1] <= self._clock()):
+                return False
+            exp = None if ttl is None else self._clock() + max(0.0, float(ttl))
+            self._data[key] = (item[0], exp, item[2])
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False
+            self._remove(key, item)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    # ---------- onderhoud ----------
+    def sweep(self) -> int:
+        """Alle verlopen entries weg; geeft het aantal terug."""
+        now = self._clock()
+        with self._lock:
+            dead = [(k, it) for k, it in self._data.items() if it[1] is not None and it[1] <= now]
+            for k, it in dead:
+                self._remove(k, it)
+            self.expirations += len(dead)
+        return len(dead)
+
+    def _remove(self, key: str, item: Tuple[Any, Optional[float], int]) -> None:
+        del self._data[key]
+        self.bytes -= item[2]
+
+    def _evict(self) -> None:
+        # oudste (least recently used) eerst; de net toegevoegde entry blijft altijd staan
+        data = self._data
+        while len(data) > 1 and (
+            len(data) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            key, item = data.popitem(last=False)
+            self.bytes -= item[2]
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "default_ttl": self.default_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# =========================
+# Gedeelde sweeper
+# =========================
+_caches: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+_extra: Dict[str, Callable[[], Any]] = {}
+_sweeper: Optional[threading.Thread] = None
+_sweeper_pid = 0
+_sweeper_lock = threading.Lock()
+
+
+def _register(cache: TTLCache) -> None:
+    _caches.add(cache)
+
+
+def register_sweep(name: str, fn: Callable[[], Any]) -> None:
+    """Extra periodieke opruimtaak (bv. sqlite purge) op dezelfde sweeper thread."""
+    _extra[name] = fn
+
+
+def sweep_all() -> int:
+    n = 0
+    for c in list(_caches):
+        n += c.sweep()
+    for fn in list(_extra.values()):
+        try:
+            fn()
+        except Exception:
+            pass
+    return n
+
+
+def start_sweeper(interval: float = 60.0) -> None:
+    """Idempotent; na een fork start het child zijn eigen sweeper."""
+    global _sweeper, _sweeper_pid
+    import os
+
+    with _sweeper_lock:
+        if _sweeper is not None and _sweeper.is_alive() and _sweeper_pid == os.getpid():
+            return
+
+        def _run() -> None:
+            while True:
+                time.sleep(interval)
+                sweep_all()
+
+        _sweeper = threading.Thread(target=_run, name="cynit-ttl-sweeper", daemon=True)
+        _sweeper_pid = os.getpid()
+        _sweeper.start()
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import json
 import os
+import ssl
 import subprocess
 import time
 import webbrowser
 from datetime import datetime
 from pathlib import Path
 from threading import Lock, Thread
+from urllib.request import urlopen
 
 from PIL import Image, ImageDraw
 from pystray import Icon, Menu, MenuItem
@@ -17,6 +19,7 @@ from win11toast import toast
 import sys
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "runtime"))
 from preflight import PreflightConfig, ensure_env_and_deps  # noqa: E402
+from boot_trace import BootTrace, merge_timelines, read_timeline  # noqa: E402
 
 
 # =========================
@@ -35,6 +38,7 @@ TRAY_LOG = LOGS_DIR / "master_tray.log"
 
 SCRIPT = PROJECT_DIR / "master.py"
 HUB_URL = "https://localhost:5000"  # pas aan indien jouw master op andere poort draait
+HUB_ENDPOINT_FILE = PROJECT_DIR / "runtime" / "hub_endpoint.json"  # door master geschreven (dev/waitress)
 
 ICON_OK_PATH = PROJECT_DIR / "static" / "images" / "logo.png"
 ICON_ERR_PATH = PROJECT_DIR / "static" / "images" / "logo_crash.png"
@@ -43,11 +47,16 @@ ICON_ERR_PATH = PROJECT_DIR / "static" / "images" / "logo_crash.png"
 HEARTBEAT_FILE = RUNTIME_DIR / "watchdog_heartbeat.json"
 HEARTBEAT_INTERVAL_SEC = 5
 
+# Boot timeline (master schrijft, tray merge't in de heartbeat)
+BOOT_TIMELINE_FILE = RUNTIME_DIR / "boot_timeline.json"
+HEALTH_PROBE_TIMEOUT_SEC = 120
+
 # Tray uptime
 TRAY_STARTED_TS = time.time()
 
 _proc = None
 _proc_lock = Lock()
+_boot: BootTrace | None = None
 
 
 # =========================
@@ -100,6 +109,28 @@ def write_heartbeat(status: str, extra: dict | None = None):
         log(f"[WARN] heartbeat write failed: {e}")
 
 
+def boot_timeline() -> dict:
+    """
+    Tray spans (preflight/spawn/first_health) + master spans van dezelfde boot.
+    """
+    tr = _boot
+    if tr is None:
+        return {}
+    return merge_timelines(tr.to_dict(), read_timeline(BOOT_TIMELINE_FILE, tr.boot_id))
+
+
+def hub_url() -> str:
+    """URL die master effectief serveert (waitress = http), anders HUB_URL."""
+    try:
+        data = json.loads(HUB_ENDPOINT_FILE.read_text(encoding="utf-8"))
+        url = str(data.get("url") or "").strip()
+        if url.startswith(("http://", "https://")):
+            return url
+    except Exception:
+        pass
+    return HUB_URL
+
+
 def tray_uptime_text() -> str:
     """
     Dynamic text in right-click menu.
@@ -139,13 +170,47 @@ def make_red_icon(src_path: Path, dest_path: Path):
 # =========================
 # Master process control
 # =========================
-def start_master(venv_pythonw: Path) -> subprocess.Popen:
+def start_master(venv_pythonw: Path, trace: BootTrace | None = None) -> subprocess.Popen:
     if not venv_pythonw.exists():
         raise FileNotFoundError(f"pythonw.exe niet gevonden: {venv_pythonw}")
     if not SCRIPT.exists():
         raise FileNotFoundError(f"master.py niet gevonden: {SCRIPT}")
 
-    return subprocess.Popen([str(venv_pythonw), str(SCRIPT)], cwd=str(PROJECT_DIR))
+    env = None
+    if trace is not None:
+        # master logt op dezelfde tijdas (zelfde boot_id + origin)
+        env = dict(os.environ)
+        env.update(trace.child_env())
+    return subprocess.Popen([str(venv_pythonw), str(SCRIPT)], cwd=str(PROJECT_DIR), env=env)
+
+
+def probe_health(trace: BootTrace, proc: subprocess.Popen):
+    """
+    Pollt /_health tot de eerste 200 -> mark "tray.first_health" (= restart latency).
+    URL uit runtime/hub_endpoint.json eerst, dan https (dev+TLS) en http als fallback.
+    """
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+
+    deadline = time.monotonic() + HEALTH_PROBE_TIMEOUT_SEC
+    attempts = 0
+    while time.monotonic() < deadline and proc.poll() is None:
+        # endpoint file kan nog van de vorige run zijn -> ook de defaults proberen
+        urls = dict.fromkeys([hub_url().rstrip("/") + "/_health", HUB_URL + "/_health", "http://127.0.0.1:5000/_health"])
+        for url in urls:
+            attempts += 1
+            try:
+                with urlopen(url, timeout=1, context=ctx if url.startswith("https") else None) as r:
+                    if r.status == 200:
+                        trace.finish("tray.first_health", attempts=attempts)
+                        log(f"Eerste /_health OK na {trace.now_ms():.0f}ms (boot_id={trace.boot_id})")
+                        return
+            except Exception:
+                pass
+        time.sleep(0.1)
+    trace.finish("tray.health_timeout", attempts=attempts)
+    log(f"[WARN] geen /_health binnen {HEALTH_PROBE_TIMEOUT_SEC}s (boot_id={trace.boot_id})")
 
 
 def stop_master():
@@ -178,7 +243,7 @@ def stop_master():
 def on_open(icon, item):
     log("CLICK: Open Hub")
     notify("CyNiT-Hub", "Hub openen")
-    webbrowser.open(HUB_URL)
+    webbrowser.open(hub_url())
 
 
 def on_ping(icon, item):
@@ -207,12 +272,13 @@ def on_quit(icon, item):
 # Watchdog
 # =========================
 def run_watchdog(icon: Icon):
-    global _proc
+    global _proc, _boot
 
     LOGS_DIR.mkdir(parents=True, exist_ok=True)
     log("Tray runner gestart")
     notify("CyNiT-Hub", "Tray runner gestart")
 
+    trace = BootTrace("tray")
     write_heartbeat("starting", {"phase": "preflight"})
 
     # 1) Preflight: venv + deps
@@ -245,7 +311,8 @@ def run_watchdog(icon: Icon):
     }
 
     try:
-        venv_py = ensure_env_and_deps(cfg, REQUIRED_IMPORTS)
+        with trace.span("tray.preflight"):
+            venv_py = ensure_env_and_deps(cfg, REQUIRED_IMPORTS)
         log(f"Preflight OK: {venv_py}")
         write_heartbeat("starting", {"phase": "preflight_ok"})
     except Exception as e:
@@ -268,7 +335,7 @@ def run_watchdog(icon: Icon):
 
     def heartbeat_loop():
         while not hb_stop["stop"]:
-            write_heartbeat("running", {"master_running": True})
+            write_heartbeat("running", {"master_running": True, "boot": boot_timeline()})
             # sleep in small chunks so stop reacts quickly
             for _ in range(int(HEARTBEAT_INTERVAL_SEC * 10)):
                 if hb_stop["stop"]:
@@ -276,13 +343,22 @@ def run_watchdog(icon: Icon):
                 time.sleep(0.1)
 
     # 3) run loop
+    first = True
     while True:
         try:
+            if not first:
+                # herstart: nieuwe timeline, origin = nu
+                trace = BootTrace("tray")
+            first = False
+
             write_heartbeat("starting", {"phase": "starting_master"})
-            log("Start master.py")
+            log(f"Start master.py (boot_id={trace.boot_id})")
 
-            with _proc_lock:
-                _proc = start_master(venv_pythonw)
+            with trace.span("tray.spawn"):
+                with _proc_lock:
+                    _proc = start_master(venv_pythonw, trace)
+            _boot = trace
+            Thread(target=probe_health, args=(trace, _proc), daemon=True).start()
 
             hb_stop["stop"] = False
             Thread(target=heartbeat_loop, daemon=True).start()
@@ -41,15 +41,23 @@
     };
   }
 
-  function send(data) {
+  // clicks bufferen en in batches versturen (1 request per FLUSH_MS i.p.v. 1 per click)
+  const BATCH_URL = "/_log/clicks";
+  const FLUSH_MS = 5000;
+  const MAX_BATCH = 50;
+  let buffer = [];
+
+  function flush() {
+    if (!buffer.length) return;
+    const batch = buffer;
+    buffer = [];
     try {
-      const body = JSON.stringify(data);
+      const body = JSON.stringify(batch);
       if (navigator.sendBeacon) {
         const blob = new Blob([body], { type: "application/json" });
-        navigator.sendBeacon("/_log/click", blob);
-        return;
+        if (navigator.sendBeacon(BATCH_URL, blob)) return;
       }
-      fetch("/_log/click", {
+      fetch(BATCH_URL, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: body,
@@ -58,13 +66,26 @@
     } catch (e) {}
   }
 
+  function queue(data) {
+    buffer.push(data);
+    if (buffer.length >= MAX_BATCH) flush();
+  }
+
+  setInterval(flush, FLUSH_MS);
+
+  // pagina verlaten / naar achtergrond: beacon overleeft de unload
+  window.addEventListener("pagehide", flush);
+  document.addEventListener("visibilitychange", function () {
+    if (document.visibilityState === "hidden") flush();
+  });
+
   // capture phase: logt ook als je meteen navigeert
   document.addEventListener(
     "click",
     function (ev) {
       const data = payloadFrom(ev);
       if (!data) return;
-      send(data);
+      queue(data);
     },
     true
   );
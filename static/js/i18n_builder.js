@@ -125,6 +125,40 @@
     return p.replace(/^\/+/, '').replace(/\/+$/,'');
   }
 
+  let importMapKeys = null;
+  function importMapHas(specifier) {
+    // Server-side import map (gehashte URLs): geen cache-buster nodig, en dezelfde
+    // module-instantie als de imports tussen de vendor modules onderling.
+    if (importMapKeys === null) {
+      importMapKeys = new Set();
+      const node = document.querySelector('script[type="importmap"]');
+      try { Object.keys(JSON.parse(node?.textContent || '{}').imports || {}).forEach(k => importMapKeys.add(k)); }
+      catch (e) { /* geen of ongeldige map: gewone paden */ }
+    }
+    return importMapKeys.has(specifier);
+  }
+
+  let vendorBundleUrls;
+  function vendorBundles() {
+    if (vendorBundleUrls === undefined) {
+      const node = document.getElementById('i18n-vendor-bundles');
+      try { vendorBundleUrls = node ? JSON.parse(node.textContent) : null; }
+      catch (e) { vendorBundleUrls = null; }
+    }
+    return vendorBundleUrls;
+  }
+
+  function loadScript(src) {
+    // Klassiek script (TinyMCE bundels zijn geen ES modules)
+    return new Promise((resolve, reject) => {
+      const s = document.createElement('script');
+      s.src = src;
+      s.onload = () => resolve();
+      s.onerror = () => reject(new Error(`Kon script niet laden: ${src}`));
+      document.head.appendChild(s);
+    });
+  }
+
   async function importFresh(urlOrPath) {
     // Try several variants: /path, path  (both with cache-buster)
     const v = state?.config?.version ?? Date.now();
@@ -132,6 +166,11 @@
     const sep = base.includes('?') ? '&' : '?';
     const candidates = [];
 
+    const mapped = '/' + base.replace(/^\/+/, '');
+    if (importMapHas(mapped)) {
+      try { return await import(mapped); } catch (e) { /* val terug op de varianten hieronder */ }
+    }
+
     if (/^https?:\/\//i.test(base)) {
       candidates.push(base);
     } else {
@@ -330,12 +369,25 @@
     const basePathConfigured = state.config.ui.editors.tinymce.path || 'static/vendor/tinymce';
     const basePath = normalizePath(basePathConfigured);
 
-    if (!window.tinymce) {
-      await importFresh(`${basePath}/tinymce.min.js`);
-    }
     const darkDefault = (state.config.ui?.dark_default ??
                          state.config.features?.dark_mode_default ?? true);
 
+    if (!window.tinymce) {
+      // Gebundeld (tools/build_vendor_bundles.py): core+theme+model+icons+plugins en skin in
+      // 2 requests; anders de losse vendor bestanden.
+      const bundles = vendorBundles();
+      const skinBundle = bundles?.tinymce_skins?.[darkDefault ? 'dark' : 'light'];
+      try {
+        if (bundles?.tinymce) {
+          await loadScript(bundles.tinymce);
+          if (skinBundle) await loadScript(skinBundle);
+        }
+      } catch (e) {
+        console.warn('[i18n_builder] TinyMCE bundel niet geladen, val terug op losse bestanden', e);
+      }
+      if (!window.tinymce) await importFresh(`${basePath}/tinymce.min.js`);
+    }
+
     return new Promise((resolve) => {
       window.tinymce.init({
         target: textarea,
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+build_vendor_bundles.py — offline bundel-stap voor de i18n_builder editors (TinyMCE / CodeMirror / Tiptap)
+
+Wat wordt gebouwd (op basis van config/i18n_builder.json + i18n_modes.json):
+- TinyMCE: tinymce.min.js + theme/model/icons + enkel de ingeschakelde plugins -> 1 bundel
+  (static/vendor/_bundles/tinymce.bundle.js); TinyMCE laadt wat al geregistreerd is niet opnieuw
+- TinyMCE skins: ui skin + content css als JS resources (tinymce.Resource) -> 1 bundel per
+  variant (dark/light), dus ook geen losse .css requests meer
+- Tiptap / CodeMirror 6: ES modules zonder bundler (geen node/esbuild in deze tree) -> niet
+  samengevoegd; wel de module-sluiting per editor in bundles.json (import map + modulepreload
+  uit runtime/import_map.py halen ze parallel op)
+- daarna: static manifest + gz/br varianten voor alles (runtime/static_assets.py)
+
+bundles.json bevat per bundel de onderdelen met sha256, zodat validate_vendor.py verouderde
+bundels kan herkennen.
+
+Exitcodes:
+ 0 = OK, 3 = fouten
+"""
+
+from __future__ import annotations
+import os, sys, json, time, hashlib, argparse
+from typing import Dict, Any, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_DIR = os.path.join(ROOT, "config")
+STATIC_DIR = os.path.join(ROOT, "static")
+
+DEFAULT_CFG = os.path.join(CONFIG_DIR, "i18n_builder.json")
+DEFAULT_MODES = os.path.join(CONFIG_DIR, "i18n_modes.json")
+
+BUNDLE_DIR_REL = "vendor/_bundles"          # onder static/
+BUNDLE_DIR = os.path.join(STATIC_DIR, *BUNDLE_DIR_REL.split("/"))
+MANIFEST_FILE = os.path.join(BUNDLE_DIR, "bundles.json")
+
+# skin-variant -> (ui skin, content_css) zoals initTinyMCE ze kiest
+TINYMCE_SKINS = {
+    "dark": ("oxide-dark", "dark"),
+    "light": ("oxide", "default"),
+}
+
+def load_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        return {"__error__": f"Kon JSON niet laden ({path}): {e}"}
+
+def static_rel(p: str) -> str:
+    """'static/vendor/tinymce' of '/static/vendor/tinymce' -> 'vendor/tinymce' (relatief t.o.v. static/)."""
+    p = (p or "").strip().strip("/")
+    return p[len("static/"):] if p.startswith("static/") else p
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _used_editors(modes: Dict[str, Any]) -> List[str]:
+    return sorted({(m or {}).get("wysiwyg") for m in (modes.get("modes") or {}).values() if (m or {}).get("wysiwyg")})
+
+# -------------------------------------------------------------------------------------------------
+# Plan: welke bestanden in welke bundel (ook gebruikt door validate_vendor.py)
+# -------------------------------------------------------------------------------------------------
+def plan_bundles(cfg: Dict[str, Any], modes: Dict[str, Any]) -> Dict[str, List[str]]:
+    """{bundel-bestandsnaam: [paden onder static/ in volgorde]}"""
+    editors = (cfg.get("ui") or {}).get("editors") or {}
+    tcfg = editors.get("tinymce") or {}
+    plans: Dict[str, List[str]] = {}
+    if not tcfg.get("enabled", True) or "tinymce" not in _used_editors(modes):
+        return plans
+
+    base = static_rel(tcfg.get("path") or "static/vendor/tinymce")
+    plugins = str((tcfg.get("config") or {}).get("plugins") or "lists link image code table autosave").split()
+    core = [
+        f"{base}/tinymce.min.js",
+        f"{base}/themes/silver/theme.min.js",
+        f"{base}/models/dom/model.min.js",
+        f"{base}/icons/default/icons.min.js",
+    ]
+    core += [f"{base}/plugins/{p}/plugin.min.js" for p in plugins]
+    plans["tinymce.bundle.js"] = core
+
+    for variant, (ui_skin, content_css) in TINYMCE_SKINS.items():
+        plans[f"tinymce-skin-{variant}.bundle.js"] = [
+            f"{base}/skins/ui/{ui_skin}/skin.js",
+            f"{base}/skins/ui/{ui_skin}/content.js",
+            f"{base}/skins/content/{content_css}/content.js",
+        ]
+    return plans
+
+def plan_modules(cfg: Dict[str, Any], modes: Dict[str, Any]) -> Dict[str, List[str]]:
+    """{editor: [ES module paden onder static/]} — transitieve sluiting, afhankelijkheden eerst."""
+    sys.path.insert(0, ROOT)
+    try:
+        from runtime.import_map import build_module_graph
+        from tools.i18n_builder import VENDOR_MODULE_ROOTS, vendor_module_for, _editor_entries
+    except Exception:
+        return {}
+    editors = (cfg.get("ui") or {}).get("editors") or {}
+    used = _used_editors(modes)
+    graph = build_module_graph(STATIC_DIR, VENDOR_MODULE_ROOTS, vendor_module_for)
+    entries, _ = _editor_entries(cfg)
+    out: Dict[str, List[str]] = {}
+    for editor in ("tiptap", "codemirror"):
+        if editor in used and (editors.get(editor) or {}).get("enabled", True):
+            prefix = static_rel((editors.get(editor) or {}).get("path") or f"static/vendor/{editor}") + "/"
+            out[editor] = graph.closure([e for e in entries if e.startswith(prefix)])
+    return out
+
+# -------------------------------------------------------------------------------------------------
+# Build
+# -------------------------------------------------------------------------------------------------
+def build_bundles(cfg: Dict[str, Any], modes: Dict[str, Any]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    manifest: Dict[str, Any] = {"generated": time.time(), "bundles": {}, "modules": {}, "errors": []}
+
+    for name, parts in plan_bundles(cfg, modes).items():
+        chunks: List[bytes] = []
+        meta = []
+        for rel in parts:
+            p = os.path.join(STATIC_DIR, *rel.split("/"))
+            if not os.path.isfile(p):
+                manifest["errors"].append(f"{name}: ontbreekt {rel}")
+                continue
+            with open(p, "rb") as f:
+                data = f.read()
+            # ';' + newline: minified bestanden eindigen niet altijd op een statement-einde
+            chunks.append(f"/* {rel} */\n".encode("utf-8") + data.rstrip() + b"\n;\n")
+            meta.append({"path": rel, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()})
+        out = os.path.join(BUNDLE_DIR, name)
+        tmp = out + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(chunks))
+        os.replace(tmp, out)
+        manifest["bundles"][name] = {
+            "path": f"{BUNDLE_DIR_REL}/{name}",
+            "size": os.path.getsize(out),
+            "sha256": sha256_file(out),
+            "parts": meta,
+        }
+
+    for editor, mods in plan_modules(cfg, modes).items():
+        manifest["modules"][editor] = mods
+
+    manifest["build_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, MANIFEST_FILE)
+    return manifest
+
+def precompress() -> int:
+    """Static manifest + gz/br varianten (ook voor de nieuwe bundels)."""
+    sys.path.insert(0, ROOT)
+    try:
+        from runtime.static_assets import StaticManifest
+    except Exception:
+        return 0
+    return StaticManifest().build().compress_all()
+
+def main():
+    ap = argparse.ArgumentParser(description="Bouw vendor bundels voor de i18n_builder editors.")
+    ap.add_argument("--config", default=DEFAULT_CFG, help="Pad naar i18n_builder.json")
+    ap.add_argument("--modes", default=DEFAULT_MODES, help="Pad naar i18n_modes.json")
+    ap.add_argument("--no-compress", action="store_true", help="Geen gz/br varianten bouwen")
+    ap.add_argument("--json", action="store_true", help="JSON output i.p.v. tekst")
+    args = ap.parse_args()
+
+    cfg = load_json(args.config)
+    modes = load_json(args.modes)
+    if "__error__" in cfg or "__error__" in modes:
+        print(json.dumps({"status":"ERROR","config_error":cfg.get("__error__"),"modes_error":modes.get("__error__")}, ensure_ascii=False, indent=2))
+        sys.exit(3)
+
+    manifest = build_bundles(cfg, modes)
+    compressed = 0 if args.no_compress else precompress()
+
+    if args.json:
+        print(json.dumps({**manifest, "compressed": compressed}, ensure_ascii=False, indent=2))
+    else:
+        for name, b in manifest["bundles"].items():
+            print(f"  {name:32s} {len(b['parts']):3d} bestanden -> {b['size'] / 1024:8.1f} KiB")
+        for editor, mods in manifest["modules"].items():
+            print(f"  {editor + ' (ES modules)':32s} {len(mods):3d} modules (import map + modulepreload)")
+        for err in manifest["errors"]:
+            print(f"  ❌ {err}")
+        print(f"Bundels in {manifest['build_ms']} ms; {compressed} gecomprimeerde varianten")
+    sys.exit(3 if manifest["errors"] else 0)
+
+if __name__ == "__main__":
+    main()
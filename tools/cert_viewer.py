@@ -26,10 +26,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, List
 
-from flask import Flask, request, render_template_string, make_response, send_file, abort
+from flask import Flask, request, make_response, send_file, abort
 
 # Gebruik jouw centrale hub layout
 from beheer.main_layout import render_page as hub_render_page  # type: ignore
+from runtime.conditional_get import mark_deterministic
+from runtime.state_store import state_namespace
+from runtime.templates import register_template, render_registered
 
 # ===== Paths / opslag =====
 BASE_DIR = Path(__file__).resolve().parents[1]  # CyNiT-Hub/
@@ -37,8 +40,9 @@ EXPORTS_DIR = BASE_DIR / "exports"
 TMP_DIR = BASE_DIR / "tmp" / "cert_viewer"
 TMP_DIR.mkdir(parents=True, exist_ok=True)
 
-# In-memory store: token -> info dict
-_STORE: Dict[str, Dict[str, Any]] = {}
+# token -> info dict (gedeelde state store: export-links werken over workers heen)
+# Begrensd: decodes (tot 8 KB per extensie) 15 min bewaren, max 200 stuks / ~16 MB (LRU)
+_STORE = state_namespace("cert_viewer.decoded", default_ttl=15 * 60, max_entries=200, max_bytes=16 * 1024 * 1024)
 
 # ====== Helpers voor detectie & parsing ======
 _B64_RE = re.compile(r"^[A-Za-z0-9+/=\s]+$")
@@ -342,7 +346,7 @@ textarea.in { min-height: 120px; resize: vertical; }
 
 
 def _render_page(*, error: Optional[str] = None, info: Optional[Dict[str, Any]] = None, token: Optional[str] = None):
-    content_html = render_template_string(CONTENT_TEMPLATE, error=error, info=info, token=token)
+    content_html = render_registered("cert_viewer/content.html", error=error, info=info, token=token)
     return hub_render_page(title="Certificate / CSR Viewer", content_html=content_html)
 
 
@@ -455,13 +459,16 @@ def build_xlsx_bytes(info: Dict[str, Any]) -> Optional[bytes]:
 
 def _require_token() -> Dict[str, Any]:
     token = (request.args.get("token") or "").strip()
-    if not token or token not in _STORE:
+    info = _STORE.get(token) if token else None
+    if not info:
         abort(400, "Token ontbreekt of is ongeldig.")
-    return _STORE[token]
+    return info
 
 
 # ======= Routes =======
 def register_web_routes(app: Flask):
+    register_template(app, "cert_viewer/content.html", CONTENT_TEMPLATE)
+
     @app.route("/cert", methods=["GET", "POST"])
     def cert_index():
         if request.method == "GET":
@@ -498,6 +505,9 @@ def register_web_routes(app: Flask):
 
         return _render_page(error=error, info=info, token=token)
 
+    # lege form hangt enkel van de layout af -> 304 zonder render
+    mark_deterministic(app, "cert_index")
+
     @app.get("/cert/download/<fmt>")
     def cert_download(fmt: str):
         info = _require_token()
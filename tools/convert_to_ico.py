@@ -17,8 +17,9 @@ import io
 from pathlib import Path
 from typing import List, Tuple, Optional
 
-from flask import Flask, request, render_template_string, send_file, make_response
+from flask import Flask, request, send_file, make_response
 from beheer.main_layout import render_page as hub_render_page  # hub layout
+from runtime.templates import register_template, render_registered
 
 try:
     from PIL import Image, ImageOps
@@ -204,8 +205,8 @@ CONTENT_TEMPLATE = r"""
 
 
 def _render(err: Optional[str] = None, sizes_str: str = DEFAULT_SIZES, mode: str = "contain", pad: bool = True):
-    content_html = render_template_string(
-        CONTENT_TEMPLATE,
+    content_html = render_registered(
+        "convert_to_ico/content.html",
         err=err,
         sizes_str=sizes_str,
         default_sizes=DEFAULT_SIZES,
@@ -217,6 +218,8 @@ def _render(err: Optional[str] = None, sizes_str: str = DEFAULT_SIZES, mode: str
 
 # ===== Routes =====
 def register_web_routes(app: Flask):
+    register_template(app, "convert_to_ico/content.html", CONTENT_TEMPLATE)
+
     @app.route("/ico", methods=["GET", "POST"])
     def ico_index():
         sizes_str = (request.form.get("sizes") or DEFAULT_SIZES).strip()
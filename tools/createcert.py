@@ -26,7 +26,6 @@ from __future__ import annotations
 
 import base64
 import ipaddress
-import json
 import os
 import secrets
 import string
@@ -42,6 +41,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from flask import Flask, request, send_from_directory
 
 from beheer.main_layout import render_page as hub_render_page
+from runtime.config_store import read_json, thaw
 
 
 # =========================
@@ -94,19 +94,11 @@ CFG: Dict[str, Any] = dict(DEFAULTS)
 
 
 def _safe_json_load(path: Path, fallback: Dict[str, Any]) -> Dict[str, Any]:
-    try:
-        if not path.exists():
-            return dict(fallback)
-        raw = path.read_text(encoding="utf-8").strip()
-        if not raw:
-            return dict(fallback)
-        data = json.loads(raw)
-        if isinstance(data, dict):
-            merged = dict(fallback)
-            merged.update(data)
-            return merged
-    except Exception:
-        pass
+    data = read_json(path)
+    if isinstance(data, dict):
+        merged = dict(fallback)
+        merged.update(thaw(data))
+        return merged
     return dict(fallback)
 
 
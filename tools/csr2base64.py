@@ -33,7 +33,7 @@ from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from flask import Flask, make_response, redirect, render_template_string, request, send_file
+from flask import Flask, make_response, redirect, request, send_file
 
 # =========================================================
 # Hub layout import (met standalone fallback)
@@ -73,7 +73,18 @@ except Exception:
 </html>"""
 
 
-LAST_RESULT: Optional[Dict[str, Any]] = None
+# Template registry (werkt ook op de standalone Flask app)
+from runtime.templates import register_template, render_registered  # noqa: E402
+
+
+# Laatste resultaat (gedeelde state store, zodat /download op elke worker werkt)
+from runtime.state_store import state_namespace  # noqa: E402
+
+_STATE = state_namespace("csr2base64")
+
+
+def _last_result() -> Optional[Dict[str, Any]]:
+    return _STATE.get("last_result")
 
 
 def _b64_single_line(data: bytes) -> str:
@@ -223,8 +234,8 @@ function clearInput() {
 
 
 def _render(err: Optional[str] = None, ok: Optional[str] = None, input_text: str = "", result: Optional[Dict[str, Any]] = None):
-    content_html = render_template_string(
-        CONTENT_TEMPLATE,
+    content_html = render_registered(
+        "csr2base64/content.html",
         err=err,
         ok=ok,
         input_text=input_text,
@@ -235,13 +246,13 @@ def _render(err: Optional[str] = None, ok: Optional[str] = None, input_text: str
 
 
 def register_web_routes(app: Flask) -> None:
+    register_template(app, "csr2base64/content.html", CONTENT_TEMPLATE)
+
     @app.get("/csr2base64")
     @app.post("/csr2base64")
     def csr2base64_page():
-        global LAST_RESULT
-
         if request.method == "GET":
-            return _render(None, None, input_text="", result=LAST_RESULT)
+            return _render(None, None, input_text="", result=_last_result())
 
         # POST
         input_text = (request.form.get("input_text") or "").strip()
@@ -271,25 +282,27 @@ def register_web_routes(app: Flask) -> None:
             return _render(err="Input is leeg.", input_text=input_text)
 
         b64 = _b64_single_line(raw)
-        LAST_RESULT = {
+        result = {
             "source": source,
             "byte_len": len(raw),
             "b64_len": len(b64),
             "b64": b64,
         }
+        _STATE["last_result"] = result
 
-        return _render(ok="OK: Base64 gegenereerd.", input_text=input_text, result=LAST_RESULT)
+        return _render(ok="OK: Base64 gegenereerd.", input_text=input_text, result=result)
 
     @app.get("/csr2base64/download")
     def csr2base64_download():
-        if not LAST_RESULT:
+        last = _last_result()
+        if not last:
             return make_response("Nog niets om te downloaden. Doe eerst een encode.", 400)
 
-        b64 = (LAST_RESULT.get("b64") or "").strip() + "\n"
+        b64 = (last.get("b64") or "").strip() + "\n"
         data = b64.encode("utf-8")
 
         suggested = "csr2base64_output.b64"
-        src = str(LAST_RESULT.get("source") or "")
+        src = str(last.get("source") or "")
         if src.startswith("file:"):
             fn = src.replace("file:", "", 1).strip()
             suggested = f"{_safe_stem(fn)}.b64"
@@ -12,12 +12,23 @@ Afgestemd op de perfect werkende token2dcb-flow:
 - Endpoints-editor en dynamische request-UI blijven behouden.
 """
 from __future__ import annotations
-import os, json, time, uuid, base64, pathlib
+import os, sys, json, time, uuid, base64, pathlib
 from typing import Dict, Any, Optional, Tuple, List
 from flask import Flask, request, abort, Response, jsonify
 
-# ---------- Sessies ----------
-SESSIONS: Dict[str, Dict[str, Any]] = {}
+# project root op sys.path: standalone (python tools/dcbapi.py) vindt zo ook runtime/
+_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+# Config store: gecachte snapshots + atomic writes (ook standalone)
+from runtime.config_store import read_json, write_json  # noqa: E402
+
+# ---------- Sessies (gedeelde state store) ----------
+# Begrensd: ttl = expires_in van het sessie-token (default 1u), max 200 sessies (LRU)
+from runtime.state_store import state_namespace, token_ttl  # noqa: E402
+
+SESSIONS = state_namespace("dcbapi.sessions", default_ttl=3600, max_entries=200)
 
 # ---------- OP / API settings (in lijn met token2dcb) ----------
 OP_BASES = {
@@ -69,15 +80,12 @@ def _session_dir(session_id: str) -> str:
 def _save_file(path: str, content: str) -> None:
     pathlib.Path(path).write_text(content, encoding="utf-8")
 
+def _save_json(path: str, obj: Any) -> None:
+    write_json(path, obj)
+
 def _load_json_object(path: str, default: dict) -> dict:
-    p = pathlib.Path(path)
-    if not p.exists():
-        return default
-    try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
-        return obj if isinstance(obj, dict) else default
-    except Exception:
-        return default
+    obj = read_json(path)
+    return obj if isinstance(obj, dict) else default
 
 def _load_scope_mapping() -> Dict[str, str]:
     default = {
@@ -94,7 +102,7 @@ def _load_scope_mapping() -> Dict[str, str]:
 
 def _save_scope_mapping(mapping: Dict[str, str]) -> None:
     _ensure_config_dir()
-    _save_file(SCOPES_FILE, json.dumps(mapping, ensure_ascii=False, indent=2))
+    _save_json(SCOPES_FILE, mapping)
 
 def _load_vault_raw() -> Dict[str, dict]:
     return _load_json_object(VAULT_FILE, {})
@@ -109,7 +117,7 @@ def _load_endpoints() -> Dict[str, dict]:
 
 def _save_endpoints(mapping: Dict[str, dict]) -> None:
     _ensure_config_dir()
-    _save_file(ENDPOINTS_FILE, json.dumps(mapping, ensure_ascii=False, indent=2))
+    _save_json(ENDPOINTS_FILE, mapping)
 
 # ---------- JWK / JWT helpers ----------
 try:
@@ -995,7 +1003,8 @@ def register_web_routes(app: Flask):
             scopes_resp  = data.get("scope") or ""
 
             # sessie + files
-            SESSIONS[session_id] = {"token": access_token, "scopes": scopes_resp, "op_base": op_base, "created_ts": int(time.time())}
+            SESSIONS.put(session_id, {"token": access_token, "scopes": scopes_resp, "op_base": op_base, "created_ts": int(time.time())},
+                         ttl=token_ttl(data))
             _ensure_data_dir()
             sd = _session_dir(session_id)
             _save_file(os.path.join(sd, "access_token.txt"), access_token)
@@ -8,24 +8,39 @@
 from __future__ import annotations
 import os
 import io
+import sys
 import re
 import json
 import shutil
 import zipfile
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from flask import (
-    Blueprint, request, jsonify, send_file, render_template_string,
+    Blueprint, request, jsonify, send_file,
     current_app, redirect, url_for, send_from_directory, Response, Flask
 )
 
+# ---- Project root op sys.path (standalone: python tools/i18n_builder.py) -----
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
 # ---- Hub layout (optioneel) -------------------------------------------------
 try:
     from beheer.main_layout import render_page as hub_render_page  # type: ignore
 except Exception:
     hub_render_page = None  # fallback gebruiken in standalone
 
+# ---- Config store (gecachte snapshots + atomic writes, ook standalone) -------
+from runtime.config_store import read_json, write_json  # noqa: E402
+
+# ---- Template registry (werkt ook op de standalone Flask app) ----------------
+from runtime.templates import register_template, render_registered  # noqa: E402
+
+# ---- Import map builder (modulegraaf van de vendor ES modules) --------------
+from runtime.import_map import build_module_graph, render_import_map  # noqa: E402
+
 # ---- Optional deps ----------------------------------------------------------
 try:
     import yaml
@@ -71,21 +86,17 @@ os.makedirs(TEMPLATES_DIR, exist_ok=True)
 
 CONFIG_FILE = os.path.join(CONFIG_DIR, "i18n_builder.json")
 MODES_FILE = os.path.join(CONFIG_DIR, "i18n_modes.json")
+BUNDLES_FILE = os.path.join(STATIC_DIR, "vendor", "_bundles", "bundles.json")  # tools/build_vendor_bundles.py
 BACKUP_MAX_VERSIONS = 10
 
 # -------------------------------------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------------------------------------
 def load_json(path: str):
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return read_json(path, {})
 
 def save_json(path: str, data):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_json(path, data)
 
 def safe_name(name: str) -> str:
     if not name:
@@ -328,6 +339,8 @@ CSS_INJECT_SNIPPET = r"""
 EDITOR_CONTENT = r"""
 {{ base_style | safe }}
 {{ css_inject | safe }}
+{{ import_map | safe }}
+{{ vendor_bundles | safe }}
 <div class="i18n-wrap">
   <h1>I18N Builder</h1>
   <p class="muted">Beheer en bouw vertalings-/publicatiebundels (import, merge, export, preview, PDF).</p>
@@ -360,6 +373,8 @@ EDITOR_CONTENT = r"""
 LANG_CONTENT = r"""
 {{ base_style | safe }}
 {{ css_inject | safe }}
+{{ import_map | safe }}
+{{ vendor_bundles | safe }}
 <div class="i18n-wrap">
   <h1>I18N Builder — Taalbeheer</h1>
   <p class="muted">Beheer Jinja-templates en publicatiebestandsnamen.</p>
@@ -443,7 +458,194 @@ def _render(content_html: str, title: str = "I18N Builder"):
     )
 
 # -------------------------------------------------------------------------------------------------
-# GLOBAL SHIMS (root-level) – met dubbele check voor Tiptap extensions
+# Vendor module resolutie (CDN-specifier -> lokaal bestand onder static/)
+# Eén bron van waarheid voor de import map én de shims hieronder.
+# -------------------------------------------------------------------------------------------------
+VENDOR_MODULE_ROOTS = ("vendor/tiptap", "vendor/codemirror")
+
+PM_MODULES = {
+    "commands", "history", "model", "schema-basic", "schema-list", "state",
+    "transform", "view", "keymap", "gapcursor", "dropcursor", "orderedmap",
+}
+CM_DEPS = {"crelt", "style-mod", "w3c-keyname", "find-cluster-break"}
+
+
+def _split_specifier(spec: str):
+    """'/@tiptap/pm@^3.15.3/state?target=es2022' -> ('@tiptap/pm', 'state')."""
+    spec = spec.split("?", 1)[0].lstrip("/")
+    parts = spec.split("/")
+    if spec.startswith("@") and len(parts) > 1:
+        pkg, rest = f"{parts[0]}/{parts[1]}", parts[2:]
+    else:
+        pkg, rest = parts[0], parts[1:]
+    scope, _, name_ver = pkg.rpartition("/")
+    name = name_ver.split("@", 1)[0]
+    return (f"{scope}/{name}" if scope else name), "/".join(rest)
+
+
+def vendor_module_for(spec: str):
+    """Pad onder static/ ('vendor/tiptap/core/index.js') of None."""
+    pkg, rest = _split_specifier(spec)
+    candidates = []
+    if pkg == "@tiptap/pm":
+        key = rest.split("/", 1)[0]
+        if key in PM_MODULES:
+            candidates.append(f"vendor/tiptap/prosemirror/{key}.js")
+    elif pkg in ("@tiptap/core", "@tiptap/starter-kit"):
+        candidates.append(f"vendor/tiptap/{pkg.split('/', 1)[1]}/index.js")
+    elif pkg.startswith("@tiptap/extension-"):
+        # dubbele check: eerst ext-<name>/index.js, dan extensions/<name>/index.js
+        ext_name = pkg[len("@tiptap/extension-"):]
+        candidates += [f"vendor/tiptap/ext-{ext_name}/index.js", f"vendor/tiptap/extensions/{ext_name}/index.js"]
+    elif pkg.startswith("@codemirror/"):
+        candidates.append(f"vendor/codemirror/{pkg.split('/', 1)[1]}/index.js")
+    elif pkg in CM_DEPS or pkg == "@marijn/find-cluster-break":
+        candidates.append(f"vendor/codemirror/deps/{pkg.rsplit('/', 1)[-1]}.js")
+    elif pkg.startswith("prosemirror-") or pkg == "orderedmap":
+        mod = pkg[len("prosemirror-"):] if pkg.startswith("prosemirror-") else pkg
+        if mod in PM_MODULES:
+            candidates.append(f"vendor/tiptap/prosemirror/{mod}.js")
+    elif pkg == "linkifyjs":
+        candidates.append("vendor/tiptap/ext-link/linkify.js")
+
+    for rel in candidates:
+        if os.path.isfile(os.path.join(STATIC_DIR, *rel.split("/"))):
+            return rel
+    return None
+
+
+def _send_vendor(spec: str, not_found: str):
+    rel = vendor_module_for(spec)
+    if rel is None:
+        return Response(not_found, 404)
+    return send_file(os.path.join(STATIC_DIR, *rel.split("/")), mimetype="application/javascript")
+
+# -------------------------------------------------------------------------------------------------
+# Import map + modulepreload (editor pagina's)
+# Browser haalt vendor modules rechtstreeks (gehasht, parallel) op; shims blijven als fallback
+# voor browsers zonder import maps en voor niet-gemapte specifiers.
+# -------------------------------------------------------------------------------------------------
+_IMPORT_MAP: Dict[str, Any] = {"key": None, "graph": None, "graph_key": None}
+_BUNDLES: Dict[str, Any] = {"key": None}
+
+
+def _vendor_signature() -> tuple:
+    """
+    Goedkope versie van de vendor tree: bundles.json + de module roots en hun directe
+    submappen (een vendor update/build vervangt pakketmappen -> mtime van de parent wijzigt).
+    """
+    sig = [os.path.getmtime(BUNDLES_FILE) if os.path.isfile(BUNDLES_FILE) else 0]
+    for root in VENDOR_MODULE_ROOTS:
+        top = os.path.join(STATIC_DIR, *root.split("/"))
+        try:
+            sig.append(os.path.getmtime(top))
+            with os.scandir(top) as it:
+                sig.extend(sorted((e.name, e.stat().st_mtime) for e in it if e.is_dir()))
+        except OSError:
+            sig.append(0)
+    return tuple(sig)
+
+
+def _module_graph(vendor_sig: Optional[tuple] = None):
+    if vendor_sig is None:
+        vendor_sig = _vendor_signature()
+    if _IMPORT_MAP["graph"] is None or _IMPORT_MAP["graph_key"] != vendor_sig:
+        _IMPORT_MAP["graph"] = build_module_graph(STATIC_DIR, VENDOR_MODULE_ROOTS, vendor_module_for)
+        _IMPORT_MAP["graph_key"] = vendor_sig
+    return _IMPORT_MAP["graph"]
+
+
+def _static_rel(path: str, module: str) -> str:
+    base = (path or "").strip().strip("/")
+    if base.startswith("static/"):
+        base = base[len("static/"):]
+    return f"{base}/{module}".strip("/")
+
+
+def _editor_entries(cfg: Dict[str, Any]):
+    """(alle editor entry modules, preload entries voor de default mode)."""
+    editors = ((cfg.get("ui") or {}).get("editors") or {}) if isinstance(cfg, dict) else {}
+    tiptap = editors.get("tiptap") or {}
+    cm = editors.get("codemirror") or {}
+    tiptap_entries = [_static_rel(tiptap.get("path", ""), m) for m in (tiptap.get("modules") or {}).values()]
+    cm_base = cm.get("path", "")
+    cm_entries = [_static_rel(cm_base, "view/index.js"), _static_rel(cm_base, "state/index.js")]
+    cm_langs = [_static_rel(cm_base, f"lang-{m}/index.js") for m in (cm.get("modes") or [])]
+
+    modes = load_json(MODES_FILE) or {}
+    default = (modes.get("modes") or {}).get(modes.get("default_mode") or "markdown") or {}
+    if default.get("wysiwyg") == "tiptap" and tiptap.get("enabled", True):
+        preload = tiptap_entries
+    elif default.get("wysiwyg") == "codemirror" and cm.get("enabled", True):
+        preload = cm_entries + [_static_rel(cm_base, f"lang-{default.get('syntax')}/index.js")]
+    else:
+        preload = []
+    return tiptap_entries + cm_entries + cm_langs, preload
+
+
+def _import_map_html() -> str:
+    """<script type="importmap"> + modulepreload links; gecached per config/manifest/vendor versie."""
+    try:
+        vendor_sig = _vendor_signature()
+        key = (
+            os.path.getmtime(CONFIG_FILE) if os.path.isfile(CONFIG_FILE) else 0,
+            os.path.getmtime(MODES_FILE) if os.path.isfile(MODES_FILE) else 0,
+            id(current_app.extensions.get("cynit_static")),
+            vendor_sig,
+        )
+        if _IMPORT_MAP["key"] == key:
+            return _IMPORT_MAP["html"]
+        entries, preload = _editor_entries(load_json(CONFIG_FILE))
+        out = render_import_map(
+            _module_graph(vendor_sig),
+            lambda rel: url_for("static", filename=rel),
+            entries=preload,
+            aliases=entries,
+        )
+        _IMPORT_MAP.update(key=key, html=out)
+        return out
+    except Exception as e:
+        current_app.logger.warning("[i18n_builder] import map niet gebouwd: %s", e)
+        return ""
+
+
+def _vendor_bundles_html() -> str:
+    """
+    URLs van de TinyMCE bundels (tools/build_vendor_bundles.py) voor i18n_builder.js.
+    Geen bundels gebouwd -> lege string en de editor laadt de losse vendor bestanden.
+    """
+    try:
+        key = (
+            os.path.getmtime(BUNDLES_FILE) if os.path.isfile(BUNDLES_FILE) else 0,
+            id(current_app.extensions.get("cynit_static")),
+        )
+        if _BUNDLES["key"] == key:
+            return _BUNDLES["html"]
+        out = ""
+        built = ((load_json(BUNDLES_FILE) or {}).get("bundles") or {}) if key[0] else {}
+        urls = {}
+        for name, entry in built.items():
+            rel = str((entry or {}).get("path") or "")
+            if rel and os.path.isfile(os.path.join(STATIC_DIR, *rel.split("/"))):
+                urls[name] = url_for("static", filename=rel)
+        if "tinymce.bundle.js" in urls:
+            data = {
+                "tinymce": urls["tinymce.bundle.js"],
+                "tinymce_skins": {
+                    v: urls[f"tinymce-skin-{v}.bundle.js"] for v in ("dark", "light")
+                    if f"tinymce-skin-{v}.bundle.js" in urls
+                },
+            }
+            out = ('<script type="application/json" id="i18n-vendor-bundles">'
+                   + json.dumps(data).replace("<", "\\u003c") + "</script>")
+        _BUNDLES.update(key=key, html=out)
+        return out
+    except Exception as e:
+        current_app.logger.warning("[i18n_builder] vendor bundels niet geladen: %s", e)
+        return ""
+
+# -------------------------------------------------------------------------------------------------
+# GLOBAL SHIMS (root-level) – fallback voor specifiers die niet via de import map lopen
 # -------------------------------------------------------------------------------------------------
 @shim_bp.route("/@tiptap/<path:req>")
 def tiptap_shim_global(req: str):
@@ -454,135 +656,42 @@ def tiptap_shim_global(req: str):
     /@tiptap/extension-bold@^2.6.6?target=es2022
     /@tiptap/pm@^2.6.6/state?target=es2022
     """
-    req = req.split("?", 1)[0]
-    first = req.split("/", 1)[0]  # bv. "extension-bold@^2.6.6" of "pm@^2.6.6"
-    name = first.split("@", 1)[0]  # "extension-bold" | "core" | "starter-kit" | "pm"
-    rest = req[len(first):].lstrip("/")
-    base_dir = os.path.join(STATIC_DIR, "vendor", "tiptap")
-
-    def try_send(relpath: str):
-        if not relpath:
-            return None
-        abspath = os.path.join(base_dir, relpath)
-        if os.path.isfile(abspath):
-            return send_file(abspath, mimetype="application/javascript")
-        return None
-
-    if name == "pm":
-        mapping = {
-            "commands": "prosemirror/commands.js",
-            "history": "prosemirror/history.js",
-            "model": "prosemirror/model.js",
-            "schema-basic": "prosemirror/schema-basic.js",
-            "schema-list": "prosemirror/schema-list.js",
-            "state": "prosemirror/state.js",
-            "transform": "prosemirror/transform.js",
-            "view": "prosemirror/view.js",
-            "keymap": "prosemirror/keymap.js",
-            "gapcursor": "prosemirror/gapcursor.js",
-            "dropcursor": "prosemirror/dropcursor.js",
-        }
-        key = rest.split("/", 1)[0] if rest else ""
-        resp = try_send(mapping.get(key, ""))
-        return resp if resp else Response("unknown pm module", 404)
-
-    if name == "core":
-        resp = try_send("core/index.js")
-        return resp if resp else Response("core not found", 404)
-
-    if name == "starter-kit":
-        resp = try_send("starter-kit/index.js")
-        return resp if resp else Response("starter-kit not found", 404)
-
-    if name.startswith("extension-"):
-        # dubbele check: eerst ext-<name>/index.js, dan extensions/<name>/index.js
-        ext_name = name.replace("extension-", "")
-        resp = try_send(f"ext-{ext_name}/index.js")
-        if resp:
-            return resp
-        resp = try_send(f"extensions/{ext_name}/index.js")
-        if resp:
-            return resp
-        return Response("extension not found", 404)
-
-    return Response("unknown tiptap path", 404)
+    return _send_vendor("/@tiptap/" + req, "unknown tiptap path")
 
 @shim_bp.route("/@codemirror/<path:req>")
 def codemirror_shim_global(req: str):
-    req = req.split("?", 1)[0]
-    first = req.split("/", 1)[0]  # "state@..." of "view@..."
-    name = first.split("@", 1)[0]  # "state" | "view"
-    base_dir = os.path.join(STATIC_DIR, "vendor", "codemirror")
-    if name == "state":
-        p = os.path.join(base_dir, "state", "index.js")
-        if os.path.isfile(p): return send_file(p, mimetype="application/javascript")
-    if name == "view":
-        p = os.path.join(base_dir, "view", "index.js")
-        if os.path.isfile(p): return send_file(p, mimetype="application/javascript")
-    return Response("unknown codemirror module", 404)
+    return _send_vendor("/@codemirror/" + req, "unknown codemirror module")
 
 @shim_bp.route("/crelt@<path:rest>")
 def crelt_shim(rest: str):
-    p = os.path.join(STATIC_DIR, "vendor", "codemirror", "deps", "crelt.js")
-    if not os.path.isfile(p): return Response("crelt not found", 404)
-    return send_file(p, mimetype="application/javascript")
+    return _send_vendor("/crelt@" + rest, "crelt not found")
 
 @shim_bp.route("/style-mod@<path:rest>")
 def stylemod_shim(rest: str):
-    p = os.path.join(STATIC_DIR, "vendor", "codemirror", "deps", "style-mod.js")
-    if not os.path.isfile(p): return Response("style-mod not found", 404)
-    return send_file(p, mimetype="application/javascript")
+    return _send_vendor("/style-mod@" + rest, "style-mod not found")
 
 @shim_bp.route("/w3c-keyname@<path:rest>")
 def keyname_shim(rest: str):
-    p = os.path.join(STATIC_DIR, "vendor", "codemirror", "deps", "w3c-keyname.js")
-    if not os.path.isfile(p): return Response("w3c-keyname not found", 404)
-    return send_file(p, mimetype="application/javascript")
+    return _send_vendor("/w3c-keyname@" + rest, "w3c-keyname not found")
 
 @shim_bp.route("/@marijn/find-cluster-break@<path:rest>")
 def find_cluster_break_shim(rest: str):
-    p = os.path.join(STATIC_DIR, "vendor", "codemirror", "deps", "find-cluster-break.js")
-    if not os.path.isfile(p): return Response("find-cluster-break not found", 404)
-    return send_file(p, mimetype="application/javascript")
+    return _send_vendor("/@marijn/find-cluster-break@" + rest, "find-cluster-break not found")
 
 # orderedmap losse alias (zekerheid)
 @shim_bp.route("/orderedmap@<path:rest>")
 def orderedmap_shim(rest: str):
-    p = os.path.join(STATIC_DIR, "vendor", "tiptap", "prosemirror", "orderedmap.js")
-    if not os.path.isfile(p): return Response("orderedmap not found", 404)
-    return send_file(p, mimetype="application/javascript")
+    return _send_vendor("/orderedmap@" + rest, "orderedmap not found")
 
 # Directe prosemirror-* CDN paden -> lokale prosemirror/*.js
 @shim_bp.route("/prosemirror-<path:req>")
 def prosemirror_pkg_shim(req: str):
-    pkg = req.split("@", 1)[0] if "@" in req else req.split("/", 1)[0]
-    mapping = {
-        "prosemirror-model": "model.js",
-        "prosemirror-transform": "transform.js",
-        "prosemirror-state": "state.js",
-        "prosemirror-view": "view.js",
-        "prosemirror-commands": "commands.js",
-        "prosemirror-history": "history.js",
-        "prosemirror-schema-basic": "schema-basic.js",
-        "prosemirror-schema-list": "schema-list.js",
-        "prosemirror-keymap": "keymap.js",
-        "prosemirror-gapcursor": "gapcursor.js",
-        "prosemirror-dropcursor": "dropcursor.js",
-    }
-    rel = mapping.get(pkg)
-    if not rel:
-        return Response("unknown prosemirror package", 404)
-    abspath = os.path.join(STATIC_DIR, "vendor", "tiptap", "prosemirror", rel)
-    if not os.path.isfile(abspath):
-        return Response("prosemirror module not found", 404)
-    return send_file(abspath, mimetype="application/javascript")
+    return _send_vendor("/prosemirror-" + req, "unknown prosemirror package")
 
 # Linkify CDN alias -> lokale bundel
 @shim_bp.route("/linkifyjs@<path:rest>")
 def linkify_shim_global(rest: str):
-    p = os.path.join(STATIC_DIR, "vendor", "tiptap", "ext-link", "linkify.js")
-    if not os.path.isfile(p): return Response("linkify stub not found", 404)
-    return send_file(p, mimetype="application/javascript")
+    return _send_vendor("/linkifyjs@" + rest, "linkify stub not found")
 
 # -------------------------------------------------------------------------------------------------
 # /i18n routes (UI + API)
@@ -602,7 +711,11 @@ def serve_i18n_modes_json():
 # -- UI (content-only via layout)
 @bp.route("/")
 def ui():
-    html = render_template_string(EDITOR_CONTENT, base_style=BASE_STYLE, css_inject=CSS_INJECT_SNIPPET, err=None)
+    html = render_registered(
+        "i18n_builder/editor.html",
+        base_style=BASE_STYLE, css_inject=CSS_INJECT_SNIPPET, import_map=_import_map_html(),
+        vendor_bundles=_vendor_bundles_html(), err=None,
+    )
     return _render(html, title="I18N Builder")
 
 @bp.route("", methods=["GET"])
@@ -611,7 +724,11 @@ def ui_redirect_no_slash():
 
 @bp.route("/languages")
 def languages_page():
-    html = render_template_string(LANG_CONTENT, base_style=BASE_STYLE, css_inject=CSS_INJECT_SNIPPET)
+    html = render_registered(
+        "i18n_builder/languages.html",
+        base_style=BASE_STYLE, css_inject=CSS_INJECT_SNIPPET, import_map=_import_map_html(),
+        vendor_bundles=_vendor_bundles_html(),
+    )
     return _render(html, title="I18N Builder — Taalbeheer")
 
 # -- Load/Save
@@ -1047,6 +1164,8 @@ def preview_template():
 # Tool registration
 # -------------------------------------------------------------------------------------------------
 def register_tool(app):
+    register_template(app, "i18n_builder/editor.html", EDITOR_CONTENT)
+    register_template(app, "i18n_builder/languages.html", LANG_CONTENT)
     app.register_blueprint(bp)      # /i18n/*
     app.register_blueprint(shim_bp) # /* (root-level shims)
     current_app_logger = getattr(app, "logger", None)
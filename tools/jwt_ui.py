@@ -21,11 +21,19 @@ JWT Generator tool for CyNiT-Hub
 
 from __future__ import annotations
 
-import json, time, uuid, base64
+import json, time, uuid, base64, pathlib, sys
 from flask import Flask, request, url_for, abort, Response
 
-# In-memory opslag van tokens (kortlevend)
-TOKENS: dict[str, str] = {}
+# project root op sys.path: standalone (python tools/jwt_ui.py) vindt zo ook runtime/
+_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+# Kortlevende opslag van tokens (gedeelde state store)
+# Begrensd: ttl = exp van het token (10 min), max 500 tokens (LRU)
+from runtime.state_store import state_namespace  # noqa: E402
+
+TOKENS = state_namespace("jwt_ui.tokens", default_ttl=600, max_entries=500)
 
 ALLOWED_AUDIENCES = {
     "https://authenticatie.vlaanderen.be/op",
@@ -322,7 +330,7 @@ def register_web_routes(app):
             token = jwt.encode(claims, key, algorithm=alg)
 
             token_id = str(uuid.uuid4())
-            TOKENS[token_id] = token
+            TOKENS.put(token_id, token, ttl=max(1, claims["exp"] - int(time.time())))
             dl = url_for("jwt_download", token_id=token_id, _external=False)
 
             return _form(
@@ -27,14 +27,27 @@ import uuid
 import base64
 import os
 import pathlib
+import sys
 from typing import Dict, Tuple, Any, Optional, List
 
 from flask import Flask, request, url_for, abort, Response, jsonify
 
+# project root op sys.path: standalone (python tools/token2dcb.py) vindt zo ook runtime/
+_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+# Config store: gecachte snapshots + atomic writes (ook standalone)
+from runtime.config_store import read_json, write_json  # noqa: E402
+
 # =========================
-# Korte token-cache voor download
+# Korte token-cache voor download (gedeelde state store)
 # =========================
-TOKENS: Dict[str, str] = {}
+# Begrensd: ttl = expires_in van het access token (default 1u), max 500 tokens (LRU)
+from runtime.state_store import state_namespace, token_ttl  # noqa: E402
+
+TOKENS = state_namespace("token2dcb.tokens", default_ttl=3600, max_entries=500)
+
 
 # =========================
 # OP-bases (whitelist) + suffix
@@ -97,14 +110,16 @@ def _ensure_config_dir() -> None:
     pathlib.Path(CONFIG_DIR).mkdir(parents=True, exist_ok=True)
 
 
+def _read_json_object(path: str) -> Optional[dict]:
+    """dict uit config (gecachte snapshot), None als missing/ongeldig."""
+    obj = read_json(path)
+    return obj if isinstance(obj, dict) else None
+
+
 def _load_scope_mapping() -> Dict[str, str]:
-    p = pathlib.Path(SCOPES_FILE)
-    if p.exists():
-        try:
-            obj = json.loads(p.read_text(encoding="utf-8"))
-            return obj if isinstance(obj, dict) else {}
-        except Exception:
-            pass
+    obj = _read_json_object(SCOPES_FILE)
+    if obj is not None:
+        return obj
     # Defaults met gebruiksvriendelijke labels
     return {
         "dvl_dcbaas_app_application_admin": "DCBaaS Beheer Toepassingen",
@@ -120,31 +135,15 @@ def _load_scope_mapping() -> Dict[str, str]:
 
 def _save_scope_mapping(mapping: Dict[str, str]) -> None:
     _ensure_config_dir()
-    pathlib.Path(SCOPES_FILE).write_text(
-        json.dumps(mapping, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    write_json(SCOPES_FILE, mapping)
 
 
 def _load_clients_mapping() -> Dict[str, str]:
-    p = pathlib.Path(CLIENTS_FILE)
-    if p.exists():
-        try:
-            obj = json.loads(p.read_text(encoding="utf-8"))
-            return obj if isinstance(obj, dict) else {}
-        except Exception:
-            return {}
-    return {}
+    return _read_json_object(CLIENTS_FILE) or {}
 
 
 def _load_vault_raw() -> Dict[str, dict]:
-    p = pathlib.Path(VAULT_FILE)
-    if not p.exists():
-        return {}
-    try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
-        return obj if isinstance(obj, dict) else {}
-    except Exception:
-        return {}
+    return _read_json_object(VAULT_FILE) or {}
 
 
 def _load_vault_meta() -> Dict[str, dict]:
@@ -840,7 +839,7 @@ def register_web_routes(app: Flask):
             scopes_resp = data.get("scope") or ""
 
             token_id = str(uuid.uuid4())
-            TOKENS[token_id] = access_token
+            TOKENS.put(token_id, access_token, ttl=token_ttl(data))
             dl = url_for("token2dcb_download", token_id=token_id, _external=False)
 
             mapping = _load_scope_mapping()
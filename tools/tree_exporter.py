@@ -28,10 +28,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from flask import Flask, render_template_string, request, send_file, abort
+from flask import Flask, request, send_file, abort
 
 # Hub layout (zoals je andere tools)
 from beheer.main_layout import render_page as hub_render_page
+from runtime.templates import register_template, render_registered
 
 
 # =============================================================================
@@ -563,8 +564,8 @@ def _render(
     start_project = str(_default_start_dir())
     start_home = str(Path.home())
 
-    content_html = render_template_string(
-        CONTENT_TEMPLATE,
+    content_html = render_registered(
+        "tree_exporter/content.html",
         err=err,
         ok=ok,
         current_path=str(cur),
@@ -653,8 +654,8 @@ code { background: rgba(255,255,255,.06); padding: 2px 6px; border-radius: 8px;
 
 
 def _render_exports(rows: List[Dict[str, str]]) -> str:
-    content = render_template_string(
-        EXPORTS_TEMPLATE,
+    content = render_registered(
+        "tree_exporter/exports.html",
         rows=rows,
         exports_dir=str(_exports_dir()),
     )
@@ -674,6 +675,9 @@ def _safe_exports_path(fname: str) -> Path:
 # =============================================================================
 
 def register_web_routes(app: Flask):
+    register_template(app, "tree_exporter/content.html", CONTENT_TEMPLATE)
+    register_template(app, "tree_exporter/exports.html", EXPORTS_TEMPLATE)
+
     @app.route("/tree", methods=["GET", "POST"])
     def tree_index():
         # folder browser path (GET param)
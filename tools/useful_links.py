@@ -15,12 +15,18 @@ Useful Links (Hub) — versie zonder settings.json
 """
 from __future__ import annotations
 import json
+import sys
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-from flask import Flask, request, render_template_string, redirect, url_for, jsonify, Response
+from flask import Flask, request, redirect, url_for, jsonify, Response
+
+# --- Project root op sys.path (standalone: python tools/useful_links.py) ---
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
 
 # --- Hub layout (optioneel, met fallback voor standalone) ---
 try:
@@ -28,6 +34,13 @@ try:
 except Exception:
     hub_render_page = None  # fallback gebruiken
 
+# --- Config store + conditional GET (werken ook op de standalone Flask app) ---
+from runtime.config_store import config_version, freeze, read_json_copy, write_json  # noqa: E402
+from runtime.conditional_get import mark_deterministic  # noqa: E402
+
+# --- Template registry (werkt ook op de standalone Flask app) ---
+from runtime.templates import register_template, render_registered  # noqa: E402
+
 def _render_layout(title: str, content_html: str) -> str:
     """
     Gebruik de Hub-layout wanneer beschikbaar; anders een compacte, donkere fallback (standalone).
@@ -101,17 +114,11 @@ def _default_db() -> Dict[str, Any]:
     }
 
 def _load_json(path: Path, default: Dict[str, Any]) -> Dict[str, Any]:
-    try:
-        if path.exists():
-            return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        pass
-    return default
+    return read_json_copy(path, default)
 
 def _save_json(path: Path, data: Dict[str, Any]) -> bool:
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        write_json(path, data)
         return True
     except Exception:
         return False
@@ -196,6 +203,19 @@ def load_db() -> Dict[str, Any]:
 def save_db(db: Dict[str, Any]) -> None:
     _save_json(DATA_PATH, db)
 
+# (versie, genormaliseerde read-only db) — enkel opnieuw opgebouwd als useful_links.json wijzigt
+_DB_VIEW: Tuple[int, Any] = (-1, None)
+
+def load_db_view() -> Dict[str, Any]:
+    """Read-only, genormaliseerde db voor GET-routes (niet muteren; gebruik load_db())."""
+    global _DB_VIEW
+    ver, db = _DB_VIEW
+    if db is None or ver != config_version(DATA_PATH):
+        db = freeze(load_db())
+        # load_db kan zelf saven (normalisatie) -> versie pas daarna nemen
+        _DB_VIEW = (config_version(DATA_PATH), db)
+    return db
+
 # ---------- Import/Export helpers ----------
 def _backup_file(path: Path) -> Path:
     """Maak een timestamped backup van een JSON-bestand."""
@@ -424,9 +444,9 @@ def _grid_css_from_modes(modes: Dict[str, Any]) -> str:
 
 # ---------- HTML-template ----------
 CONTENT_TEMPLATE = r"""
-<! -- CSS: eerst main.css (globaal), dan useful_links.css (override), met cache-buster -->
+<! -- CSS: eerst main.css (globaal), dan useful_links.css (override); hub: gehashte URLs via static manifest -->
 <link rel="stylesheet" href="{{ url_for('static', filename='css/main.css') }}">
-<link rel="stylesheet" href="{{ url_for('static', filename='css/useful_links.css') }}?v={{ css_version }}">
+<link rel="stylesheet" href="{{ url_for('static', filename='css/useful_links.css') }}">
 <style id="gridStatic">
 /* Grid CSS vanuit vaste defaults (scoped per mode) */
 {{ grid_css | safe }}
@@ -1029,7 +1049,7 @@ def _sort_key(r: Dict[str, Any]) -> Tuple[int, str]:
         return (0, (r.get("name") or "").lower())
 
 def _render_page(*, active_tab: str, active_cat: str, error: str = "", msg: str = ""):
-    db = load_db()
+    db = load_db_view()
     prefs = db["prefs"]
     default_cat = prefs["default_category"]
     hide_default = bool(prefs["hide_default_category"])
@@ -1054,8 +1074,8 @@ def _render_page(*, active_tab: str, active_cat: str, error: str = "", msg: str
     else:
         filtered = [r for r in rows if (r.get("category") or "") == active_cat]
 
-    html = render_template_string(
-        CONTENT_TEMPLATE,
+    html = render_registered(
+        "useful_links/content.html",
         error=error,
         msg=msg,
         categories=categories,
@@ -1070,12 +1090,13 @@ def _render_page(*, active_tab: str, active_cat: str, error: str = "", msg: str
         links_layout=links_layout,
         cat_colors=cat_colors,
         grid_css=_grid_css(),
-        css_version=int(datetime.now().timestamp()),
     )
     return _render_layout(title="Nuttige links", content_html=html)
 
 # ---------- Routes ----------
 def register_web_routes(app: Flask):
+    register_template(app, "useful_links/content.html", CONTENT_TEMPLATE)
+
     # ------------- DEBUG ROUTES -------------
     @app.get("/links/_routes")
     def _links_routes():
@@ -1091,7 +1112,7 @@ def register_web_routes(app: Flask):
 
     @app.get("/links/_debug_state")
     def links_debug_state():
-        db = load_db()
+        db = load_db_view()
         return {
             "prefs": db.get("prefs"),
             "categories": db.get("categories"),
@@ -1110,6 +1131,9 @@ def register_web_routes(app: Flask):
             msg=request.args.get("msg", "")
         )
 
+    # index = f(layout, useful_links.json, query) -> 304 zonder render/template
+    mark_deterministic(app, "links_index", DATA_PATH)
+
     # Create
     @app.post("/links/add")
     def links_add():
@@ -9,6 +9,9 @@ Wat wordt gevalideerd (op basis van config/i18n_builder.json + i18n_modes.json):
 - TinyMCE:  basis (tinymce.min.js) en skins/plugins map
 - CodeMirror 6: view/state + lang-* modules (html, css, json, xml, markdown)
 - wkhtmltopdf: uitvoerbaar pad (Windows/Linux)
+- Bundels (tools/build_vendor_bundles.py): aanwezig, actueel t.o.v. de bronbestanden en
+  in lijn met de ingeschakelde plugins (ontbrekend/verouderd = waarschuwing: de editor valt
+  dan terug op losse bestanden)
 
 Exitcodes:
  0 = OK, 2 = waarschuwingen, 3 = fouten
@@ -138,6 +141,45 @@ def check_wkhtmltopdf(cfg: Dict[str, Any], results: List[Dict[str, Any]]):
             break
     add_result(results, found is not None, "wkhtmltopdf", "binary", found or (candidates[0] if candidates else ""), "" if found else "Niet gevonden. Pas 'wkhtmltopdf.portable_path' aan of plaats binary in static/vendor/wkhtmltox/bin")
 
+def check_bundles(cfg: Dict[str, Any], modes_cfg: Dict[str, Any], results: List[Dict[str, Any]]):
+    try:
+        from build_vendor_bundles import MANIFEST_FILE, STATIC_DIR as B_STATIC, plan_bundles, sha256_file
+    except ImportError:
+        from tools.build_vendor_bundles import MANIFEST_FILE, STATIC_DIR as B_STATIC, plan_bundles, sha256_file
+
+    plans = plan_bundles(cfg, modes_cfg)
+    if not plans:
+        return
+    hint = "Bouw opnieuw: python tools/build_vendor_bundles.py"
+    manifest = load_json(MANIFEST_FILE)
+    if "__error__" in manifest:
+        add_result(results, False, "bundles", "bundles.json", MANIFEST_FILE, f"Geen bundels gebouwd. {hint}")
+        return
+    add_result(results, True, "bundles", "bundles.json", MANIFEST_FILE)
+
+    built = manifest.get("bundles") or {}
+    for name, parts in plans.items():
+        entry = built.get(name) or {}
+        path = os.path.join(B_STATIC, *str(entry.get("path") or "").split("/")) if entry else ""
+        if not entry or not os.path.isfile(path):
+            add_result(results, False, "bundles", name, path or MANIFEST_FILE, f"Bundel ontbreekt. {hint}")
+            continue
+        if sha256_file(path) != entry.get("sha256"):
+            add_result(results, False, "bundles", name, path, f"Bundel gewijzigd na de build. {hint}")
+            continue
+        have = [m.get("path") for m in entry.get("parts") or []]
+        if have != parts:
+            missing = [p for p in parts if p not in have]
+            extra = [p for p in have if p not in parts]
+            add_result(results, False, "bundles", name, path,
+                       f"Niet in lijn met de config (ontbreekt: {missing or '-'}, overbodig: {extra or '-'}). {hint}")
+            continue
+        stale = [m["path"] for m in entry["parts"]
+                 if not os.path.isfile(os.path.join(B_STATIC, *m["path"].split("/")))
+                 or sha256_file(os.path.join(B_STATIC, *m["path"].split("/"))) != m.get("sha256")]
+        add_result(results, not stale, "bundles", name, path,
+                   "" if not stale else f"Verouderd t.o.v. {', '.join(stale)}. {hint}")
+
 def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     total = len(results)
     missing = [r for r in results if not r["exists"]]
@@ -146,6 +188,9 @@ def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     for r in results:
         if r["category"] == "tinymce" and r["name"] in ("skins/","plugins/") and not r["exists"]:
             warnings.append(r)
+        # bundels zijn een optimalisatie: zonder laadt de editor de losse bestanden
+        if r["category"] == "bundles" and not r["exists"]:
+            warnings.append(r)
     # echte fouten: core-bestanden/module ontbreekt
     errors = [r for r in missing if r not in warnings]
     status = "OK"
@@ -220,6 +265,7 @@ def main():
     check_tinymce(cfg, results)
     check_codemirror(cfg, results, modes)
     check_wkhtmltopdf(cfg, results)
+    check_bundles(cfg, modes, results)
 
     summary = summarize(results)
     if args.json:
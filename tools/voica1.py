@@ -27,11 +27,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
-from flask import Flask, request, render_template_string
+from flask import Flask, request
 
 # Gebruik hub-layout (main_layout.py) i.p.v. cynit_* helpers
 # -> levert header/topbar/menus/footer + /static/main.css en /static/main.js
 from beheer.main_layout import render_page as hub_render_page
+from runtime.conditional_get import mark_deterministic
+from runtime.templates import register_template, render_registered
 
 
 # =========================
@@ -200,10 +202,14 @@ def build_devices_string(devices: List[str]) -> str:
     return "; ".join(devices[:-1]) + f" & {devices[-1]}"
 
 
-def compute_default_base_dir() -> str:
-    root = Path(ROOT_BASE_DIR)
+def default_base_dir_path() -> Path:
+    """Doelmap van vandaag, zonder ze aan te maken (de GET-pagina toont ze enkel)."""
     now = datetime.now()
-    target = root / f"{now.year}" / f"{now.month:02d}" / f"{now.day}"
+    return Path(ROOT_BASE_DIR) / f"{now.year}" / f"{now.month:02d}" / f"{now.day}"
+
+
+def compute_default_base_dir() -> str:
+    target = default_base_dir_path()
     target.mkdir(parents=True, exist_ok=True)
     logger.debug("[VOICA1] compute_default_base_dir -> %s", target)
     return str(target)
@@ -859,8 +865,8 @@ def _render(
     debug_enabled: bool,
 ):
     # Render alleen de VOICA1-content...
-    content_html = render_template_string(
-        CONTENT_TEMPLATE,
+    content_html = render_registered(
+        "voica1/content.html",
         error=error,
         base_dir=base_dir,
         root_base_dir=ROOT_BASE_DIR,
@@ -897,14 +903,21 @@ def register_web_routes(app, settings=None, tools=None, voica_cfg=None):
     Let op: settings/tools zijn hier niet meer nodig voor layout (die komt uit main_layout).
     """
     apply_voica_config(voica_cfg or {})
+    set_debug_enabled(DEBUG_DEFAULT)
+    register_template(app, "voica1/content.html", CONTENT_TEMPLATE)
+
+    @app.teardown_request
+    def _voica1_reset_debug(exc=None):
+        # debug geldt per POST: niet laten doorlopen tot de volgende (mogelijk 304) GET
+        if request.endpoint in ("voica1_generate", "voica1_process"):
+            set_debug_enabled(DEBUG_DEFAULT)
 
     @app.route("/voica1", methods=["GET"])
     def voica1_index():
-        debug_enabled = DEBUG_DEFAULT
-        set_debug_enabled(debug_enabled)
+        # pure render (ETag/304): geen logger-reset, geen mkdir; generate maakt de map aan
         return _render(
             error=None,
-            base_dir=compute_default_base_dir(),
+            base_dir=str(default_base_dir_path()),
             device_type="pc",
             key_size=KEY_SIZE_DEFAULT,
             devices_input="",
@@ -923,9 +936,12 @@ def register_web_routes(app, settings=None, tools=None, voica_cfg=None):
             signal_text="",
             missing_certs=[],
             engine=DEFAULT_ENGINE,
-            debug_enabled=debug_enabled,
+            debug_enabled=DEBUG_DEFAULT,
         )
 
+    # index = f(layout, voica cfg (vast per process), dag van base_dir)
+    mark_deterministic(app, "voica1_index", extra=lambda: datetime.now().strftime("%Y-%m-%d"))
+
     @app.route("/voica1/generate", methods=["POST"])
     def voica1_generate():
         base_dir_str = (request.form.get("base_dir") or "").strip()
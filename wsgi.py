@@ -1,6 +1,4 @@
-
 # wsgi.py
-from master import create_app
+from wsgi_prod import create_app
 
 app = create_app()  # Waitress zoekt een object genaamd 'app'
-``
@@ -3,7 +3,6 @@
 import time
 import logging
 from typing import Callable, Iterable, Tuple
-from master import create_app
 
 # Basis logging-config (als je 'm al zet elders, blijft dit onschadelijk)
 logging.basicConfig(
@@ -50,6 +49,6 @@ def create_app():
     return _wrap_with_access_log(base_app)
 
 def _get_base_app():
-    # import hier om cirkels te vermijden
-    from master import create_app as _factory
+    # import hier om cirkels te vermijden; volledig geregistreerde app (zoals wsgi_prod)
+    from wsgi_prod import create_app as _factory
     return _factory()
@@ -3,12 +3,14 @@
 import logging
 import time
 from collections import OrderedDict
+from dataclasses import replace
 from typing import Tuple, Optional
 
 from flask import request, g
 
-# Haal de app-factory en register-functies uit master.py
-from master import create_app as _create_app, register_beheer, register_tools
+# Haal de volledige app-opbouw (logging + beheer + tools) uit master.py
+from master import ROUTE_INDEX, build_app, load_hub_settings
+from runtime.serving import ServerConfig, warmup
 
 log = logging.getLogger("ctools")
 access_log = logging.getLogger("access")
@@ -42,67 +44,26 @@ def _touch_client_last(path: str) -> bool:
 
 def _page_name_from_request() -> str:
     """
-    Probeer een leesbare paginanaam te geven. Valt terug op request.path.
-    Pas deze mapping aan als je meer 'mooie namen' wil.
+    Leesbare paginanaam via de gedeelde route index (tools.json namen + beheer-pagina's).
+    Valt terug op request.path.
     """
-    # Eerst proberen op endpoint (function name)
-    ep = (request.endpoint or "").strip()
-    if ep:
-        # maak iets netter: underscores naar spaties
-        friendly = ep.replace("_", " ").strip().title()
-        # uitzonderingen
-        if friendly.lower() in ("home",):
-            return "Home"
-        # als het op beheer pages lijkt
-        if "beheer" in friendly.lower():
-            return f"Beheer · {friendly}"
-        return friendly
-
-    # Dan specifieke paden die je hebt
-    path = request.path or "/"
-    if path == "/":
-        return "Home"
-    if path.startswith("/jwt"):
-        return "JWT UI"
-    if path.startswith("/voica1"):
-        return "Voica1"
-    if path.startswith("/beheer/tools"):
-        return "Beheer · Tools"
-    if path.startswith("/beheer/config"):
-        return "Beheer · Config"
-    if path.startswith("/beheer/theme"):
-        return "Beheer · Theme"
-    if path.startswith("/beheer/logs"):
-        return "Beheer · Logs"
-    if path.startswith("/beheer/hub"):
-        return "Beheer · Hub"
-
-    # fallback: pad zelf
-    return path
+    return ROUTE_INDEX.page_name(request.path or "/")
 
 def create_app():
     """
     Entry-point voor: waitress-serve --call wsgi_prod:create_app
-    - bouwt de Flask app via master.create_app()
-    - registreert beheer- en toolroutes (zoals main() normaal doet)
+    - bouwt de volledig geregistreerde app via master.build_app() (zelfde als main())
+    - productie-instellingen: tools preloaded + warmup (server.* uit hub_settings.json)
+    - plain HTTP (waitress heeft geen TLS): wie dit entrypoint start kiest daar bewust voor;
+      de tray-hub (master.main) doet dat enkel met server.allow_plain_http=true
     - logging:
         * Errors (4xx/5xx) altijd loggen (WARNING/ERROR)
         * OK-regel alleen bij 'paginaswitch': "PAGE_NAME OK"
     """
-    app = _create_app()
-
-    # Registraties (zoals in main())
-    try:
-        register_beheer(app)
-        log.info("Beheer routes registered (via wsgi_prod)")
-    except Exception as exc:
-        log.exception("FAILED registering beheer routes (via wsgi_prod): %s", exc)
-
-    try:
-        register_tools(app)
-        log.info("Tools registered (via wsgi_prod)")
-    except Exception as exc:
-        log.exception("FAILED registering tools (via wsgi_prod): %s", exc)
+    # waitress-serve = altijd productie, ook als hub_settings nog op "dev" staat
+    server = replace(ServerConfig.from_settings(load_hub_settings()), mode="waitress")
+    app = build_app(server)
+    log.info("App built (via wsgi_prod)")
 
     # Meet duur
     @app.before_request
@@ -144,4 +105,16 @@ def create_app():
             pass
         return resp
 
+    # warmup als laatste: na de eerste request kunnen geen hooks meer bij
+    if server.warmup_paths:
+        warmup(app, server.warmup_paths, log)
+
     return app
+
+if __name__ == "__main__":
+    # python wsgi_prod.py -> waitress met threads/limits uit hub_settings.json "server"
+    # (waitress-serve --call gebruikt zijn eigen CLI-opties/defaults)
+    from runtime.serving import serve
+
+    _server = replace(ServerConfig.from_settings(load_hub_settings()), mode="waitress")
+    serve(create_app(), _server, logging.getLogger("hub"))